@@ -1,14 +1,22 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+
 from fastapi import APIRouter
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import logging
 
+from backend.app.core.config import RERANK_CANDIDATES, RERANK_ENABLED
+from backend.app.core.metrics import StageTimer, observe_stage
 from backend.app.services.chat_session import (
     get_session_messages,
     append_session_message,
 )
+from backend.app.services.answer_cache import get_answer_cache, replay_answer
 from backend.app.services.chat_history import store_chat_message
-from backend.app.services.retriever import retrieve_similar_chunks
+from backend.app.services.retriever import aget_query_embedding, aretrieve_similar_chunks
+from backend.app.services.reranker import arerank
 from backend.app.services.context_assembler import assemble_context
 from backend.app.services.llm import stream_llm_response
 
@@ -23,15 +31,56 @@ class ChatRequest(BaseModel):
     query: str
 
 
+async def _build_prompt(
+    payload: ChatRequest,
+    session_messages: List[Dict[str, str]],
+    query_embedding: Optional[List[float]],
+    headers: Dict[str, str]
+) -> str:
+    """
+    Retrieve (+ optionally rerank) and assemble the RAG prompt.
+    Only runs when the answer cache misses.
+    """
+    # Over-fetch when a reranker trims the candidates
+    retrieved_nodes = await aretrieve_similar_chunks(
+        payload.query,
+        session_id=payload.session_id,
+        top_k=RERANK_CANDIDATES if RERANK_ENABLED else 5,
+        query_embedding=query_embedding
+    )
+
+    if RERANK_ENABLED:
+        with StageTimer("chat", "rerank"):
+            reranked = await arerank(payload.query, retrieved_nodes)
+        retrieved_nodes = reranked.nodes
+        headers["X-Rerank-Latency-Ms"] = str(reranked.latency_ms)
+
+        logger.info(
+            f"Rerank | session={payload.session_id} | candidates={reranked.candidates} | "
+            f"scored={reranked.scored} | kept={len(reranked.nodes)} | "
+            f"budget_exhausted={reranked.budget_exhausted} | {reranked.latency_ms}ms"
+        )
+
+    with StageTimer("chat", "context_assembly"):
+        return assemble_context(
+            user_query=payload.query,
+            retrieved_nodes=retrieved_nodes,
+            conversation_messages=session_messages,
+        )
+
+
 @router.post("/stream")
 async def chat_stream(payload: ChatRequest):
     """
     Streaming RAG chat endpoint with deterministic error signaling.
+    Every blocking step is awaited off the event loop, so one slow
+    retrieval doesn't stall other streams on the same worker.
     """
+    request_start = time.perf_counter()
 
     # 1. Persist user message first
-    append_session_message(payload.session_id, "user", payload.query)
-    store_chat_message(
+    await append_session_message(payload.session_id, "user", payload.query)
+    await store_chat_message(
         user_id=payload.user_id,
         session_id=payload.session_id,
         role="user",
@@ -39,47 +88,84 @@ async def chat_stream(payload: ChatRequest):
     )
 
     # 2. Load session context
-    session_messages = get_session_messages(payload.session_id)
-
-    # 3. Retrieve document chunks
-    retrieved_nodes = retrieve_similar_chunks(
-        payload.query,
-        session_id=payload.session_id
-    )
-
-    # 4. Assemble prompt
-    prompt = assemble_context(
-        user_query=payload.query,
-        retrieved_nodes=retrieved_nodes,
-        conversation_messages=session_messages,
-    )
+    session_messages = await get_session_messages(payload.session_id)
+
+    # 3. Answer cache: a near-identical question about the same documents
+    answer_cache = get_answer_cache()
+    query_embedding = None
+    cached_answer, docset_version = None, 0
+
+    headers = {}
+    if answer_cache:
+        query_embedding = await aget_query_embedding(payload.query)
+        with StageTimer("chat", "answer_cache") as timer:
+            cached_answer, docset_version = await asyncio.to_thread(
+                answer_cache.lookup, payload.session_id, query_embedding
+            )
+            timer.outcome = "hit" if cached_answer is not None else "miss"
+        headers["X-Answer-Cache"] = "hit" if cached_answer is not None else "miss"
+
+    if cached_answer is not None:
+        answer_stream = replay_answer(cached_answer)
+    else:
+        answer_stream = stream_llm_response(
+            await _build_prompt(payload, session_messages, query_embedding, headers)
+        )
 
-    # 5. Streaming generator with hard error guarantees
+    # 4. Streaming generator with hard error guarantees
     async def token_stream():
         full_response = []
+        # TTFT and stream time are measured from request arrival
+        answered = "cache_hit" if cached_answer is not None else "ok"
+        outcome = "cancelled"  # unless the stream ends or fails below
 
         try:
-            async for token in stream_llm_response(prompt):
+            async for token in answer_stream:
+                if not full_response:
+                    observe_stage("chat", "ttft", time.perf_counter() - request_start, answered)
                 full_response.append(token)
                 yield token
+            outcome = answered
 
         except Exception as e:
+            outcome = "error"
             logger.error(f"Streaming failed: {e}")
             yield "\n\n⚠️ The response was interrupted. Please retry."
             return
+        finally:
+            observe_stage("chat", "stream_total", time.perf_counter() - request_start, outcome)
+            # Frees the LLM gateway slot if the client disconnected mid-stream
+            await answer_stream.aclose()
 
         # Persist assistant response only if stream completed
         final_answer = "".join(full_response)
 
-        append_session_message(payload.session_id, "assistant", final_answer)
-        store_chat_message(
+        await append_session_message(
+            payload.session_id,
+            "assistant",
+            final_answer,
+            token_count=len(full_response),  # streamed chunks ≈ tokens
+        )
+        await store_chat_message(
             user_id=payload.user_id,
             session_id=payload.session_id,
             role="assistant",
             content=final_answer,
         )
 
+        # Errors return above; an empty completion is not worth replaying
+        if answer_cache and cached_answer is None and final_answer.strip():
+            await asyncio.to_thread(
+                answer_cache.store,
+                payload.session_id,
+                docset_version,
+                payload.query,
+                query_embedding,
+                final_answer,
+            )
+
     return StreamingResponse(
         token_stream(),
-        media_type="text/plain"
+        media_type="text/plain",
+        headers=headers
     )
@@ -1,12 +1,25 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Query, Response
 from pydantic import BaseModel
 from typing import List, Optional
 import logging
 from datetime import datetime
 import uuid  # ✅ ADDED FOR UUID GENERATION
 
-from backend.app.core.config import get_supabase_client
-from backend.app.services.llm import generate_answer
+from backend.app.core.config import (
+    SESSION_PAGE_SIZE,
+    SESSION_PAGE_SIZE_MAX,
+    get_async_supabase_client,
+    supabase_breaker,
+)
+from backend.app.services.session_cache import (
+    decode_cursor,
+    encode_cursor,
+    etag_matches,
+    invalidate_session_messages,
+    invalidate_user_sessions,
+    read_through,
+)
+from backend.app.services.title_generator import TitleQueueFull, title_generator
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +39,11 @@ class UpdateSessionRequest(BaseModel):
     title: str
 
 
+class GenerateTitleRequest(BaseModel):
+    # Saves a Supabase lookup (and sees messages still in the write-behind spool)
+    first_message: Optional[str] = None
+
+
 class SessionResponse(BaseModel):
     session_id: str
     user_id: str
@@ -40,6 +58,36 @@ class MessageResponse(BaseModel):
     created_at: str
 
 
+def _decode_cursor(cursor: Optional[str], size: int) -> Optional[list]:
+    if cursor is None:
+        return None
+    try:
+        values = decode_cursor(cursor, size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Values are interpolated into quoted PostgREST filters
+    if any('"' in value or "\\" in value for value in values):
+        raise HTTPException(status_code=400, detail="Malformed cursor")
+    return values
+
+
+def _page_response(page, if_none_match: Optional[str]) -> Response:
+    """
+    Cached page as a JSON response; 304 when the client already has it.
+    The next-page cursor travels in X-Next-Cursor so the body keeps its
+    list shape.
+    """
+    headers = {"ETag": page.etag, "Cache-Control": "private, no-cache"}
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+
+    if etag_matches(if_none_match, page.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=page.body, media_type="application/json", headers=headers)
+
+
 # ===========================
 # Session Management Endpoints
 # ===========================
@@ -50,7 +98,7 @@ async def create_session(payload: CreateSessionRequest):
     Create a new chat session for a user.
     ✅ FIXED: Now generates UUID in Python instead of relying on Supabase
     """
-    client = get_supabase_client()
+    client = await get_async_supabase_client()
     if not client:
         raise HTTPException(status_code=503, detail="Database unavailable")
 
@@ -60,7 +108,7 @@ async def create_session(payload: CreateSessionRequest):
         now = datetime.utcnow().isoformat()
         
         # Insert with explicit session_id
-        response = client.table("chat_sessions").insert({
+        response = await client.table("chat_sessions").insert({
             "session_id": session_id,  # ✅ EXPLICITLY PROVIDED
             "user_id": payload.user_id,
             "title": payload.title,
@@ -72,6 +120,7 @@ async def create_session(payload: CreateSessionRequest):
             raise HTTPException(status_code=500, detail="Failed to create session")
 
         session = response.data[0]
+        await invalidate_user_sessions(payload.user_id)
         
         logger.info(f"Session created | session_id={session['session_id']} | user_id={payload.user_id}")
         
@@ -84,81 +133,134 @@ async def create_session(payload: CreateSessionRequest):
         )
 
     except Exception as e:
+        if not isinstance(e, HTTPException):
+            supabase_breaker.record_failure(e)
         logger.error(f"Session creation failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/list/{user_id}", response_model=List[SessionResponse])
-async def list_sessions(user_id: str):
+async def list_sessions(
+    user_id: str,
+    limit: int = Query(SESSION_PAGE_SIZE, ge=1, le=SESSION_PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None)
+):
     """
-    Get all chat sessions for a user, ordered by most recent.
+    Get a user's chat sessions, most recent first, one page at a time.
+    Pass the X-Next-Cursor response header as `cursor` for the next page.
     """
-    client = get_supabase_client()
-    if not client:
-        raise HTTPException(status_code=503, detail="Database unavailable")
+    after = _decode_cursor(cursor, 2)
 
-    try:
-        response = (
+    async def load_page():
+        # Only reached on a cache miss: cached pages survive a Supabase outage
+        client = await get_async_supabase_client()
+        if not client:
+            raise HTTPException(status_code=503, detail="Database unavailable")
+
+        query = (
             client
             .table("chat_sessions")
-            .select("*")
+            .select("session_id, user_id, title, created_at, updated_at")
             .eq("user_id", user_id)
+        )
+        if after:
+            updated_at, session_id = after
+            # Keyset on (updated_at, session_id): no OFFSET scan, stable under inserts
+            query = query.or_(
+                f'updated_at.lt."{updated_at}",'
+                f'and(updated_at.eq."{updated_at}",session_id.lt."{session_id}")'
+            )
+
+        response = await (
+            query
             .order("updated_at", desc=True)
+            .order("session_id", desc=True)
+            .limit(limit + 1)
             .execute()
         )
 
-        sessions = [
-            SessionResponse(
-                session_id=s["session_id"],
-                user_id=s["user_id"],
-                title=s["title"],
-                created_at=s["created_at"],
-                updated_at=s["updated_at"]
-            )
-            for s in response.data
-        ]
+        rows = response.data[:limit]
+        next_cursor = None
+        if len(response.data) > limit:
+            next_cursor = encode_cursor(rows[-1]["updated_at"], rows[-1]["session_id"])
 
+        sessions = rows  # the select already matches SessionResponse
         logger.info(f"Sessions retrieved | user_id={user_id} | count={len(sessions)}")
-        return sessions
+        return sessions, next_cursor
+
+    try:
+        page = await read_through("user", user_id, f"{limit}:{cursor or ''}", load_page)
+        return _page_response(page, if_none_match)
 
+    except HTTPException:
+        raise
     except Exception as e:
+        supabase_breaker.record_failure(e)
         logger.error(f"Session list failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/{session_id}/messages", response_model=List[MessageResponse])
-async def get_session_messages(session_id: str, limit: int = 50):
+async def get_session_messages(
+    session_id: str,
+    limit: int = Query(SESSION_PAGE_SIZE, ge=1, le=SESSION_PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None)
+):
     """
-    Get all messages for a specific session.
+    Get the messages of a session, oldest first, one page at a time.
+    Pass the X-Next-Cursor response header as `cursor` for the next page.
     """
-    client = get_supabase_client()
-    if not client:
-        raise HTTPException(status_code=503, detail="Database unavailable")
+    after = _decode_cursor(cursor, 2)
 
-    try:
-        response = (
+    async def load_page():
+        # Only reached on a cache miss: cached pages survive a Supabase outage
+        client = await get_async_supabase_client()
+        if not client:
+            raise HTTPException(status_code=503, detail="Database unavailable")
+
+        query = (
             client
             .table("chat_messages")
-            .select("role, content, created_at")
+            .select("id, role, content, created_at")
             .eq("session_id", session_id)
+        )
+        if after:
+            created_at, message_id = after
+            query = query.or_(
+                f'created_at.gt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.gt."{message_id}")'
+            )
+
+        response = await (
+            query
             .order("created_at", desc=False)
-            .limit(limit)
+            .order("id", desc=False)
+            .limit(limit + 1)
             .execute()
         )
 
+        rows = response.data[:limit]
+        next_cursor = None
+        if len(response.data) > limit:
+            next_cursor = encode_cursor(rows[-1]["created_at"], str(rows[-1]["id"]))
+
         messages = [
-            MessageResponse(
-                role=m["role"],
-                content=m["content"],
-                created_at=m["created_at"]
-            )
-            for m in response.data
+            {"role": m["role"], "content": m["content"], "created_at": m["created_at"]}
+            for m in rows
         ]
-
         logger.info(f"Messages retrieved | session_id={session_id} | count={len(messages)}")
-        return messages
+        return messages, next_cursor
 
+    try:
+        page = await read_through("session", session_id, f"{limit}:{cursor or ''}", load_page)
+        return _page_response(page, if_none_match)
+
+    except HTTPException:
+        raise
     except Exception as e:
+        supabase_breaker.record_failure(e)
         logger.error(f"Message retrieval failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -169,12 +271,12 @@ async def update_session_title(session_id: str, payload: UpdateSessionRequest):
     Update the title of a session.
     Also updates the updated_at timestamp.
     """
-    client = get_supabase_client()
+    client = await get_async_supabase_client()
     if not client:
         raise HTTPException(status_code=503, detail="Database unavailable")
 
     try:
-        response = (
+        response = await (
             client
             .table("chat_sessions")
             .update({
@@ -188,11 +290,15 @@ async def update_session_title(session_id: str, payload: UpdateSessionRequest):
         if not response.data:
             raise HTTPException(status_code=404, detail="Session not found")
 
+        await invalidate_user_sessions(response.data[0]["user_id"])
+
         logger.info(f"Session title updated | session_id={session_id} | title={payload.title}")
         
         return {"status": "success", "session_id": session_id, "title": payload.title}
 
     except Exception as e:
+        if not isinstance(e, HTTPException):
+            supabase_breaker.record_failure(e)
         logger.error(f"Title update failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -202,16 +308,16 @@ async def delete_session(session_id: str):
     """
     Delete a session and all its messages.
     """
-    client = get_supabase_client()
+    client = await get_async_supabase_client()
     if not client:
         raise HTTPException(status_code=503, detail="Database unavailable")
 
     try:
         # Delete messages first (foreign key constraint)
-        client.table("chat_messages").delete().eq("session_id", session_id).execute()
+        await client.table("chat_messages").delete().eq("session_id", session_id).execute()
         
         # Delete session
-        response = (
+        response = await (
             client
             .table("chat_sessions")
             .delete()
@@ -219,11 +325,16 @@ async def delete_session(session_id: str):
             .execute()
         )
 
+        await invalidate_user_sessions(*{s["user_id"] for s in response.data or []})
+        await invalidate_session_messages(session_id)
+
         logger.info(f"Session deleted | session_id={session_id}")
         
         return {"status": "success", "session_id": session_id}
 
     except Exception as e:
+        if not isinstance(e, HTTPException):
+            supabase_breaker.record_failure(e)
         logger.error(f"Session deletion failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -232,56 +343,15 @@ async def delete_session(session_id: str):
 # Auto-Title Generation
 # ===========================
 
-@router.post("/{session_id}/generate-title")
-async def generate_session_title(session_id: str):
+@router.post("/{session_id}/generate-title", status_code=202)
+async def generate_session_title(session_id: str, payload: Optional[GenerateTitleRequest] = None):
     """
-    Generate a ChatGPT-like title from the first user message.
+    Queue ChatGPT-like title generation from the first user message and
+    return immediately. The title shows up in session listing.
     """
-    client = get_supabase_client()
-    if not client:
-        raise HTTPException(status_code=503, detail="Database unavailable")
-
     try:
-        # Get first user message
-        response = (
-            client
-            .table("chat_messages")
-            .select("content")
-            .eq("session_id", session_id)
-            .eq("role", "user")
-            .order("created_at", desc=False)
-            .limit(1)
-            .execute()
-        )
-
-        if not response.data:
-            raise HTTPException(status_code=404, detail="No messages found")
-
-        first_message = response.data[0]["content"]
-
-        # Generate title using LLM
-        title_prompt = f"""Generate a short, concise title (3-6 words) for a conversation that starts with:
-
-"{first_message}"
+        title_generator.submit(session_id, payload.first_message if payload else None)
+    except TitleQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
 
-Return ONLY the title, nothing else. No quotes, no punctuation at the end."""
-
-        generated_title = generate_answer(title_prompt).strip().strip('"\'')
-        
-        # Limit to 50 characters
-        if len(generated_title) > 50:
-            generated_title = generated_title[:47] + "..."
-
-        # Update session title
-        client.table("chat_sessions").update({
-            "title": generated_title,
-            "updated_at": datetime.utcnow().isoformat()
-        }).eq("session_id", session_id).execute()
-
-        logger.info(f"Title generated | session_id={session_id} | title={generated_title}")
-
-        return {"status": "success", "session_id": session_id, "title": generated_title}
-
-    except Exception as e:
-        logger.error(f"Title generation failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+    return {"status": "pending", "session_id": session_id}
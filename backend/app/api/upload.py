@@ -1,13 +1,23 @@
-from fastapi import APIRouter, UploadFile, File, BackgroundTasks, HTTPException, Form
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form
+import asyncio
 import time
 import uuid
+from typing import Optional
 
 from backend.app.core.logging import setup_logger
-from backend.app.utils.file_utils import validate_file, validate_file_size
-from backend.app.utils.hash_utils import compute_file_hash
-from backend.app.utils.file_utils import is_duplicate, register_hash
-from backend.app.core.config import UPLOAD_DIR
-from backend.app.services.ingestion import ingest_document
+from backend.app.core.metrics import observe_stage
+from backend.app.utils.file_utils import (
+    validate_file,
+    save_upload_streaming,
+    promote_upload,
+    discard_upload,
+)
+from backend.app.services.document_registry import (
+    get_latest_version,
+    register_document,
+    unregister_document,
+)
+from backend.app.services.job_queue import enqueue_ingestion_job, get_job
 
 logger = setup_logger()
 router = APIRouter(prefix="/upload", tags=["Document Upload"])
@@ -15,52 +25,105 @@ router = APIRouter(prefix="/upload", tags=["Document Upload"])
 
 @router.post("/")
 async def upload_document(
-    background_tasks: BackgroundTasks,
     session_id: str = Form(...),              # ✅ ADDED
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    document_id: Optional[str] = Form(None)   # set to upload a revision
 ):
     start_time = time.time()
 
-    validate_file(file)
-    await validate_file_size(file)
+    ext = validate_file(file)
 
-    file_path = UPLOAD_DIR / file.filename
-    contents = await file.read()
+    # Registry and queue calls are blocking SQLite: keep them off the event loop
+    if document_id:
+        latest = await asyncio.to_thread(get_latest_version, document_id)
+        if not latest:
+            raise HTTPException(status_code=404, detail="Unknown document")
+        if latest["session_id"] != session_id:
+            raise HTTPException(status_code=400, detail="Document belongs to another session")
+    else:
+        document_id = str(uuid.uuid4())
 
-    file_size_mb = round(len(contents) / (1024 * 1024), 2)
+    # Single pass: stream to a temp file while hashing and enforcing size
+    temp_path, file_hash, size_bytes = await save_upload_streaming(file, ext)
 
-    with open(file_path, "wb") as f:
-        f.write(contents)
+    file_size_mb = round(size_bytes / (1024 * 1024), 2)
 
     logger.info(
         f"Upload received | file={file.filename} | size={file_size_mb}MB | session={session_id}"
     )
 
-    file_hash = compute_file_hash(file_path)
-
-    if is_duplicate(file_hash):
-        raise HTTPException(status_code=409, detail="Duplicate document")
-
-    register_hash(file_hash)
-
-    document_id = str(uuid.uuid4())
-
-    background_tasks.add_task(
-        ingest_document,
-        file_path,
-        file.filename,
-        document_id,
-        session_id              # ✅ PASSED
+    # Atomic check-and-register: concurrent identical uploads can't both pass
+    version = await asyncio.to_thread(
+        register_document,
+        file_hash=file_hash,
+        document_id=document_id,
+        session_id=session_id,
+        filename=file.filename,
+        size_bytes=size_bytes,
     )
+    if version is None:
+        discard_upload(temp_path)
+        raise HTTPException(status_code=409, detail="Duplicate document")
 
-    latency_ms = round((time.time() - start_time) * 1000, 2)
+    # Whichever path holds the upload right now, for cleanup on failure
+    file_path = temp_path
+    try:
+        # Content-addressed: same-named uploads no longer overwrite each other
+        file_path = promote_upload(temp_path, file_hash, ext)
+
+        # Durable hand-off: ingestion workers pick this up in their own processes
+        queued = await asyncio.to_thread(
+            enqueue_ingestion_job,
+            document_id=document_id,
+            session_id=session_id,
+            file_path=str(file_path),
+            filename=file.filename,
+            version=version,
+        )
+    except Exception:
+        discard_upload(file_path)
+        await asyncio.to_thread(unregister_document, file_hash)
+        raise
+
+    if not queued:
+        # The previous version is still being ingested
+        await asyncio.to_thread(unregister_document, file_hash)
+        discard_upload(file_path)
+        raise HTTPException(status_code=409, detail="Document is still being ingested")
+
+    elapsed = time.time() - start_time
+    latency_ms = round(elapsed * 1000, 2)
+    observe_stage("ingest", "upload", elapsed)
 
     logger.info(
-        f"Upload accepted | document_id={document_id} | session={session_id}"
+        f"Upload accepted | document_id={document_id} | version={version} | "
+        f"session={session_id} | {latency_ms}ms"
     )
 
     return {
         "document_id": document_id,
         "session_id": session_id,
-        "status": "processing"
+        "version": version,
+        "status": "queued",
+        "latency_ms": latency_ms
+    }
+
+
+@router.get("/{document_id}/status")
+async def upload_status(document_id: str):
+    """
+    Ingestion progress: queued, parsing, embedding, stored or failed.
+    """
+    job = await asyncio.to_thread(get_job, document_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Unknown document")
+
+    return {
+        "document_id": job["document_id"],
+        "session_id": job["session_id"],
+        "status": job["status"],
+        "attempts": job["attempts"],
+        "max_attempts": job["max_attempts"],
+        "error": job["error"],
+        "result": job["result"],
     }
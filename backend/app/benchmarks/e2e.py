@@ -0,0 +1,492 @@
+"""
+Offline end-to-end benchmark: document ingestion and streaming chat
+through the real service code, with every external dependency replaced
+(benchmarks/offline_fakes.py, the local vector store and the mock LLM
+server). No network, Milvus, Redis, Supabase or LLM API key needed.
+
+Reports ingestion throughput (docs/min, chunks/s), chat TTFT and latency
+percentiles at each concurrency level, per-stage means from the metrics
+histograms, and peak RSS. Results are written as JSON with sorted keys so
+two runs can be diffed; --compare prints the change against a baseline.
+
+Embeddings are a deterministic hashing embedder by default (model
+inference would dominate everything else); pass --real-embeddings to
+use the configured model.
+
+Run from the repository root:
+    python -m backend.app.benchmarks.e2e --docs 20 --concurrency 1 8 32 --output e2e.json
+    python -m backend.app.benchmarks.e2e --compare e2e-baseline.json --output e2e.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SCHEMA_VERSION = 1
+INTERRUPTED_MARKER = "The response was interrupted"
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """
+    Nearest-rank p50/p95/p99 plus mean, in the input's unit.
+    """
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0}
+
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        return ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)]
+
+    return {
+        "p50": round(rank(50), 2),
+        "p95": round(rank(95), 2),
+        "p99": round(rank(99), 2),
+        "mean": round(sum(ordered) / len(ordered), 2),
+    }
+
+
+def _rss_mb() -> float:
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+# ----------------------------------------------------------------------
+# Environment
+# ----------------------------------------------------------------------
+
+def _configure_environment(args, workdir: Path, llm_port: int) -> None:
+    """
+    Point every on-disk store at the scratch directory and the LLM at the
+    mock server. Must run before any backend module is imported.
+    """
+    os.environ.update({
+        "DOCUMENT_REGISTRY_PATH": str(workdir / "documents.sqlite3"),
+        "LEXICAL_INDEX_DIR": str(workdir / "lexical_index"),
+        "EMBED_CACHE_PATH": str(workdir / "embedding_cache.sqlite3"),
+        "ANSWER_CACHE_PATH": str(workdir / "answer_cache.sqlite3"),
+        "CHAT_SPOOL_PATH": str(workdir / "chat_spool.sqlite3"),
+        "INGESTION_QUEUE_PATH": str(workdir / "ingestion_jobs.sqlite3"),
+        "VECTOR_STORE_BACKEND": "local",
+        "VECTOR_STORE_PATH": str(workdir / "vector_store"),
+        "ANSWER_CACHE_ENABLED": "false" if args.no_answer_cache else "true",
+        "EMBED_WARMUP_ON_STARTUP": "false",
+        # Non-empty so the getters hand out the fake clients
+        "SUPABASE_URL": "http://supabase.offline",
+        "SUPABASE_KEY": "offline",
+        "LLM_BASE_URL": f"http://127.0.0.1:{llm_port}/v1",
+        "LLM_API_KEY": "mock",
+        "LLM_MAX_CONCURRENCY": str(max(args.concurrency)),
+    })
+
+
+def _start_mock_llm(args, port: int) -> subprocess.Popen:
+    process = subprocess.Popen([
+        sys.executable, "-m", "backend.app.benchmarks.mock_llm_server",
+        "--port", str(port),
+        "--ttft-ms", str(args.llm_ttft_ms),
+        "--token-ms", str(args.llm_token_ms),
+        "--tokens", str(args.llm_tokens),
+    ])
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/v1/models", timeout=1)
+            return process
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.2)
+
+    process.kill()
+    raise RuntimeError("Mock LLM server did not start")
+
+
+def _install_fakes(args):
+    """
+    Swap the cached Redis/Supabase clients and the embedding model for
+    in-process fakes.
+    """
+    from backend.app.benchmarks.offline_fakes import (
+        FakeAsyncRedis,
+        FakeAsyncSupabase,
+        FakeRedis,
+        FakeRedisServer,
+        FakeSupabase,
+        FakeSupabaseDB,
+        HashEmbedding,
+    )
+    from backend.app.core import config, redis as redis_module
+    from backend.app.services import model_registry
+
+    redis_server = FakeRedisServer()
+    redis_module._redis_client = FakeRedis(redis_server, latency_ms=args.redis_latency_ms)
+    for decode_responses in (True, False):
+        redis_module._async_redis_clients[decode_responses] = FakeAsyncRedis(
+            redis_server, decode_responses=decode_responses, latency_ms=args.redis_latency_ms
+        )
+
+    supabase_db = FakeSupabaseDB()
+    config._supabase_client = FakeSupabase(supabase_db, latency_ms=args.supabase_latency_ms)
+    config._async_supabase_client = FakeAsyncSupabase(supabase_db, latency_ms=args.supabase_latency_ms)
+
+    if not args.real_embeddings:
+        key = model_registry._registry_key(
+            "embedding", config.EMBED_MODEL_NAME, model_registry.DEFAULT_EMBED_OPTIONS
+        )
+        model_registry._models[key] = model_registry.LoadedModel(
+            model=HashEmbedding(config.MILVUS_DIM), load_seconds=0.0, memory_bytes=0, ready=True
+        )
+
+    return redis_server, supabase_db
+
+
+# ----------------------------------------------------------------------
+# Synthetic corpus
+# ----------------------------------------------------------------------
+
+def _vocabulary(size: int, rng: random.Random) -> List[str]:
+    consonants, vowels = "bcdfghklmnprstvz", "aeiou"
+    words = set()
+    while len(words) < size:
+        words.add("".join(
+            rng.choice(consonants) + rng.choice(vowels) for _ in range(rng.randint(2, 4))
+        ))
+    return sorted(words)
+
+
+def _write_documents(args, directory: Path, vocabulary: List[str], rng: random.Random) -> List[Path]:
+    from docx import Document as DocxDocument
+
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(args.docs):
+        document = DocxDocument()
+        size = 0
+        while size < args.doc_kb * 1024:
+            sentence = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(8, 20)))
+            paragraph = ". ".join(sentence.split(" ", 1)).capitalize() + "."
+            document.add_paragraph(paragraph)
+            size += len(paragraph)
+
+        path = directory / f"doc-{i:04d}.docx"
+        document.save(str(path))
+        paths.append(path)
+    return paths
+
+
+def _session_id(i: int) -> str:
+    return f"bench-session-{i}"
+
+
+# ----------------------------------------------------------------------
+# Metrics snapshot
+# ----------------------------------------------------------------------
+
+def _stage_snapshot() -> Dict[tuple, List[float]]:
+    from backend.app.core.metrics import STAGE_SECONDS
+
+    snapshot: Dict[tuple, List[float]] = {}
+    for metric in STAGE_SECONDS.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_sum") or sample.name.endswith("_count"):
+                key = (sample.labels["path"], sample.labels["stage"], sample.labels["outcome"])
+                totals = snapshot.setdefault(key, [0.0, 0.0])
+                totals[0 if sample.name.endswith("_sum") else 1] += sample.value
+    return snapshot
+
+
+def _stage_means(before: Dict, after: Dict, path: str) -> Dict[str, Dict]:
+    """
+    Mean milliseconds and count per stage/outcome observed between snapshots.
+    """
+    means = {}
+    for (stage_path, stage, outcome), (total, count) in sorted(after.items()):
+        prev_total, prev_count = before.get((stage_path, stage, outcome), (0.0, 0.0))
+        count -= prev_count
+        if stage_path != path or count <= 0:
+            continue
+        means[f"{stage}:{outcome}"] = {
+            "count": int(count),
+            "mean_ms": round((total - prev_total) / count * 1000, 2),
+        }
+    return means
+
+
+# ----------------------------------------------------------------------
+# Phases
+# ----------------------------------------------------------------------
+
+def run_ingestion(args, paths: List[Path]) -> Dict:
+    """
+    One worker ingesting the corpus back to back, as a single
+    ingestion worker process would.
+    """
+    from backend.app.services.document_registry import register_document
+    from backend.app.services.ingestion import ingest_document
+    from backend.app.utils.hash_utils import compute_file_hash
+
+    before = _stage_snapshot()
+    rss_before = _rss_mb()
+    doc_seconds, chunks, pages = [], 0, 0
+
+    start_time = time.perf_counter()
+    for i, path in enumerate(paths):
+        document_id = f"bench-doc-{i:04d}"
+        session_id = _session_id(i % args.sessions)
+        register_document(compute_file_hash(path), document_id, session_id, path.name, path.stat().st_size)
+
+        doc_start = time.perf_counter()
+        result = ingest_document(path, path.name, document_id, session_id)
+        doc_seconds.append((time.perf_counter() - doc_start) * 1000)
+        chunks += result["chunks_total"]
+        pages += result["pages"]
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        "documents": len(paths),
+        "document_kb": args.doc_kb,
+        "chunks": chunks,
+        "seconds": round(elapsed, 3),
+        "docs_per_min": round(len(paths) / elapsed * 60, 2),
+        "chunks_per_s": round(chunks / elapsed, 2),
+        "document_ms": percentiles(doc_seconds),
+        "stages": _stage_means(before, _stage_snapshot(), "ingest"),
+        "rss_before_mb": rss_before,
+        "peak_rss_mb": _rss_mb(),
+    }
+
+
+def _queries(args, vocabulary: List[str], rng: random.Random) -> List[tuple]:
+    distinct = [
+        (
+            _session_id(rng.randrange(args.sessions)),
+            f"What does the document say about {rng.choice(vocabulary)} and {rng.choice(vocabulary)}?",
+        )
+        for _ in range(args.distinct_queries)
+    ]
+    return [rng.choice(distinct) for _ in range(args.requests)]
+
+
+async def _chat_once(session_id: str, query: str) -> Dict:
+    from backend.app.api.chat import ChatRequest, chat_stream
+
+    start = time.perf_counter()
+    ttft = None
+    text = []
+    try:
+        response = await chat_stream(ChatRequest(user_id="bench-user", session_id=session_id, query=query))
+        async for token in response.body_iterator:
+            if ttft is None:
+                ttft = time.perf_counter() - start
+            text.append(token)
+    except Exception as e:
+        return {"error": str(e)}
+
+    return {
+        "ttft_ms": (ttft or 0) * 1000,
+        "total_ms": (time.perf_counter() - start) * 1000,
+        "cache_hit": response.headers.get("x-answer-cache") == "hit",
+        "error": INTERRUPTED_MARKER if INTERRUPTED_MARKER in "".join(text) else None,
+    }
+
+
+async def _chat_level(requests: List[tuple], concurrency: int) -> Dict:
+    before = _stage_snapshot()
+    pending = list(reversed(requests))
+    results = []
+
+    async def worker():
+        while pending:
+            results.append(await _chat_once(*pending.pop()))
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start_time
+
+    ok = [r for r in results if not r["error"]]
+    return {
+        "requests": len(results),
+        "errors": len(results) - len(ok),
+        "answer_cache_hits": sum(r["cache_hit"] for r in ok),
+        "seconds": round(elapsed, 3),
+        "requests_per_s": round(len(results) / elapsed, 2),
+        "ttft_ms": percentiles([r["ttft_ms"] for r in ok]),
+        "latency_ms": percentiles([r["total_ms"] for r in ok]),
+        "stages": _stage_means(before, _stage_snapshot(), "chat"),
+        "peak_rss_mb": _rss_mb(),
+    }
+
+
+async def run_chat(args, requests: List[tuple]) -> Dict:
+    from backend.app.core.config import CHAT_WRITE_BEHIND_ENABLED
+    from backend.app.services.llm_gateway import get_llm_gateway
+    from backend.app.services.message_spool import chat_message_spool
+
+    if CHAT_WRITE_BEHIND_ENABLED:
+        chat_message_spool.start()
+
+    try:
+        # Warm the prompt path (imports, SQLite connections, LLM client)
+        await _chat_once(*requests[0])
+
+        levels = {}
+        for concurrency in args.concurrency:
+            levels[str(concurrency)] = await _chat_level(requests, concurrency)
+    finally:
+        if CHAT_WRITE_BEHIND_ENABLED:
+            await chat_message_spool.stop()
+
+    gateway = get_llm_gateway().stats()
+    return {
+        "levels": levels,
+        "llm": {key: gateway[key] for key in ("requests", "retries", "hedged", "failures")},
+    }
+
+
+# ----------------------------------------------------------------------
+# Results
+# ----------------------------------------------------------------------
+
+def _flatten(value, prefix: str = "") -> Dict[str, float]:
+    if isinstance(value, dict):
+        flat = {}
+        for key, item in value.items():
+            flat.update(_flatten(item, f"{prefix}.{key}" if prefix else key))
+        return flat
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {prefix: value}
+    return {}
+
+
+def compare(baseline: Dict, current: Dict) -> None:
+    old = _flatten({k: v for k, v in baseline.items() if k != "meta"})
+    new = _flatten({k: v for k, v in current.items() if k != "meta"})
+
+    print(f"\n{'metric':<60}{'baseline':>12}{'current':>12}{'change':>10}")
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key], new[key]
+        change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+        print(f"{key:<60}{before:>12}{after:>12}{change:>10}")
+    for key in sorted(new.keys() - old.keys()):
+        print(f"{key:<60}{'-':>12}{new[key]:>12}{'new':>10}")
+
+
+def _print_summary(results: Dict) -> None:
+    ingest = results["ingestion"]
+    print(
+        f"\nIngestion: {ingest['documents']} docs, {ingest['chunks']} chunks in {ingest['seconds']}s | "
+        f"{ingest['docs_per_min']} docs/min | {ingest['chunks_per_s']} chunks/s | "
+        f"peak RSS {ingest['peak_rss_mb']}MB"
+    )
+
+    print(f"\n{'conc':>6}{'req/s':>9}{'err':>6}{'hits':>6}{'ttft p50':>10}{'p95':>8}{'p99':>8}"
+          f"{'lat p50':>10}{'p95':>8}{'p99':>8}{'RSS MB':>9}")
+    for concurrency, level in results["chat"]["levels"].items():
+        ttft, latency = level["ttft_ms"], level["latency_ms"]
+        print(
+            f"{concurrency:>6}{level['requests_per_s']:>9}{level['errors']:>6}{level['answer_cache_hits']:>6}"
+            f"{ttft['p50']:>10}{ttft['p95']:>8}{ttft['p99']:>8}"
+            f"{latency['p50']:>10}{latency['p95']:>8}{latency['p99']:>8}{level['peak_rss_mb']:>9}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=20, help="Documents to ingest")
+    parser.add_argument("--doc-kb", type=int, default=200, help="Text per document")
+    parser.add_argument("--sessions", type=int, default=5, help="Sessions the documents are spread over")
+    parser.add_argument("--requests", type=int, default=200, help="Chat requests per concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--distinct-queries", type=int, default=100, help="Repeats can hit the answer cache")
+    parser.add_argument("--no-answer-cache", action="store_true")
+    parser.add_argument("--real-embeddings", action="store_true")
+    parser.add_argument("--redis-latency-ms", type=float, default=0.2)
+    parser.add_argument("--supabase-latency-ms", type=float, default=20)
+    parser.add_argument("--llm-ttft-ms", type=float, default=300)
+    parser.add_argument("--llm-token-ms", type=float, default=15)
+    parser.add_argument("--llm-tokens", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default="e2e-results.json")
+    parser.add_argument("--compare", help="Baseline results file to diff against")
+    parser.add_argument("--verbose", action="store_true", help="Keep INFO logs from the services")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    rng = random.Random(args.seed)
+    llm_port = _free_port()
+
+    with tempfile.TemporaryDirectory(prefix="documind-e2e-") as scratch:
+        workdir = Path(scratch)
+        _configure_environment(args, workdir, llm_port)
+        llm_process = _start_mock_llm(args, llm_port)
+
+        try:
+            from backend.app.core.executors import shutdown_executors
+            from backend.app.services import ingestion
+
+            _install_fakes(args)
+            ingestion.PARSED_DIR = workdir / "parsed"
+            ingestion.PARSED_DIR.mkdir()
+
+            vocabulary = _vocabulary(2000, rng)
+            paths = _write_documents(args, workdir / "docs", vocabulary, rng)
+
+            results = {
+                "schema": SCHEMA_VERSION,
+                "meta": {
+                    "git_commit": _git_commit(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "cpu_count": os.cpu_count(),
+                    "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                    "params": vars(args),
+                },
+                "ingestion": run_ingestion(args, paths),
+            }
+            results["chat"] = asyncio.run(run_chat(args, _queries(args, vocabulary, rng)))
+            shutdown_executors()
+        finally:
+            llm_process.terminate()
+            llm_process.wait()
+
+    Path(args.output).write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+    _print_summary(results)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text()), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Embedding throughput benchmark: per-node loop vs length-bucketed batches.
+
+Run from the repository root:
+    python -m backend.app.benchmarks.embedding_throughput --chunks 256
+"""
+import argparse
+import random
+import time
+from datetime import datetime
+from typing import List
+
+from backend.app.core.config import (
+    EMBED_BATCH_SIZE,
+    EMBED_MAX_BATCH_TOKENS,
+    PARSED_DIR,
+)
+from backend.app.services.chunking import chunk_document
+from backend.app.services.embeddings import embed_texts_batched
+from backend.app.services.model_registry import get_embed_model
+
+WORDS = (
+    "contract clause invoice shipment revenue policy section model "
+    "retrieval latency document vector session answer evidence table"
+).split()
+
+
+def load_chunk_texts(num_chunks: int, seed: int = 42) -> List[str]:
+    """
+    Chunk parsed documents if any exist, otherwise synthesize
+    chunks with a realistic spread of lengths.
+    """
+    texts = []
+
+    for parsed_file in sorted(PARSED_DIR.glob("*.txt")):
+        nodes = chunk_document(
+            document_id=parsed_file.stem,
+            text=parsed_file.read_text(encoding="utf-8"),
+            upload_timestamp=datetime.utcnow()
+        )
+        texts.extend(node.text for node in nodes)
+        if len(texts) >= num_chunks:
+            return texts[:num_chunks]
+
+    rng = random.Random(seed)
+    while len(texts) < num_chunks:
+        length = rng.randint(20, 400)
+        texts.append(" ".join(rng.choice(WORDS) for _ in range(length)))
+
+    return texts
+
+
+def run_per_node(texts: List[str], embed_model) -> float:
+    start_time = time.perf_counter()
+    for text in texts:
+        embed_model.get_text_embedding(text)
+    return time.perf_counter() - start_time
+
+
+def run_batched(
+    texts: List[str],
+    embed_model,
+    batch_size: int,
+    max_batch_tokens: int
+) -> float:
+    start_time = time.perf_counter()
+    embed_texts_batched(
+        texts,
+        embed_model,
+        batch_size=batch_size,
+        max_batch_tokens=max_batch_tokens,
+    )
+    return time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE)
+    parser.add_argument("--max-batch-tokens", type=int, default=EMBED_MAX_BATCH_TOKENS)
+    args = parser.parse_args()
+
+    texts = load_chunk_texts(args.chunks)
+    embed_model = get_embed_model()
+
+    # Warm up so neither run pays for lazy initialisation
+    embed_model.get_text_embedding(texts[0])
+
+    per_node_seconds = run_per_node(texts, embed_model)
+    batched_seconds = run_batched(
+        texts, embed_model, args.batch_size, args.max_batch_tokens
+    )
+
+    per_node_rate = len(texts) / per_node_seconds
+    batched_rate = len(texts) / batched_seconds
+
+    print(f"Chunks: {len(texts)}")
+    print(f"Per-node loop: {per_node_rate:.1f} chunks/s ({per_node_seconds:.2f}s)")
+    print(
+        f"Batched (batch_size={args.batch_size}, "
+        f"max_batch_tokens={args.max_batch_tokens}): "
+        f"{batched_rate:.1f} chunks/s ({batched_seconds:.2f}s)"
+    )
+    print(f"Speedup: {batched_rate / per_node_rate:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Peak-memory benchmark: streaming ingestion vs the old materialise-everything
+flow, for synthetic 1 MB, 10 MB and 50 MB documents.
+
+Each (mode, size) run happens in a fresh spawned process so ru_maxrss
+reflects that run alone. Embeddings are fake 768-dim vectors by default
+(the model's own weights would dominate RSS); pass --real-embeddings to
+use the configured model.
+
+Run from the repository root:
+    python -m backend.app.benchmarks.ingestion_memory --sizes 1 10 50
+"""
+import argparse
+import multiprocessing
+import random
+import resource
+import time
+from typing import Iterator, List
+
+from backend.app.core.config import MILVUS_DIM
+
+PAGE_CHARS = 3000
+WORDS = (
+    "the contract states that each shipment must be invoiced within thirty "
+    "days and any dispute regarding clause 4.2 shall be resolved by the board"
+).split()
+
+
+def synthetic_pages(total_mb: int, seed: int = 7) -> Iterator[str]:
+    rng = random.Random(seed)
+    remaining = total_mb * 1024 * 1024
+
+    while remaining > 0:
+        words = []
+        size = 0
+        while size < PAGE_CHARS:
+            word = rng.choice(WORDS)
+            words.append(word)
+            size += len(word) + 1
+        sentence_text = " ".join(words).replace(" the ", ". The ")
+        remaining -= len(sentence_text)
+        yield sentence_text
+
+
+def _fake_embed(nodes: List) -> List:
+    for node in nodes:
+        node.embedding = [0.0] * MILVUS_DIM
+    return nodes
+
+
+def _discard(nodes: List) -> None:
+    return None
+
+
+def _rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run(mode: str, size_mb: int, real_embeddings: bool, results) -> None:
+    from llama_index.core import Document
+    from llama_index.core.node_parser import SentenceSplitter
+
+    from backend.app.pipelines.streaming_ingestion import (
+        CHUNK_OVERLAP,
+        CHUNK_SIZE,
+        run_streaming_ingestion,
+    )
+
+    embed_fn = _fake_embed
+    if real_embeddings:
+        from backend.app.services.embeddings import embed_nodes
+        from backend.app.services.model_registry import get_embed_model
+        embed_fn = embed_nodes
+        get_embed_model()  # load weights before the baseline
+
+    baseline_mb = _rss_mb()
+    start_time = time.perf_counter()
+
+    if mode == "streaming":
+        stats = run_streaming_ingestion(
+            pages=synthetic_pages(size_mb),
+            document_id="bench",
+            metadata={"document_id": "bench", "session_id": "bench"},
+            embed_fn=embed_fn,
+            insert_fn=_discard,
+        )
+        chunks = stats.chunks
+    else:
+        # Mirrors the previous ingest_document: whole text, all nodes and
+        # all embeddings held in memory before a single insert.
+        text = "\n".join(synthetic_pages(size_mb))
+        document = Document(text=text, metadata={"document_id": "bench"})
+        nodes = SentenceSplitter(
+            chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP
+        ).get_nodes_from_documents([document])
+        embed_fn(nodes)
+        _discard(nodes)
+        chunks = len(nodes)
+
+    results.put({
+        "mode": mode,
+        "size_mb": size_mb,
+        "chunks": chunks,
+        "seconds": round(time.perf_counter() - start_time, 2),
+        "peak_rss_mb": round(_rss_mb(), 1),
+        "peak_over_baseline_mb": round(_rss_mb() - baseline_mb, 1),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--modes", nargs="+", default=["streaming", "materialized"])
+    parser.add_argument("--real-embeddings", action="store_true")
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+
+    print(f"{'mode':<14}{'size':>8}{'chunks':>10}{'seconds':>10}{'peak RSS':>12}{'over base':>12}")
+    for mode in args.modes:
+        for size_mb in args.sizes:
+            process = ctx.Process(
+                target=_run, args=(mode, size_mb, args.real_embeddings, results)
+            )
+            process.start()
+            row = results.get()
+            process.join()
+
+            print(
+                f"{row['mode']:<14}{row['size_mb']:>6}MB{row['chunks']:>10}"
+                f"{row['seconds']:>10}{row['peak_rss_mb']:>10}MB"
+                f"{row['peak_over_baseline_mb']:>10}MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+OpenAI-compatible stand-in for the LLM API, for load-testing the chat path
+offline. Serves POST /v1/chat/completions (streaming and non-streaming)
+with synthetic tokens, configurable latency and injected failures.
+
+Run from the repository root:
+    python -m backend.app.benchmarks.mock_llm_server --port 8001 --ttft-ms 300 --token-ms 15
+
+and point the backend at it:
+    LLM_BASE_URL=http://localhost:8001/v1 LLM_API_KEY=mock uvicorn backend.app.main:app
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+WORDS = (
+    "the document describes a process for handling requests with clear steps "
+    "and notes on configuration limits performance retrieval context answer"
+).split()
+
+
+@dataclass
+class MockSettings:
+    ttft_ms: float = 300
+    token_ms: float = 15
+    jitter: float = 0.2
+    tokens: int = 200
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    seed: int = 42
+
+
+settings = MockSettings()
+_rng = random.Random(settings.seed)
+stats = {"requests": 0, "streams": 0, "errors": 0, "rate_limited": 0, "active": 0}
+
+app = FastAPI(title="Mock LLM")
+
+
+def _delay(ms: float) -> float:
+    return max(ms * (1 + _rng.uniform(-settings.jitter, settings.jitter)), 0) / 1000
+
+
+def _tokens(max_tokens) -> list:
+    count = min(settings.tokens, max_tokens or settings.tokens)
+    return [(" " if i else "") + _rng.choice(WORDS) for i in range(count)]
+
+
+def _error_response():
+    roll = _rng.random()
+    if roll < settings.rate_limit_rate:
+        stats["rate_limited"] += 1
+        return JSONResponse(
+            status_code=429,
+            headers={"Retry-After": "0.5"},
+            content={"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}},
+        )
+    if roll < settings.rate_limit_rate + settings.error_rate:
+        stats["errors"] += 1
+        return JSONResponse(
+            status_code=503,
+            content={"error": {"message": "Service unavailable", "type": "server_error"}},
+        )
+    return None
+
+
+def _chunk(completion_id: str, model: str, delta: dict, finish_reason=None) -> str:
+    payload = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    stats["requests"] += 1
+
+    error = _error_response()
+    if error is not None:
+        return error
+
+    model = body.get("model", "mock")
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+    tokens = _tokens(body.get("max_tokens"))
+
+    if not body.get("stream"):
+        stats["active"] += 1
+        try:
+            await asyncio.sleep(_delay(settings.ttft_ms) + len(tokens) * _delay(settings.token_ms))
+        finally:
+            stats["active"] -= 1
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(tokens)},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)},
+        }
+
+    async def event_stream():
+        stats["streams"] += 1
+        stats["active"] += 1
+        try:
+            await asyncio.sleep(_delay(settings.ttft_ms))
+            yield _chunk(completion_id, model, {"role": "assistant", "content": ""})
+            for token in tokens:
+                yield _chunk(completion_id, model, {"content": token})
+                await asyncio.sleep(_delay(settings.token_ms))
+            yield _chunk(completion_id, model, {}, finish_reason="stop")
+            yield "data: [DONE]\n\n"
+        finally:
+            stats["active"] -= 1
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.get("/v1/models")
+async def list_models():
+    return {"object": "list", "data": [{"id": "mock", "object": "model", "owned_by": "documind"}]}
+
+
+@app.get("/stats")
+async def mock_stats():
+    return stats
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--ttft-ms", type=float, default=settings.ttft_ms, help="Time to first token")
+    parser.add_argument("--token-ms", type=float, default=settings.token_ms, help="Delay between tokens")
+    parser.add_argument("--jitter", type=float, default=settings.jitter, help="Relative latency jitter (0.2 = ±20%%)")
+    parser.add_argument("--tokens", type=int, default=settings.tokens, help="Tokens per completion (capped by max_tokens)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--seed", type=int, default=settings.seed)
+    args = parser.parse_args()
+
+    global _rng
+    settings.ttft_ms = args.ttft_ms
+    settings.token_ms = args.token_ms
+    settings.jitter = args.jitter
+    settings.tokens = args.tokens
+    settings.error_rate = args.error_rate
+    settings.rate_limit_rate = args.rate_limit_rate
+    settings.seed = args.seed
+    _rng = random.Random(args.seed)
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""
+In-process stand-ins for the external services, used by the offline
+benchmarks: Redis, Supabase and the embedding model.
+
+They implement only the calls DocuMind makes, with an optional fixed
+latency per round trip so network cost can be simulated. Nothing here
+imports backend config, so a benchmark can set its environment first.
+"""
+import asyncio
+import copy
+import hashlib
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+_TOKEN = re.compile(r"\w+")
+
+
+# ----------------------------------------------------------------------
+# Redis
+# ----------------------------------------------------------------------
+
+class FakeRedisServer:
+    """
+    Shared keyspace for the sync and async clients. Values are stored as
+    bytes; TTLs are accepted and ignored.
+    """
+
+    def __init__(self):
+        self.data: Dict[str, Any] = {}
+        self.lock = threading.Lock()
+        self.commands = 0
+
+    def execute(self, command: str, *args, **kwargs):
+        with self.lock:
+            self.commands += 1
+            return getattr(self, f"_{command}")(*args, **kwargs)
+
+    @staticmethod
+    def _bytes(value) -> bytes:
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode("utf-8")
+
+    def _ping(self):
+        return True
+
+    def _get(self, key):
+        value = self.data.get(key)
+        return value if isinstance(value, bytes) else None
+
+    def _set(self, key, value, ex=None):
+        self.data[key] = self._bytes(value)
+        return True
+
+    def _delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def _expire(self, key, seconds):
+        return key in self.data
+
+    def _rpush(self, key, *values):
+        items = self.data.setdefault(key, [])
+        items.extend(self._bytes(v) for v in values)
+        return len(items)
+
+    def _ltrim(self, key, start, end):
+        items = self.data.get(key, [])
+        length = len(items)
+        start = start + length if start < 0 else start
+        end = end + length if end < 0 else end
+        self.data[key] = items[max(start, 0):end + 1]
+        return True
+
+    def _lrange(self, key, start, end):
+        items = self.data.get(key, [])
+        end = len(items) if end == -1 else end + 1
+        return list(items[start:end])
+
+
+def _decode(value, decode_responses: bool):
+    if not decode_responses:
+        return value
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    if isinstance(value, list):
+        return [_decode(v, True) for v in value]
+    return value
+
+
+class _FakePipeline:
+    def __init__(self, client: "FakeAsyncRedis"):
+        self._client = client
+        self._commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._commands = []
+
+    def __getattr__(self, command):
+        def queue(*args, **kwargs):
+            self._commands.append((command, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        # One round trip for the whole batch
+        await self._client._round_trip()
+        results = [
+            _decode(self._client.server.execute(c, *a, **kw), self._client.decode_responses)
+            for c, a, kw in self._commands
+        ]
+        self._commands = []
+        return results
+
+
+class FakeAsyncRedis:
+    """
+    redis.asyncio.Redis look-alike: get/set/delete/rpush/ltrim/expire/
+    lrange/ping and pipeline().
+    """
+
+    def __init__(self, server: FakeRedisServer, decode_responses: bool = True, latency_ms: float = 0):
+        self.server = server
+        self.decode_responses = decode_responses
+        self.latency_ms = latency_ms
+
+    async def _round_trip(self) -> None:
+        if self.latency_ms > 0:
+            await asyncio.sleep(self.latency_ms / 1000)
+
+    def __getattr__(self, command):
+        async def call(*args, **kwargs):
+            await self._round_trip()
+            return _decode(self.server.execute(command, *args, **kwargs), self.decode_responses)
+        return call
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline(self)
+
+
+class FakeRedis:
+    """
+    Sync redis.Redis look-alike over the same keyspace.
+    """
+
+    def __init__(self, server: FakeRedisServer, decode_responses: bool = True, latency_ms: float = 0):
+        self.server = server
+        self.decode_responses = decode_responses
+        self.latency_ms = latency_ms
+
+    def __getattr__(self, command):
+        def call(*args, **kwargs):
+            if self.latency_ms > 0:
+                time.sleep(self.latency_ms / 1000)
+            return _decode(self.server.execute(command, *args, **kwargs), self.decode_responses)
+        return call
+
+
+# ----------------------------------------------------------------------
+# Supabase
+# ----------------------------------------------------------------------
+
+class FakeSupabaseDB:
+    def __init__(self):
+        self.tables: Dict[str, List[Dict]] = {}
+        self.lock = threading.Lock()
+        self.requests = 0
+
+
+class _FakeResponse:
+    def __init__(self, data: List[Dict]):
+        self.data = data
+
+
+class _FakeQuery:
+    """
+    PostgREST builder subset: select/insert/update/delete, eq, order,
+    limit, execute.
+    """
+
+    def __init__(self, db: FakeSupabaseDB, table: str):
+        self._db = db
+        self._table = table
+        self._op = "select"
+        self._values: Any = None
+        self._filters: List = []
+        self._order: Optional[tuple] = None
+        self._limit: Optional[int] = None
+
+    def select(self, *columns, **kwargs):
+        self._op = "select"
+        return self
+
+    def insert(self, rows):
+        self._op, self._values = "insert", rows if isinstance(rows, list) else [rows]
+        return self
+
+    def update(self, values: Dict):
+        self._op, self._values = "update", values
+        return self
+
+    def delete(self):
+        self._op = "delete"
+        return self
+
+    def eq(self, column: str, value):
+        self._filters.append((column, value))
+        return self
+
+    def order(self, column: str, desc: bool = False):
+        self._order = (column, desc)
+        return self
+
+    def limit(self, count: int):
+        self._limit = count
+        return self
+
+    def _matches(self, row: Dict) -> bool:
+        return all(row.get(column) == value for column, value in self._filters)
+
+    def _run(self) -> _FakeResponse:
+        with self._db.lock:
+            self._db.requests += 1
+            rows = self._db.tables.setdefault(self._table, [])
+
+            if self._op == "insert":
+                inserted = [{"id": len(rows) + i + 1, **copy.deepcopy(r)} for i, r in enumerate(self._values)]
+                rows.extend(inserted)
+                return _FakeResponse(inserted)
+
+            matched = [row for row in rows if self._matches(row)]
+
+            if self._op == "update":
+                for row in matched:
+                    row.update(self._values)
+            elif self._op == "delete":
+                self._db.tables[self._table] = [row for row in rows if not self._matches(row)]
+            else:
+                if self._order:
+                    column, desc = self._order
+                    matched.sort(key=lambda row: str(row.get(column, "")), reverse=desc)
+                if self._limit is not None:
+                    matched = matched[:self._limit]
+
+            return _FakeResponse(copy.deepcopy(matched))
+
+
+class _FakeSyncQuery(_FakeQuery):
+    def __init__(self, db: FakeSupabaseDB, table: str, latency_ms: float):
+        super().__init__(db, table)
+        self._latency_ms = latency_ms
+
+    def execute(self) -> _FakeResponse:
+        if self._latency_ms > 0:
+            time.sleep(self._latency_ms / 1000)
+        return self._run()
+
+
+class _FakeAsyncQuery(_FakeQuery):
+    def __init__(self, db: FakeSupabaseDB, table: str, latency_ms: float):
+        super().__init__(db, table)
+        self._latency_ms = latency_ms
+
+    async def execute(self) -> _FakeResponse:
+        if self._latency_ms > 0:
+            await asyncio.sleep(self._latency_ms / 1000)
+        return self._run()
+
+
+class FakeSupabase:
+    def __init__(self, db: FakeSupabaseDB, latency_ms: float = 0):
+        self.db = db
+        self.latency_ms = latency_ms
+
+    def table(self, name: str) -> _FakeSyncQuery:
+        return _FakeSyncQuery(self.db, name, self.latency_ms)
+
+
+class FakeAsyncSupabase:
+    def __init__(self, db: FakeSupabaseDB, latency_ms: float = 0):
+        self.db = db
+        self.latency_ms = latency_ms
+
+    def table(self, name: str) -> _FakeAsyncQuery:
+        return _FakeAsyncQuery(self.db, name, self.latency_ms)
+
+
+# ----------------------------------------------------------------------
+# Embeddings
+# ----------------------------------------------------------------------
+
+class HashEmbedding:
+    """
+    Deterministic bag-of-words embedding: each token is hashed to a
+    dimension and sign, then the vector is L2-normalised. Texts sharing
+    words are close, so retrieval still returns sensible chunks.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in _TOKEN.findall(text.casefold()):
+            digest = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+            vector[digest % self.dim] += 1.0 if digest >> 63 else -1.0
+
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        return vector.tolist()
+
+    def get_query_embedding(self, query: str) -> List[float]:
+        return self._embed(query)
+
+    def get_text_embedding(self, text: str) -> List[float]:
+        return self._embed(text)
+
+    def get_text_embedding_batch(self, texts: List[str], **kwargs) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
@@ -0,0 +1,109 @@
+"""
+Redis session store micro-benchmark: three round trips with "role:content"
+strings vs one pipelined MULTI/EXEC with binary-encoded messages.
+
+Needs a reachable Redis (REDIS_URL). Run from the repository root:
+    python -m backend.app.benchmarks.redis_session_store --ops 5000 --concurrency 32
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+from backend.app.core.redis import get_async_redis_client
+from backend.app.services.chat_session import (
+    MAX_CONTEXT_MESSAGES,
+    REDIS_SESSION_PREFIX,
+    SESSION_TTL_SECONDS,
+    append_session_message,
+    get_session_messages,
+)
+
+BENCH_PREFIX = "bench:chat:session:"
+
+
+async def legacy_append(redis_client, key: str, role: str, content: str):
+    await redis_client.rpush(key, f"{role}:{content}")
+    await redis_client.ltrim(key, -MAX_CONTEXT_MESSAGES, -1)
+    await redis_client.expire(key, SESSION_TTL_SECONDS)
+
+
+async def legacy_read(redis_client, key: str):
+    messages = await redis_client.lrange(key, 0, -1)
+    return [dict(zip(("role", "content"), m.split(":", 1))) for m in messages]
+
+
+async def _run(ops: int, concurrency: int, op) -> float:
+    queue = asyncio.Queue()
+    for i in range(ops):
+        queue.put_nowait(i)
+
+    async def worker():
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await op(i)
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return ops / (time.perf_counter() - start_time)
+
+
+async def main_async(ops: int, concurrency: int, sessions: int, message_chars: int):
+    text_client = await get_async_redis_client()
+    if not text_client:
+        raise SystemExit("Redis is not reachable; set REDIS_URL")
+
+    run_id = uuid.uuid4().hex[:8]
+    rng = random.Random(42)
+    content = "".join(rng.choice("abcdefghij ") for _ in range(message_chars))
+
+    legacy_keys = [f"{BENCH_PREFIX}legacy:{run_id}:{i}" for i in range(sessions)]
+    session_ids = [f"bench:{run_id}:{i}" for i in range(sessions)]
+
+    results = {}
+    results["legacy append"] = await _run(
+        ops, concurrency,
+        lambda i: legacy_append(text_client, legacy_keys[i % sessions], "user", content),
+    )
+    results["pipelined append"] = await _run(
+        ops, concurrency,
+        lambda i: append_session_message(session_ids[i % sessions], "user", content, token_count=42),
+    )
+    results["legacy read"] = await _run(
+        ops, concurrency,
+        lambda i: legacy_read(text_client, legacy_keys[i % sessions]),
+    )
+    results["binary read"] = await _run(
+        ops, concurrency,
+        lambda i: get_session_messages(session_ids[i % sessions]),
+    )
+
+    legacy_bytes = await text_client.memory_usage(legacy_keys[0]) or 0
+    binary_bytes = await text_client.memory_usage(f"{REDIS_SESSION_PREFIX}{session_ids[0]}") or 0
+
+    await text_client.delete(*legacy_keys, *(f"{REDIS_SESSION_PREFIX}{s}" for s in session_ids))
+
+    print(f"Ops: {ops} | concurrency: {concurrency} | message: {message_chars} chars")
+    for name, rate in results.items():
+        print(f"{name:>17}: {rate:,.0f} ops/s")
+    print(f"Append speedup: {results['pipelined append'] / results['legacy append']:.2f}x")
+    print(f"Session key memory: legacy={legacy_bytes}B | binary={binary_bytes}B")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--message-chars", type=int, default=400)
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args.ops, args.concurrency, args.sessions, args.message_chars))
+
+
+if __name__ == "__main__":
+    main()
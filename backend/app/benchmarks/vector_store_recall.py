@@ -0,0 +1,213 @@
+"""
+Vector store benchmark: insert rate, search latency p50/p95/p99 and
+recall@k against exact ground truth, for the local backend (exact scan
+and HNSW) and Milvus, at 10k, 100k and 1M vectors.
+
+Vectors are synthetic, normalised and clustered (so HNSW recall is not
+trivially perfect); queries are perturbed cluster members. Every search
+runs twice: over the whole store and filtered to one session, the way
+chat retrieval calls it. Milvus uses a scratch collection and is skipped
+when the server is unreachable.
+
+Run from the repository root:
+    python -m backend.app.benchmarks.vector_store_recall --sizes 10000 100000 1000000
+"""
+import argparse
+import math
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from backend.app.core.config import MILVUS_DIM
+
+BENCH_COLLECTION = "documind_bench"
+INSERT_BATCH = 10000
+CLUSTERS = 256
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def synthetic_vectors(count: int, dim: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((CLUSTERS, dim), dtype=np.float32)
+    vectors = np.empty((count, dim), dtype=np.float32)
+
+    for start in range(0, count, INSERT_BATCH):
+        end = min(start + INSERT_BATCH, count)
+        labels = rng.integers(0, CLUSTERS, end - start)
+        block = centers[labels] + 0.6 * rng.standard_normal((end - start, dim), dtype=np.float32)
+        vectors[start:end] = block / np.linalg.norm(block, axis=1, keepdims=True)
+
+    return vectors
+
+
+def synthetic_queries(vectors: np.ndarray, count: int, seed: int = 11) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    picks = vectors[rng.integers(0, len(vectors), count)]
+    queries = picks + 0.3 * rng.standard_normal(picks.shape, dtype=np.float32) / math.sqrt(picks.shape[1])
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+def ground_truth(vectors: np.ndarray, queries: np.ndarray, top_k: int, mask=None) -> List[set]:
+    """
+    Exact top-k ids per query, scanning the vectors in blocks.
+    """
+    best_scores = np.full((len(queries), top_k), -np.inf, dtype=np.float32)
+    best_ids = np.full((len(queries), top_k), -1, dtype=np.int64)
+
+    for start in range(0, len(vectors), INSERT_BATCH * 5):
+        block = vectors[start:start + INSERT_BATCH * 5]
+        scores = queries @ block.T
+        if mask is not None:
+            scores[:, ~mask[start:start + len(block)]] = -np.inf
+
+        scores = np.concatenate([best_scores, scores], axis=1)
+        ids = np.concatenate([best_ids, np.broadcast_to(np.arange(start, start + len(block)), (len(queries), len(block)))], axis=1)
+        top = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        best_scores = np.take_along_axis(scores, top, axis=1)
+        best_ids = np.take_along_axis(ids, top, axis=1)
+
+    return [{int(i) for i in row if i >= 0} for row in best_ids]
+
+
+def _nodes(vectors: np.ndarray, start: int, sessions: int):
+    from llama_index.core.schema import TextNode
+
+    return [
+        TextNode(
+            id_=f"bench:{start + i}",
+            text="",
+            embedding=vector.tolist(),
+            metadata={"document_id": "bench", "session_id": f"s{(start + i) % sessions}"},
+        )
+        for i, vector in enumerate(vectors)
+    ]
+
+
+def _open_backend(name: str, workdir: str, dim: int):
+    if name.startswith("local"):
+        from backend.app.services.local_vector_store import LocalVectorStore
+
+        index = "hnsw" if name == "local-hnsw" else "exact"
+        return LocalVectorStore(f"{workdir}/{name}", dim, index=index)
+
+    from backend.app.services.vector_store import (
+        MilvusVectorBackend,
+        VectorStorePool,
+        _close_store,
+        get_vector_store,
+    )
+
+    # Drop and recreate the scratch collection once, then pool plain connections
+    _close_store(get_vector_store(collection_name=BENCH_COLLECTION, dim=dim, overwrite=True))
+    return MilvusVectorBackend(VectorStorePool(
+        factory=lambda: get_vector_store(collection_name=BENCH_COLLECTION, dim=dim)
+    ))
+
+
+def _search(backend, queries: np.ndarray, top_k: int, truth: List[set], filters_for) -> Dict:
+    latencies, hits, expected = [], 0, 0
+
+    for i, query in enumerate(queries):
+        embedding = query.tolist()
+        filters = filters_for(i)
+
+        started = time.perf_counter()
+        results = backend.search(embedding, top_k, filters=filters)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+        found = {int(result.node.node_id.split(":")[1]) for result in results}
+        hits += len(found & truth[i])
+        expected += len(truth[i])
+
+    return {
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "recall": hits / expected if expected else 1.0,
+    }
+
+
+def run(name: str, vectors: np.ndarray, queries: np.ndarray, args, truth: List[set], session_truth: List[set], workdir: str) -> Dict:
+    backend = _open_backend(name, workdir, vectors.shape[1])
+
+    started = time.perf_counter()
+    for start in range(0, len(vectors), INSERT_BATCH):
+        backend.add(_nodes(vectors[start:start + INSERT_BATCH], start, args.sessions))
+    # Loads the view and builds the HNSW graph, so both count as ingest cost
+    backend.open()
+    insert_seconds = time.perf_counter() - started
+
+    try:
+        unfiltered = _search(backend, queries, args.top_k, truth, lambda i: None)
+        filtered = _search(
+            backend, queries, args.top_k, session_truth,
+            lambda i: {"session_id": f"s{i % args.sessions}"},
+        )
+    finally:
+        if name == "milvus":
+            backend.pool.run(lambda store: store.client.drop_collection(BENCH_COLLECTION))
+        backend.close()
+
+    return {
+        "backend": name,
+        "size": len(vectors),
+        "inserts_per_s": len(vectors) / insert_seconds,
+        "all": unfiltered,
+        "session": filtered,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--backends", nargs="+", default=["local-exact", "local-hnsw", "milvus"])
+    parser.add_argument("--dim", type=int, default=MILVUS_DIM)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--sessions", type=int, default=100)
+    args = parser.parse_args()
+
+    print(
+        f"{'backend':<13}{'size':>9}{'ins/s':>9}"
+        f"{'p50':>8}{'p95':>8}{'p99':>8}{'recall':>8}"
+        f"{'sess p50':>10}{'sess p99':>10}{'sess rec':>10}"
+    )
+
+    for size in args.sizes:
+        vectors = synthetic_vectors(size, args.dim)
+        queries = synthetic_queries(vectors, args.queries)
+        truth = ground_truth(vectors, queries, args.top_k)
+
+        sessions = np.arange(size) % args.sessions
+        session_truth = []
+        for s in range(min(args.sessions, len(queries))):
+            members = np.arange(s, len(queries), args.sessions)
+            for i, ids in zip(members, ground_truth(vectors, queries[members], args.top_k, mask=sessions == s)):
+                session_truth.append((int(i), ids))
+        session_truth = [ids for _, ids in sorted(session_truth, key=lambda item: item[0])]
+
+        for name in args.backends:
+            with tempfile.TemporaryDirectory(prefix="documind-vectors-") as workdir:
+                try:
+                    row = run(name, vectors, queries, args, truth, session_truth, workdir)
+                except Exception as e:
+                    print(f"{name:<13}{size:>9}  skipped: {e}")
+                    continue
+
+            print(
+                f"{row['backend']:<13}{row['size']:>9}{row['inserts_per_s']:>9.0f}"
+                f"{row['all']['p50_ms']:>8.2f}{row['all']['p95_ms']:>8.2f}"
+                f"{row['all']['p99_ms']:>8.2f}{row['all']['recall']:>8.3f}"
+                f"{row['session']['p50_ms']:>10.2f}{row['session']['p99_ms']:>10.2f}"
+                f"{row['session']['recall']:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import threading
+import time
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Per-dependency circuit breaker.
+
+    closed    — calls go through; failure_threshold failures within
+                failure_window_seconds open the breaker.
+    open      — calls are refused immediately (the cached "unavailable"
+                answer) until the probe time.
+    half_open — exactly one caller is let through as a probe. Success
+                closes the breaker; failure re-opens it with the open
+                interval doubled, up to max_open_seconds.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        failure_window_seconds: float = 30,
+        base_open_seconds: float = 1,
+        max_open_seconds: float = 60,
+        probe_timeout_seconds: float = 30
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.failure_window_seconds = failure_window_seconds
+        self.base_open_seconds = base_open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = []
+        self._open_seconds = base_open_seconds
+        self._opened_at: Optional[float] = None
+        self._probe_at = 0.0
+        self._probe_started_at = 0.0
+        self._last_error: Optional[str] = None
+
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @property
+    def half_open(self) -> bool:
+        return self._state == HALF_OPEN
+
+    def allow(self) -> bool:
+        """
+        Whether a call may proceed. In half-open state only the caller
+        that gets True is the probe and must report its outcome.
+        """
+        if self._state == CLOSED:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            if self._state == OPEN and now >= self._probe_at:
+                self._state = HALF_OPEN
+                self._probe_started_at = now
+                return True
+
+            if self._state == HALF_OPEN and now - self._probe_started_at > self.probe_timeout_seconds:
+                # The previous probe never reported back
+                self._probe_started_at = now
+                return True
+
+            if self._state == CLOSED:
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        if self._state == CLOSED and not self._failures:
+            return
+
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info(f"Circuit closed | dependency={self.name}")
+            self._state = CLOSED
+            self._failures = []
+            self._open_seconds = self.base_open_seconds
+            self._opened_at = None
+
+    def record_failure(self, error: Optional[BaseException] = None) -> None:
+        now = time.monotonic()
+
+        with self._lock:
+            if error is not None:
+                self._last_error = f"{type(error).__name__}: {error}"[:300]
+
+            if self._state == HALF_OPEN:
+                self._open_seconds = min(self._open_seconds * 2, self.max_open_seconds)
+                self._trip(now)
+                return
+
+            if self._state == OPEN:
+                return
+
+            cutoff = now - self.failure_window_seconds
+            self._failures = [t for t in self._failures if t > cutoff] + [now]
+
+            if len(self._failures) >= self.failure_threshold:
+                self._trip(now)
+
+    def _trip(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = self._opened_at or now
+        self._probe_at = now + self._open_seconds
+        self._failures = []
+        logger.warning(
+            f"Circuit open | dependency={self.name} | "
+            f"next_probe_in={self._open_seconds}s | {self._last_error}"
+        )
+
+    def status(self) -> Dict:
+        now = time.monotonic()
+        return {
+            "state": self._state,
+            "open_for_seconds": round(now - self._opened_at, 1) if self._opened_at else 0.0,
+            "next_probe_in_seconds": (
+                round(max(self._probe_at - now, 0.0), 1) if self._state == OPEN else None
+            ),
+            "rejected": self.rejected,
+            "last_error": self._last_error,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name: str, **options) -> CircuitBreaker:
+    """
+    Process-wide breaker for a dependency; options apply on first use.
+    """
+    breaker = _breakers.get(name)
+    if breaker is not None:
+        return breaker
+
+    with _registry_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, **options)
+        return _breakers[name]
+
+
+def breaker_status() -> Dict[str, Dict]:
+    return {name: breaker.status() for name, breaker in _breakers.items()}
@@ -2,9 +2,11 @@
 from pathlib import Path
 import os
 from dotenv import load_dotenv
-from supabase import create_client
+from supabase import acreate_client, create_client
 from typing import Optional
 
+from backend.app.core.circuit_breaker import get_breaker
+
 load_dotenv()
 
 BASE_DIR = Path(__file__).resolve().parents[3]
@@ -17,34 +19,214 @@ PARSED_DIR.mkdir(parents=True, exist_ok=True)
 MAX_FILE_SIZE_MB = 20
 ALLOWED_EXTENSIONS = {".pdf", ".docx", ".pptx"}
 
+# Legacy flat-file hash registry; migrated once into DOCUMENT_REGISTRY_PATH
 HASH_REGISTRY_FILE = BASE_DIR / "data" / "hash_registry.txt"
-HASH_REGISTRY_FILE.touch(exist_ok=True)
+DOCUMENT_REGISTRY_PATH = Path(os.getenv("DOCUMENT_REGISTRY_PATH", BASE_DIR / "data" / "documents.sqlite3"))
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
+# LLM gateway: any OpenAI-compatible endpoint (Groq by default)
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://api.groq.com/openai/v1")
+LLM_API_KEY = os.getenv("LLM_API_KEY") or os.getenv("GROQ_API_KEY")
+LLM_MODEL = os.getenv("LLM_MODEL", "llama-3.1-8b-instant")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_RATE_LIMIT_RPS = float(os.getenv("LLM_RATE_LIMIT_RPS", "0"))  # 0 = unlimited
+LLM_RATE_LIMIT_BURST = int(os.getenv("LLM_RATE_LIMIT_BURST", "10"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", "0.5"))
+LLM_RETRY_MAX_SECONDS = float(os.getenv("LLM_RETRY_MAX_SECONDS", "8"))
+LLM_HEDGE_AFTER_MS = float(os.getenv("LLM_HEDGE_AFTER_MS", "0"))  # 0 = no hedging
+
+# Embedding model (loaded once per process, see services/model_registry.py)
+EMBED_MODEL_NAME = os.getenv("EMBED_MODEL_NAME", "nomic-ai/nomic-embed-text-v1.5")
+EMBED_WARMUP_ON_STARTUP = os.getenv("EMBED_WARMUP_ON_STARTUP", "true").lower() == "true"
+
+# Batched embedding (ingestion)
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+EMBED_MAX_BATCH_TOKENS = int(os.getenv("EMBED_MAX_BATCH_TOKENS", "8192"))  # 0 = fixed-size batches
+EMBED_NUM_THREADS = int(os.getenv("EMBED_NUM_THREADS", "0"))  # 0 = torch default
+
+# Request-path embedding runs on a bounded executor, off the event loop
+EMBED_EXECUTOR_WORKERS = int(os.getenv("EMBED_EXECUTOR_WORKERS", "2"))
+
+# Persistent chunk embedding cache (content-addressed, LRU-bounded)
+EMBED_CACHE_ENABLED = os.getenv("EMBED_CACHE_ENABLED", "true").lower() == "true"
+EMBED_CACHE_PATH = Path(os.getenv("EMBED_CACHE_PATH", BASE_DIR / "data" / "embedding_cache.sqlite3"))
+EMBED_CACHE_MAX_ENTRIES = int(os.getenv("EMBED_CACHE_MAX_ENTRIES", "200000"))
+
+# Query embedding cache (in-process LRU + optional Redis tier)
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "2048"))
+QUERY_CACHE_TTL_SECONDS = int(os.getenv("QUERY_CACHE_TTL_SECONDS", "3600"))
+QUERY_CACHE_REDIS_ENABLED = os.getenv("QUERY_CACHE_REDIS_ENABLED", "false").lower() == "true"
+
+# Hybrid retrieval: SQLite FTS5 (BM25) + vector, reciprocal rank fusion
+HYBRID_ENABLED = os.getenv("HYBRID_ENABLED", "true").lower() == "true"
+LEXICAL_INDEX_DIR = Path(os.getenv("LEXICAL_INDEX_DIR", BASE_DIR / "data" / "lexical_index"))  # one FTS5 db per session
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "20"))
+HYBRID_VECTOR_WEIGHT = float(os.getenv("HYBRID_VECTOR_WEIGHT", "1.0"))
+HYBRID_LEXICAL_WEIGHT = float(os.getenv("HYBRID_LEXICAL_WEIGHT", "1.0"))
+HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", "60"))
+HYBRID_LEXICAL_BUDGET_MS = float(os.getenv("HYBRID_LEXICAL_BUDGET_MS", "50"))
+
+# Optional cross-encoder reranking (CPU, time-budgeted)
+RERANK_ENABLED = os.getenv("RERANK_ENABLED", "false").lower() == "true"
+RERANK_MODEL_NAME = os.getenv("RERANK_MODEL_NAME", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+RERANK_CANDIDATES = int(os.getenv("RERANK_CANDIDATES", "30"))
+RERANK_TOP_N = int(os.getenv("RERANK_TOP_N", "3"))
+RERANK_BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", "10"))
+RERANK_MAX_LENGTH = int(os.getenv("RERANK_MAX_LENGTH", "256"))
+RERANK_BUDGET_MS = float(os.getenv("RERANK_BUDGET_MS", "150"))
+
+# Prompt packing: total token budget for the assembled RAG prompt
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "3000"))
+CONTEXT_DEDUP_THRESHOLD = float(os.getenv("CONTEXT_DEDUP_THRESHOLD", "0.85"))
+
+# Semantic answer cache (per session + document-set version)
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+ANSWER_CACHE_PATH = Path(os.getenv("ANSWER_CACHE_PATH", BASE_DIR / "data" / "answer_cache.sqlite3"))
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.95"))
+ANSWER_CACHE_MAX_PER_SESSION = int(os.getenv("ANSWER_CACHE_MAX_PER_SESSION", "256"))
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "100000"))  # across sessions, least recently used go first
+ANSWER_CACHE_TTL_SECONDS = int(os.getenv("ANSWER_CACHE_TTL_SECONDS", "86400"))
+ANSWER_CACHE_REPLAY_CHARS = int(os.getenv("ANSWER_CACHE_REPLAY_CHARS", "64"))
+
+# Write-behind chat persistence: local SQLite spool, bulk-flushed to Supabase
+CHAT_WRITE_BEHIND_ENABLED = os.getenv("CHAT_WRITE_BEHIND_ENABLED", "true").lower() == "true"
+CHAT_SPOOL_PATH = Path(os.getenv("CHAT_SPOOL_PATH", BASE_DIR / "data" / "chat_spool.sqlite3"))
+CHAT_FLUSH_BATCH_SIZE = int(os.getenv("CHAT_FLUSH_BATCH_SIZE", "100"))
+CHAT_FLUSH_INTERVAL_SECONDS = float(os.getenv("CHAT_FLUSH_INTERVAL_SECONDS", "1.0"))
+CHAT_FLUSH_MAX_BACKOFF_SECONDS = float(os.getenv("CHAT_FLUSH_MAX_BACKOFF_SECONDS", "60"))
+CHAT_FLUSH_MAX_ATTEMPTS = int(os.getenv("CHAT_FLUSH_MAX_ATTEMPTS", "8"))  # then the row is dead-lettered
+
+# Session listing: keyset pagination + Redis read-through cache with ETags
+SESSION_PAGE_SIZE = int(os.getenv("SESSION_PAGE_SIZE", "50"))
+SESSION_PAGE_SIZE_MAX = int(os.getenv("SESSION_PAGE_SIZE_MAX", "200"))
+SESSION_CACHE_ENABLED = os.getenv("SESSION_CACHE_ENABLED", "true").lower() == "true"
+SESSION_CACHE_TTL_SECONDS = int(os.getenv("SESSION_CACHE_TTL_SECONDS", "300"))
+
+# Background session title generation (bounded queue, batched LLM calls)
+TITLE_QUEUE_SIZE = int(os.getenv("TITLE_QUEUE_SIZE", "256"))
+TITLE_WORKERS = int(os.getenv("TITLE_WORKERS", "2"))
+TITLE_BATCH_SIZE = int(os.getenv("TITLE_BATCH_SIZE", "8"))
+TITLE_BATCH_WAIT_MS = float(os.getenv("TITLE_BATCH_WAIT_MS", "100"))
+
+# Milvus vector store (pooled, long-lived connections)
+MILVUS_HOST = os.getenv("MILVUS_HOST", "localhost")
+MILVUS_PORT = os.getenv("MILVUS_PORT", "19530")
+MILVUS_URI = os.getenv("MILVUS_URI", f"tcp://{MILVUS_HOST}:{MILVUS_PORT}")
+MILVUS_COLLECTION = os.getenv("MILVUS_COLLECTION", "documind_documents")
+MILVUS_DIM = int(os.getenv("MILVUS_DIM", "768"))
+MILVUS_POOL_SIZE = int(os.getenv("MILVUS_POOL_SIZE", "4"))
+MILVUS_TIMEOUT_SECONDS = float(os.getenv("MILVUS_TIMEOUT_SECONDS", "10"))
+MILVUS_INSERT_TIMEOUT_SECONDS = float(os.getenv("MILVUS_INSERT_TIMEOUT_SECONDS", "120"))
+
+# Vector store backend: "milvus", or "local" (memory-mapped matrices under
+# VECTOR_STORE_PATH, no server). MILVUS_DIM is the vector size for both.
+VECTOR_STORE_BACKEND = os.getenv("VECTOR_STORE_BACKEND", "milvus").lower()
+VECTOR_STORE_PATH = Path(os.getenv("VECTOR_STORE_PATH", BASE_DIR / "data" / "vector_store"))
+VECTOR_INDEX = os.getenv("VECTOR_INDEX", "exact").lower()  # local only: exact | hnsw (needs faiss-cpu)
+VECTOR_EXACT_MAX_ROWS = int(os.getenv("VECTOR_EXACT_MAX_ROWS", "20000"))  # smaller candidate sets skip HNSW
+VECTOR_HNSW_M = int(os.getenv("VECTOR_HNSW_M", "32"))
+VECTOR_HNSW_EF_CONSTRUCTION = int(os.getenv("VECTOR_HNSW_EF_CONSTRUCTION", "200"))
+VECTOR_HNSW_EF_SEARCH = int(os.getenv("VECTOR_HNSW_EF_SEARCH", "128"))
+VECTOR_COMPACT_RATIO = float(os.getenv("VECTOR_COMPACT_RATIO", "0.3"))  # deleted share that triggers compaction
+
+# Durable ingestion queue (SQLite) + worker processes
+INGESTION_QUEUE_PATH = Path(os.getenv("INGESTION_QUEUE_PATH", BASE_DIR / "data" / "ingestion_jobs.sqlite3"))
+INGESTION_WORKER_CONCURRENCY = int(os.getenv("INGESTION_WORKER_CONCURRENCY", "2"))
+INGESTION_MAX_ATTEMPTS = int(os.getenv("INGESTION_MAX_ATTEMPTS", "3"))
+INGESTION_RETRY_BASE_SECONDS = float(os.getenv("INGESTION_RETRY_BASE_SECONDS", "5"))
+INGESTION_POLL_SECONDS = float(os.getenv("INGESTION_POLL_SECONDS", "1"))
+INGESTION_HEARTBEAT_SECONDS = float(os.getenv("INGESTION_HEARTBEAT_SECONDS", "30"))
+INGESTION_JOB_TIMEOUT_SECONDS = int(os.getenv("INGESTION_JOB_TIMEOUT_SECONDS", "300"))  # lease: no heartbeat for this long -> requeue
+
+# Parallel page-level parsing
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+PARSE_PAGES_PER_TASK = int(os.getenv("PARSE_PAGES_PER_TASK", "8"))
+PARSE_PARALLEL_MIN_PAGES = int(os.getenv("PARSE_PARALLEL_MIN_PAGES", "24"))
+
+# Streaming ingestion pipeline (bounded memory)
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "4"))
+INGEST_CHUNK_WINDOW_CHARS = int(os.getenv("INGEST_CHUNK_WINDOW_CHARS", "200000"))
+INGEST_BATCH_NODES = int(os.getenv("INGEST_BATCH_NODES", "128"))
+
+# Circuit breakers for Supabase / Redis (see core/circuit_breaker.py)
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "3"))
+BREAKER_FAILURE_WINDOW_SECONDS = float(os.getenv("BREAKER_FAILURE_WINDOW_SECONDS", "30"))
+BREAKER_BASE_OPEN_SECONDS = float(os.getenv("BREAKER_BASE_OPEN_SECONDS", "1"))
+BREAKER_MAX_OPEN_SECONDS = float(os.getenv("BREAKER_MAX_OPEN_SECONDS", "60"))
+
+BREAKER_OPTIONS = {
+    "failure_threshold": BREAKER_FAILURE_THRESHOLD,
+    "failure_window_seconds": BREAKER_FAILURE_WINDOW_SECONDS,
+    "base_open_seconds": BREAKER_BASE_OPEN_SECONDS,
+    "max_open_seconds": BREAKER_MAX_OPEN_SECONDS,
+}
+
+supabase_breaker = get_breaker("supabase", **BREAKER_OPTIONS)
+
 _supabase_client: Optional[object] = None
+_async_supabase_client: Optional[object] = None
 
 
 def get_supabase_client():
     """
     Lazily initialize Supabase client with health check.
+    Returns None without touching the network while the breaker is open.
     """
     global _supabase_client
 
-    if _supabase_client is not None:
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        return None
+
+    if not supabase_breaker.allow():
+        return None
+
+    # Cached client, unless this caller is the half-open probe
+    if _supabase_client is not None and not supabase_breaker.half_open:
         return _supabase_client
 
+    try:
+        client = _supabase_client or create_client(SUPABASE_URL, SUPABASE_KEY)
+        # Lightweight health check
+        client.table("chat_messages").select("id").limit(1).execute()
+    except Exception as e:
+        supabase_breaker.record_failure(e)
+        return None
+
+    supabase_breaker.record_success()
+    _supabase_client = client
+    return client
+
+
+async def get_async_supabase_client():
+    """
+    Lazily initialize the async Supabase client for request paths.
+    Shares the Supabase breaker with the sync client.
+    """
+    global _async_supabase_client
+
     if not SUPABASE_URL or not SUPABASE_KEY:
         return None
 
+    if not supabase_breaker.allow():
+        return None
+
+    if _async_supabase_client is not None and not supabase_breaker.half_open:
+        return _async_supabase_client
+
     try:
-        client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        client = _async_supabase_client or await acreate_client(SUPABASE_URL, SUPABASE_KEY)
         # Lightweight health check
-        client.table("chat_messages").select("id").limit(1).execute()
-        _supabase_client = client
-        return client
-    except Exception:
+        await client.table("chat_messages").select("id").limit(1).execute()
+    except Exception as e:
+        supabase_breaker.record_failure(e)
         return None
+
+    supabase_breaker.record_success()
+    _async_supabase_client = client
+    return client
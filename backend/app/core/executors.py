@@ -0,0 +1,27 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, TypeVar
+
+from backend.app.core.config import EMBED_EXECUTOR_WORKERS
+
+T = TypeVar("T")
+
+# Bounded so CPU-bound inference can't starve the rest of the process;
+# extra requests queue here instead of on the event loop.
+embedding_executor = ThreadPoolExecutor(
+    max_workers=EMBED_EXECUTOR_WORKERS,
+    thread_name_prefix="embed",
+)
+
+
+async def run_in_embedding_executor(fn: Callable[..., T], *args, **kwargs) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        embedding_executor,
+        partial(fn, *args, **kwargs),
+    )
+
+
+def shutdown_executors() -> None:
+    embedding_executor.shutdown(wait=False, cancel_futures=True)
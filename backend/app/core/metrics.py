@@ -0,0 +1,83 @@
+import os
+import time
+from typing import Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# 1ms .. 2min: Redis round trips through whole-document ingestion stages
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1, 2.5, 5, 10, 30, 60, 120,
+)
+CHUNK_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+STAGE_SECONDS = Histogram(
+    "documind_stage_duration_seconds",
+    "Time spent in a hot-path stage",
+    ["path", "stage", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+INGEST_CHUNKS = Histogram(
+    "documind_ingest_chunks",
+    "Chunks handled per document by an ingestion stage",
+    ["stage"],
+    buckets=CHUNK_BUCKETS,
+)
+
+INGEST_DOCUMENTS = Counter(
+    "documind_ingest_documents_total",
+    "Documents ingested",
+    ["outcome"],
+)
+
+
+def observe_stage(path: str, stage: str, seconds: float, outcome: str = "ok") -> None:
+    STAGE_SECONDS.labels(path=path, stage=stage, outcome=outcome).observe(seconds)
+
+
+class StageTimer:
+    """
+    Time a block as a stage (awaits inside the block are fine):
+
+        with StageTimer("chat", "context_assembly"):
+            ...
+
+    The outcome is "error" if the block raises, else "ok"; set
+    `.outcome` inside the block for anything more specific.
+    """
+
+    def __init__(self, path: str, stage: str):
+        self.path = path
+        self.stage = stage
+        self.outcome: Optional[str] = None
+        self._start = 0.0
+
+    def __enter__(self) -> "StageTimer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        outcome = "error" if exc_type is not None else (self.outcome or "ok")
+        observe_stage(self.path, self.stage, time.perf_counter() - self._start, outcome)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Prometheus exposition of this process, or of every process sharing
+    PROMETHEUS_MULTIPROC_DIR (API workers + ingestion workers).
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
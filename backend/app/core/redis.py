@@ -1,27 +1,71 @@
 import redis
-from backend.app.core.config import REDIS_URL
+import redis.asyncio as aioredis
+from backend.app.core.circuit_breaker import get_breaker
+from backend.app.core.config import BREAKER_OPTIONS, REDIS_URL
 import logging
 
 logger = logging.getLogger(__name__)
 
 _redis_client = None
+_async_redis_clients = {}
+
+redis_breaker = get_breaker("redis", **BREAKER_OPTIONS)
 
 
 def get_redis_client():
+    """
+    Sync Redis client, or None while Redis is unavailable (the breaker
+    answers without a connect attempt while open).
+    """
     global _redis_client
 
-    if _redis_client:
+    if not redis_breaker.allow():
+        return None
+
+    if _redis_client and not redis_breaker.half_open:
         return _redis_client
 
     try:
-        client = redis.Redis.from_url(
+        client = _redis_client or redis.Redis.from_url(
             REDIS_URL,
             decode_responses=True,
             socket_connect_timeout=1
         )
         client.ping()
-        _redis_client = client
+    except Exception as e:
+        redis_breaker.record_failure(e)
+        logger.warning(f"Redis unavailable: {e}")
+        return None
+
+    redis_breaker.record_success()
+    _redis_client = client
+    return client
+
+
+async def get_async_redis_client(decode_responses: bool = True):
+    """
+    Async Redis client for request paths running on the event loop.
+    Pass decode_responses=False for binary values.
+    """
+    if not redis_breaker.allow():
+        return None
+
+    client = _async_redis_clients.get(decode_responses)
+    if client and not redis_breaker.half_open:
         return client
+
+    try:
+        client = client or aioredis.Redis.from_url(
+            REDIS_URL,
+            decode_responses=decode_responses,
+            socket_connect_timeout=1
+        )
+        await client.ping()
     except Exception as e:
+        redis_breaker.record_failure(e)
         logger.warning(f"Redis unavailable: {e}")
         return None
+
+    redis_breaker.record_success()
+    _async_redis_clients[decode_responses] = client
+    return client
@@ -0,0 +1,22 @@
+import sqlite3
+from pathlib import Path
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """
+    Open a SQLite database shared between API workers and background
+    processes. WAL lets readers proceed while a writer holds the lock.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(
+        str(path),
+        timeout=30,
+        check_same_thread=False,
+        isolation_level=None,  # autocommit; use explicit BEGIN for transactions
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+
+    return conn
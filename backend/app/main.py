@@ -1,19 +1,102 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
 
 from backend.app.api.upload import router as upload_router
 from backend.app.api.chat import router as chat_router
 from backend.app.api.sessions import router as sessions_router  # ✅ NEW
+from backend.app.core.config import (
+    CHAT_WRITE_BEHIND_ENABLED,
+    EMBED_WARMUP_ON_STARTUP,
+    RERANK_ENABLED,
+)
+from backend.app.core.circuit_breaker import breaker_status
+from backend.app.core.executors import shutdown_executors
+from backend.app.core.metrics import render_metrics
 from backend.app.core.logging import setup_logger
+from backend.app.services import model_registry
+from backend.app.services.answer_cache import get_answer_cache
+from backend.app.services.embedding_cache import get_embedding_cache
+from backend.app.services.lexical_index import get_lexical_index
+from backend.app.services.llm_gateway import get_llm_gateway
+from backend.app.services.message_spool import chat_message_spool
+from backend.app.services.parsing import shutdown_parse_pool
+from backend.app.services.reranker import rerank_stats
+from backend.app.services.retriever import query_embedding_cache
+from backend.app.services.title_generator import title_generator
+from backend.app.services.vector_store import get_vector_backend
 
 logger = setup_logger()
 
+WARMUP_RETRY_BASE_SECONDS = 5
+WARMUP_RETRY_MAX_SECONDS = 300
+
+
+async def _warmup_models():
+    """
+    Warm every startup model, retrying failures with backoff. /health
+    stays 503 (and shows the last error) until all of them are warm.
+    """
+    model_registry.require_startup_models(rerank=RERANK_ENABLED)
+
+    warmups = [("Embedding", model_registry.warmup_embed_model)]
+    if RERANK_ENABLED:
+        warmups.append(("Rerank", model_registry.warmup_rerank_model))
+
+    for name, warmup in warmups:
+        delay = WARMUP_RETRY_BASE_SECONDS
+        while True:
+            try:
+                await asyncio.to_thread(warmup)
+                break
+            except Exception as e:
+                logger.error(f"{name} model warmup failed, retrying in {delay}s | {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, WARMUP_RETRY_MAX_SECONDS)
+
+
+async def _open_vector_store():
+    try:
+        await asyncio.to_thread(get_vector_backend().open)
+    except Exception as e:
+        # Connections are retried lazily on first use
+        logger.error(f"Vector store startup failed: {e}")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("DocuMind backend started")
+
+    # Load + warm the embedding model off the event loop so /health can
+    # report "not ready" to the load balancer while weights are loading.
+    warmup_task = None
+    if EMBED_WARMUP_ON_STARTUP:
+        warmup_task = asyncio.create_task(_warmup_models())
+
+    await _open_vector_store()
+
+    # Also delivers messages left in the spool by a previous run
+    if CHAT_WRITE_BEHIND_ENABLED:
+        chat_message_spool.start()
+
+    title_generator.start()
+
     yield
+
+    await title_generator.stop()
+
+    if CHAT_WRITE_BEHIND_ENABLED:
+        await chat_message_spool.stop()
+
+    if warmup_task and not warmup_task.done():
+        warmup_task.cancel()
+
+    get_vector_backend().close()
+    shutdown_executors()
+    shutdown_parse_pool()
     logger.info("DocuMind backend stopped")
 
 
@@ -32,6 +115,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 # ✅ Routers
@@ -42,4 +126,51 @@ app.include_router(sessions_router)  # ✅ NEW
 
 @app.get("/health")
 def health_check():
-    return {"status": "DocuMind backend running"}
\ No newline at end of file
+    """
+    Liveness + readiness probe.
+    Returns 503 until the startup models are loaded and warmed.
+    Open dependency breakers are reported but do not affect readiness:
+    chat degrades without Supabase / Redis.
+    """
+    ready = model_registry.is_ready() or not EMBED_WARMUP_ON_STARTUP
+
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "DocuMind backend running",
+            "ready": ready,
+            "models": model_registry.registry_status(),
+            "dependencies": breaker_status(),
+        },
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Prometheus scrape endpoint: per-stage latency histograms for the
+    chat and ingestion paths, labeled by stage and outcome.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/stats")
+def cache_stats():
+    """
+    Cache statistics for capacity sizing.
+    """
+    embedding_cache = get_embedding_cache()
+    answer_cache = get_answer_cache()
+
+    return {
+        "embedding_cache": embedding_cache.stats() if embedding_cache else None,
+        "query_embedding_cache": query_embedding_cache.stats(),
+        "lexical_index": get_lexical_index().stats(),
+        "rerank": rerank_stats.stats(),
+        "answer_cache": answer_cache.stats() if answer_cache else None,
+        "chat_message_spool": chat_message_spool.stats() if CHAT_WRITE_BEHIND_ENABLED else None,
+        "title_generator": title_generator.stats(),
+        "llm_gateway": get_llm_gateway().stats(),
+        "vector_store": get_vector_backend().stats(),
+    }
\ No newline at end of file
@@ -2,7 +2,7 @@ from datetime import datetime
 
 from backend.app.services.chunking import chunk_document
 from backend.app.services.embeddings import generate_embeddings
-from backend.app.services.vector_store import get_vector_store, store_embeddings
+from backend.app.services.vector_store import store_embeddings
 
 
 def index_document(
@@ -25,7 +25,6 @@ def index_document(
     embedded_nodes = generate_embeddings(nodes)
 
     # STEP 4: Vector Storage
-    vector_store = get_vector_store()
-    store_embeddings(embedded_nodes, vector_store)
+    store_embeddings(embedded_nodes)
 
     return len(embedded_nodes)
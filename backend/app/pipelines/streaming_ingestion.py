@@ -0,0 +1,333 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+from llama_index.core import Document
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.schema import TextNode
+
+from backend.app.core.config import (
+    INGEST_BATCH_NODES,
+    INGEST_CHUNK_WINDOW_CHARS,
+    INGEST_QUEUE_SIZE,
+)
+from backend.app.utils.text_cleaner import clean_page_text
+
+T = TypeVar("T")
+
+CHUNK_SIZE = 512
+CHUNK_OVERLAP = 50
+
+_DONE = object()
+
+
+@dataclass
+class IngestionStats:
+    pages: int = 0
+    characters: int = 0
+    chunks: int = 0
+    batches: int = 0
+    # Busy time per stage; stages overlap, so these don't add up to wall time
+    parse_seconds: float = 0.0
+    chunk_seconds: float = 0.0
+    embed_seconds: float = 0.0
+    insert_seconds: float = 0.0
+
+
+class _StageError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class StageCancelled(Exception):
+    """
+    Raised inside a stage thread when the pipeline is being torn down.
+    """
+
+
+def bounded_stage(
+    source: Iterable[T],
+    maxsize: int = INGEST_QUEUE_SIZE,
+    name: str = "stage",
+    stop: Optional[threading.Event] = None,
+    threads: Optional[List[threading.Thread]] = None
+) -> Iterator[T]:
+    """
+    Run `source` in a background thread, handing items over through a
+    bounded queue. The producer blocks when the consumer falls behind,
+    which is what keeps memory flat. Producer errors re-raise in the
+    consumer; if the consumer stops early, the producer is told to stop.
+
+    Stages chained with a shared `stop` event are cancelled together:
+    setting it makes every producer and consumer give up, and the
+    threads are appended to `threads` so the caller can join them.
+    """
+    items: "queue.Queue" = queue.Queue(maxsize=maxsize)
+    stop = stop or threading.Event()
+
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce():
+        try:
+            for item in source:
+                if not _put(item):
+                    return
+            _put(_DONE)
+        except BaseException as e:
+            _put(_StageError(e))
+        finally:
+            close = getattr(source, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=_produce, name=f"ingest-{name}", daemon=True)
+    if threads is not None:
+        threads.append(thread)
+    thread.start()
+
+    try:
+        while True:
+            if stop.is_set():
+                raise StageCancelled(name)
+            try:
+                item = items.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                return
+            if isinstance(item, _StageError):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+
+
+def _timed(source: Iterable[T], record: Callable[[float], None]) -> Iterator[T]:
+    """
+    Pass items through, recording the time spent producing each one.
+    """
+    iterator = iter(source)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            record(time.perf_counter() - start)
+            return
+        record(time.perf_counter() - start)
+        yield item
+
+
+def _batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    batch: List[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_chunks(
+    pages: Iterable[str],
+    document_id: str,
+    metadata: Dict,
+    window_chars: int = INGEST_CHUNK_WINDOW_CHARS,
+    stats: Optional[IngestionStats] = None
+) -> Iterator[TextNode]:
+    """
+    Chunk a stream of page texts without materialising the whole document.
+
+    Pages are accumulated into windows of ~window_chars. Each window is
+    split, and all but its last chunk are emitted; the last chunk's text
+    is carried into the next window so sentences spanning a window
+    boundary are not cut.
+    """
+    stats = stats or IngestionStats()
+    splitter = SentenceSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+
+    # Window state: text pieces, their global start offset, page spans
+    window: List[str] = []
+    window_len = 0
+    window_start = 0
+    page_starts: List[tuple] = []  # (global_start, page_number)
+    doc_cursor = 0
+    chunk_index = 0
+
+    def page_for(global_offset: int) -> Optional[int]:
+        page_number = None
+        for start, number in page_starts:
+            if start > global_offset:
+                break
+            page_number = number
+        return page_number
+
+    def split_window(final: bool):
+        nonlocal window, window_len, window_start, page_starts, chunk_index
+
+        text = "\n".join(window)
+        document = Document(text=text, id_=document_id, metadata=dict(metadata))
+        nodes = splitter.get_nodes_from_documents([document])
+
+        carry = None
+        if not final and len(nodes) > 1 and nodes[-1].start_char_idx is not None:
+            carry = nodes[-1]
+            nodes = nodes[:-1]
+
+        for node in nodes:
+            offset = window_start + (node.start_char_idx or 0)
+            node.metadata.update({
+                "chunk_index": chunk_index,
+                "page_number": page_for(offset),
+            })
+            chunk_index += 1
+            yield node
+
+        if carry is not None:
+            carry_start = window_start + carry.start_char_idx
+            window = [text[carry.start_char_idx:]]
+            window_len = len(window[0])
+            window_start = carry_start
+            carry_page = page_for(carry_start)
+            page_starts = [(carry_start, carry_page)] + [
+                (start, number) for start, number in page_starts if start > carry_start
+            ]
+        else:
+            window, window_len = [], 0
+            window_start = doc_cursor
+            page_starts = []
+
+    for page_number, raw_page in enumerate(pages, start=1):
+        page = clean_page_text(raw_page)
+        stats.pages += 1
+        stats.characters += len(page)
+
+        if window:
+            doc_cursor += 1  # "\n" between pages
+        page_starts.append((doc_cursor, page_number))
+        window.append(page)
+        window_len += len(page) + 1
+        doc_cursor += len(page)
+
+        if window_len >= window_chars:
+            yield from split_window(final=False)
+
+    if window:
+        yield from split_window(final=True)
+
+
+def run_streaming_ingestion(
+    pages: Iterable[str],
+    document_id: str,
+    metadata: Dict,
+    embed_fn: Callable[[List[TextNode]], List[TextNode]],
+    insert_fn: Callable[[List[TextNode]], object],
+    parsed_output_path: Optional[Path] = None,
+    batch_size: int = INGEST_BATCH_NODES,
+    on_embedding_start: Optional[Callable[[], None]] = None,
+    stop: Optional[threading.Event] = None
+) -> IngestionStats:
+    """
+    parse → clean → chunk → embed → insert, with bounded queues between
+    the parse, chunk and embed stages and inserts issued per batch.
+
+    Memory is bounded by the queue sizes, the chunk window and the batch
+    size rather than by the document size. Setting `stop` from another
+    thread aborts the run with StageCancelled; it is also set once the
+    run ends.
+    """
+    stats = IngestionStats()
+
+    def add_time(field: str, sign: int = 1) -> Callable[[float], None]:
+        def record(seconds: float) -> None:
+            setattr(stats, field, getattr(stats, field) + sign * seconds)
+        return record
+
+    def tee_parsed(page_iter: Iterable[str]) -> Iterator[str]:
+        # Persist parsed text as it streams past, page by page
+        if parsed_output_path is None:
+            yield from page_iter
+            return
+
+        with open(parsed_output_path, "w", encoding="utf-8") as out:
+            for idx, page in enumerate(page_iter):
+                if idx:
+                    out.write("\n")
+                out.write(page)
+                yield page
+
+    # Shared by every stage: set once the consumer below stops for any reason
+    stop = stop or threading.Event()
+    threads: List[threading.Thread] = []
+
+    def embed_batches(batches: Iterable[List[TextNode]]) -> Iterator[List[TextNode]]:
+        started = False
+        for batch in batches:
+            if stop.is_set():
+                return
+            if not started and on_embedding_start:
+                on_embedding_start()
+            started = True
+            start = time.perf_counter()
+            embedded_batch = embed_fn(batch)
+            stats.embed_seconds += time.perf_counter() - start
+            yield embedded_batch
+
+    parsed_pages = bounded_stage(
+        tee_parsed(_timed(pages, add_time("parse_seconds"))),
+        name="parse",
+        stop=stop,
+        threads=threads,
+    )
+    # Chunking time excludes waiting for parsed pages
+    chunks = bounded_stage(
+        _timed(
+            iter_chunks(
+                _timed(parsed_pages, add_time("chunk_seconds", -1)),
+                document_id,
+                metadata,
+                stats=stats,
+            ),
+            add_time("chunk_seconds"),
+        ),
+        maxsize=batch_size * 2,
+        name="chunk",
+        stop=stop,
+        threads=threads,
+    )
+    embedded = bounded_stage(
+        embed_batches(_batched(chunks, batch_size)),
+        name="embed",
+        stop=stop,
+        threads=threads,
+    )
+
+    try:
+        for batch in embedded:
+            start = time.perf_counter()
+            insert_fn(batch)
+            stats.insert_seconds += time.perf_counter() - start
+            stats.chunks += len(batch)
+            stats.batches += 1
+    finally:
+        # On failure the upstream stages would otherwise keep parsing,
+        # embedding and indexing in the background. An in-flight
+        # embed_fn call finishes; no new one starts after the join.
+        stop.set()
+        for thread in threads:
+            thread.join()
+        for stage in (embedded, chunks, parsed_pages):
+            stage.close()
+
+    return stats
@@ -0,0 +1,245 @@
+import asyncio
+import threading
+import time
+from pathlib import Path
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.app.core.config import (
+    ANSWER_CACHE_ENABLED,
+    ANSWER_CACHE_MAX_ENTRIES,
+    ANSWER_CACHE_MAX_PER_SESSION,
+    ANSWER_CACHE_PATH,
+    ANSWER_CACHE_REPLAY_CHARS,
+    ANSWER_CACHE_SIMILARITY,
+    ANSWER_CACHE_TTL_SECONDS,
+)
+from backend.app.core.sqlite import connect
+
+# Global size cap is enforced every this many stores
+PRUNE_EVERY_STORES = 100
+
+# Shared by API workers (lookups) and ingestion workers (invalidation)
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS session_docsets (
+    session_id TEXT PRIMARY KEY,
+    version    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS answers (
+    id              INTEGER PRIMARY KEY,
+    session_id      TEXT NOT NULL,
+    docset_version  INTEGER NOT NULL,
+    query           TEXT NOT NULL,
+    embedding       BLOB NOT NULL,
+    answer          TEXT NOT NULL,
+    created_at      REAL NOT NULL,
+    last_used_at    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_answers_session
+    ON answers (session_id, docset_version, created_at);
+CREATE INDEX IF NOT EXISTS idx_answers_last_used
+    ON answers (last_used_at);
+"""
+
+
+class AnswerCache:
+    """
+    Semantic answer cache: a question whose embedding is within
+    similarity_threshold (cosine) of an earlier question in the same
+    session, asked against the same set of ingested documents, reuses
+    that answer instead of retrieval + generation.
+
+    Each session has a document-set version that ingestion bumps, which
+    retires every answer cached under the previous version. Besides the
+    per-session cap, at most max_entries answers are kept overall; the
+    least recently used go first.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        similarity_threshold: float = ANSWER_CACHE_SIMILARITY,
+        max_per_session: int = ANSWER_CACHE_MAX_PER_SESSION,
+        ttl_seconds: int = ANSWER_CACHE_TTL_SECONDS,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES
+    ):
+        self.path = path
+        self.similarity_threshold = similarity_threshold
+        self.max_per_session = max_per_session
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.executescript(_SCHEMA)
+
+        self._stores_since_prune = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def docset_version(self, session_id: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM session_docsets WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+        return row[0] if row else 0
+
+    def lookup(
+        self,
+        session_id: str,
+        query_embedding: List[float]
+    ) -> Tuple[Optional[str], int]:
+        """
+        Returns (cached answer or None, document-set version). Pass the
+        version back to store() so an answer generated while a document
+        was being ingested is filed under the version it was based on.
+        """
+        version = self.docset_version(session_id)
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT embedding, answer, id FROM answers "
+                "WHERE session_id = ? AND docset_version = ? AND created_at > ?",
+                (session_id, version, time.time() - self.ttl_seconds),
+            ).fetchall()
+
+        if not rows:
+            self.misses += 1
+            return None, version
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        matrix = np.stack([np.frombuffer(blob, dtype=np.float32) for blob, _, _ in rows])
+
+        norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+        similarities = (matrix @ query) / np.where(norms == 0, 1.0, norms)
+
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            self.misses += 1
+            return None, version
+
+        with self._lock:
+            self._conn.execute(
+                "UPDATE answers SET last_used_at = ? WHERE id = ?",
+                (time.time(), rows[best][2]),
+            )
+
+        self.hits += 1
+        return rows[best][1], version
+
+    def store(
+        self,
+        session_id: str,
+        docset_version: int,
+        query: str,
+        query_embedding: List[float],
+        answer: str
+    ) -> None:
+        if not answer.strip():
+            return  # nothing worth replaying
+
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO answers "
+                "(session_id, docset_version, query, embedding, answer, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (session_id, docset_version, query,
+                 np.asarray(query_embedding, dtype=np.float32).tobytes(), answer, now, now),
+            )
+            # Keep only the newest entries of this session, drop expired ones
+            self._conn.execute(
+                "DELETE FROM answers WHERE session_id = ? AND ("
+                "  created_at <= ? OR id NOT IN ("
+                "    SELECT id FROM answers WHERE session_id = ? "
+                "    ORDER BY created_at DESC LIMIT ?))",
+                (session_id, now - self.ttl_seconds, session_id, self.max_per_session),
+            )
+
+            self._stores_since_prune += 1
+            if self._stores_since_prune >= PRUNE_EVERY_STORES:
+                self._stores_since_prune = 0
+                self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        """
+        Drop expired answers of every session, then the least recently
+        used beyond max_entries. Caller holds the lock.
+        """
+        self._conn.execute("DELETE FROM answers WHERE created_at <= ?", (now - self.ttl_seconds,))
+        self._conn.execute(
+            "DELETE FROM answers WHERE id IN ("
+            "  SELECT id FROM answers ORDER BY last_used_at DESC "
+            "  LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def invalidate_session(self, session_id: str) -> None:
+        """
+        Called after a document finishes ingesting into the session.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO session_docsets (session_id, version) VALUES (?, 1) "
+                    "ON CONFLICT (session_id) DO UPDATE SET version = version + 1",
+                    (session_id,),
+                )
+                self._conn.execute("DELETE FROM answers WHERE session_id = ?", (session_id,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        self.invalidations += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "similarity_threshold": self.similarity_threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+_answer_cache: Optional[AnswerCache] = None
+
+
+def get_answer_cache() -> Optional[AnswerCache]:
+    """
+    Lazily open the process-wide answer cache.
+    Returns None when answer caching is disabled.
+    """
+    global _answer_cache
+
+    if not ANSWER_CACHE_ENABLED:
+        return None
+
+    if _answer_cache is None:
+        _answer_cache = AnswerCache(ANSWER_CACHE_PATH)
+
+    return _answer_cache
+
+
+async def replay_answer(
+    answer: str,
+    chunk_chars: int = ANSWER_CACHE_REPLAY_CHARS
+) -> AsyncGenerator[str, None]:
+    """
+    Stream a cached answer in pieces, like tokens from the LLM.
+    """
+    for start in range(0, len(answer), chunk_chars):
+        yield answer[start:start + chunk_chars]
+        await asyncio.sleep(0)
@@ -1,10 +1,21 @@
-from backend.app.core.config import get_supabase_client
+import asyncio
+from datetime import datetime, timezone
+
+from backend.app.core.config import (
+    CHAT_WRITE_BEHIND_ENABLED,
+    get_async_supabase_client,
+    get_supabase_client,
+    supabase_breaker,
+)
+from backend.app.core.metrics import StageTimer
+from backend.app.services.message_spool import chat_message_spool
+from backend.app.services.session_cache import invalidate_session_messages
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-def store_chat_message(
+async def store_chat_message(
     user_id: str,
     session_id: str,
     role: str,
@@ -13,21 +24,45 @@ def store_chat_message(
     """
     Durably persist chat messages to Supabase.
     Fail soft, but never silently.
+
+    With write-behind enabled the row goes to the local spool and is
+    bulk-inserted in the background, so no Supabase round trip happens
+    on the request path.
     """
-    client = get_supabase_client()
-    if not client:
-        logger.warning("Supabase unavailable — chat message not persisted")
+    row = {
+        "user_id": user_id,
+        "session_id": session_id,
+        "role": role,
+        "content": content,
+        # Set here: rows of one bulk insert would otherwise share a timestamp
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+    if CHAT_WRITE_BEHIND_ENABLED:
+        with StageTimer("chat", "message_spool") as timer:
+            try:
+                await asyncio.to_thread(chat_message_spool.append, "chat_messages", row)
+            except Exception as e:
+                timer.outcome = "error"
+                logger.error(f"Chat message spool write failed: {e}")
         return
 
-    try:
-        client.table("chat_messages").insert({
-            "user_id": user_id,
-            "session_id": session_id,
-            "role": role,
-            "content": content
-        }).execute()
-    except Exception as e:
-        logger.error(f"Supabase insert failed: {e}")
+    with StageTimer("chat", "supabase_write") as timer:
+        client = await get_async_supabase_client()
+        if not client:
+            timer.outcome = "unavailable"
+            logger.warning("Supabase unavailable — chat message not persisted")
+            return
+
+        try:
+            await client.table("chat_messages").insert(row).execute()
+        except Exception as e:
+            timer.outcome = "error"
+            supabase_breaker.record_failure(e)
+            logger.error(f"Supabase insert failed: {e}")
+            return
+
+    await invalidate_session_messages(session_id)
 
 
 def fetch_chat_history(session_id: str, limit: int = 20):
@@ -50,5 +85,6 @@ def fetch_chat_history(session_id: str, limit: int = 20):
         )
         return list(reversed(response.data)) if response.data else []
     except Exception as e:
+        supabase_breaker.record_failure(e)
         logger.error(f"Supabase fetch failed: {e}")
         return []
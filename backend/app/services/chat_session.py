@@ -1,5 +1,8 @@
-from typing import List, Dict
-from backend.app.core.redis import get_redis_client
+import struct
+import time
+from typing import List, Dict, Union
+from backend.app.core.metrics import StageTimer
+from backend.app.core.redis import get_async_redis_client, redis_breaker
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,42 +12,110 @@ MAX_CONTEXT_MESSAGES = 6
 
 REDIS_SESSION_PREFIX = "chat:session:"
 
+# Binary message layout (network byte order):
+#   version:u8 | role:u8 | timestamp:f64 | token_count:u32 | [role_len:u8 role] | content (UTF-8)
+# The role name bytes are only present for roles outside ROLE_CODES.
+MESSAGE_FORMAT_VERSION = 1
+_HEADER = struct.Struct("!BBdI")
+ROLE_CODES = {"user": 0, "assistant": 1, "system": 2}
+_ROLE_NAMES = {code: role for role, code in ROLE_CODES.items()}
+_CUSTOM_ROLE = 255
+
 
 def _session_key(session_id: str) -> str:
     return f"{REDIS_SESSION_PREFIX}{session_id}"
 
 
-def append_session_message(session_id: str, role: str, content: str):
-    redis_client = get_redis_client()
-    if not redis_client:
-        return
+def encode_message(
+    role: str,
+    content: str,
+    timestamp: float,
+    token_count: int = 0
+) -> bytes:
+    role_code = ROLE_CODES.get(role, _CUSTOM_ROLE)
+    header = _HEADER.pack(MESSAGE_FORMAT_VERSION, role_code, timestamp, token_count)
+
+    if role_code == _CUSTOM_ROLE:
+        role_bytes = role.encode("utf-8")[:255]
+        header += bytes([len(role_bytes)]) + role_bytes
+
+    return header + content.encode("utf-8")
+
+
+def decode_message(payload: Union[bytes, str]) -> Dict:
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+
+    if not payload or payload[0] != MESSAGE_FORMAT_VERSION:
+        # Entries written before the binary format: "role:content"
+        role, content = payload.decode("utf-8").split(":", 1)
+        return {"role": role, "content": content, "timestamp": None, "token_count": 0}
+
+    _, role_code, timestamp, token_count = _HEADER.unpack_from(payload)
+    offset = _HEADER.size
+
+    if role_code == _CUSTOM_ROLE:
+        role_len = payload[offset]
+        role = payload[offset + 1:offset + 1 + role_len].decode("utf-8")
+        offset += 1 + role_len
+    else:
+        role = _ROLE_NAMES.get(role_code, "unknown")
+
+    return {
+        "role": role,
+        "content": payload[offset:].decode("utf-8"),
+        "timestamp": timestamp,
+        "token_count": token_count,
+    }
+
 
-    key = _session_key(session_id)
+async def append_session_message(
+    session_id: str,
+    role: str,
+    content: str,
+    token_count: int = 0
+):
+    with StageTimer("chat", "redis_write") as timer:
+        redis_client = await get_async_redis_client(decode_responses=False)
+        if not redis_client:
+            timer.outcome = "unavailable"
+            return
 
-    try:
-        redis_client.rpush(key, f"{role}:{content}")
-        redis_client.ltrim(key, -MAX_CONTEXT_MESSAGES, -1)
-        redis_client.expire(key, SESSION_TTL_SECONDS)
-    except Exception as e:
-        logger.error(f"Redis write failed: {e}")
+        key = _session_key(session_id)
 
+        try:
+            # Append, trim and refresh the TTL in one MULTI/EXEC round trip
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.rpush(key, encode_message(role, content, time.time(), token_count))
+                pipe.ltrim(key, -MAX_CONTEXT_MESSAGES, -1)
+                pipe.expire(key, SESSION_TTL_SECONDS)
+                await pipe.execute()
+        except Exception as e:
+            timer.outcome = "error"
+            redis_breaker.record_failure(e)
+            logger.error(f"Redis write failed: {e}")
 
-def get_session_messages(session_id: str) -> List[Dict[str, str]]:
-    redis_client = get_redis_client()
-    if not redis_client:
-        return []
 
-    key = _session_key(session_id)
+async def get_session_messages(session_id: str) -> List[Dict]:
+    with StageTimer("chat", "redis_read") as timer:
+        redis_client = await get_async_redis_client(decode_responses=False)
+        if not redis_client:
+            timer.outcome = "unavailable"
+            return []
 
-    try:
-        messages = redis_client.lrange(key, 0, -1)
-    except Exception as e:
-        logger.error(f"Redis read failed: {e}")
-        return []
+        try:
+            messages = await redis_client.lrange(_session_key(session_id), 0, -1)
+        except Exception as e:
+            timer.outcome = "error"
+            redis_breaker.record_failure(e)
+            logger.error(f"Redis read failed: {e}")
+            return []
 
     decoded = []
     for msg in messages:
-        role, content = msg.split(":", 1)
-        decoded.append({"role": role, "content": content})
+        try:
+            decoded.append(decode_message(msg))
+        except (ValueError, struct.error, UnicodeDecodeError) as e:
+            logger.warning(f"Skipping undecodable session message: {e}")
 
     return decoded
@@ -1,10 +1,40 @@
-from typing import List, Dict  # Added Dict here
+import logging
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Dict, Optional, Set, Tuple  # Added Dict here
 from llama_index.core.schema import TextNode
+from llama_index.core.utils import get_tokenizer
+from backend.app.core.config import CONTEXT_DEDUP_THRESHOLD, CONTEXT_TOKEN_BUDGET
 from backend.app.core.prompts import RAG_CONTEXT_PROMPT
 
+logger = logging.getLogger(__name__)
+
 MAX_RECENT_MESSAGES = 4
 MAX_CHUNKS = 5
 
+# Longest chunk overlap searched for when merging neighbours (characters)
+MAX_OVERLAP_CHARS = 2000
+# A passage is only truncated to fit if at least this many tokens remain
+MIN_PASSAGE_TOKENS = 64
+
+
+@dataclass
+class Passage:
+    document_id: Optional[str]
+    first_chunk: Optional[int]
+    last_chunk: Optional[int]
+    text: str
+    rank: int
+    chunks: int = 1
+
+
+def count_tokens(text: str, tokenizer: Optional[Callable] = None) -> int:
+    """
+    Token count with the LlamaIndex global tokenizer. It is not the Groq
+    model's own tokenizer, but close enough for budgeting.
+    """
+    return len((tokenizer or get_tokenizer())(text))
+
 
 def format_message(msg: Dict[str, str]) -> str:
     """Helper to convert message dict to formatted string."""
@@ -27,29 +57,179 @@ def summarize_conversation(messages: List[Dict[str, str]]) -> str:
     return "Earlier discussion topics: " + " | ".join(older_messages[-3:])
 
 
+def merge_overlapping(first: str, second: str) -> str:
+    """
+    Join two adjacent chunks, dropping the text `second` repeats from the
+    end of `first` (the splitter's chunk overlap).
+    """
+    tail = first[-MAX_OVERLAP_CHARS:]
+    probe = second[:40]
+
+    start = tail.find(probe) if probe else -1
+    while start != -1:
+        overlap = len(tail) - start
+        if second[:overlap] == tail[start:]:
+            return first + second[overlap:]
+        start = tail.find(probe, start + 1)
+
+    return f"{first}\n{second}"
+
+
+def _shingles(text: str, size: int = 3) -> Set[Tuple[str, ...]]:
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < size:
+        return {tuple(words)}
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _similarity(a: Set, b: Set) -> float:
+    """
+    Overlap coefficient: a chunk contained in a longer passage counts as
+    a duplicate even though their Jaccard similarity is low.
+    """
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+def build_passages(
+    retrieved_nodes: List[TextNode],
+    dedup_threshold: float = CONTEXT_DEDUP_THRESHOLD
+) -> Tuple[List[Passage], int]:
+    """
+    Merge adjacent chunks of the same document into passages and drop
+    near-duplicates. Passages keep the rank of their best chunk.
+    Returns (passages in rank order, number of duplicates dropped).
+    """
+    chunks = []
+    for rank, item in enumerate(retrieved_nodes):
+        node = getattr(item, "node", item)  # NodeWithScore or bare node
+        metadata = node.metadata or {}
+        chunks.append(Passage(
+            document_id=metadata.get("document_id"),
+            first_chunk=metadata.get("chunk_index"),
+            last_chunk=metadata.get("chunk_index"),
+            text=node.get_content(),
+            rank=rank,
+        ))
+
+    # Walk each document's chunks in reading order, merging neighbours
+    ordered = sorted(
+        chunks,
+        key=lambda c: (
+            c.document_id is None,
+            c.document_id or "",
+            c.first_chunk if c.first_chunk is not None else -1,
+            c.rank,
+        ),
+    )
+
+    passages: List[Passage] = []
+    for chunk in ordered:
+        previous = passages[-1] if passages else None
+        if (
+            previous is not None
+            and chunk.document_id is not None
+            and chunk.document_id == previous.document_id
+            and chunk.first_chunk is not None
+            and previous.last_chunk is not None
+            and chunk.first_chunk - previous.last_chunk <= 1
+        ):
+            if chunk.first_chunk != previous.last_chunk:
+                previous.text = merge_overlapping(previous.text, chunk.text)
+                previous.chunks += 1
+            previous.last_chunk = chunk.first_chunk
+            previous.rank = min(previous.rank, chunk.rank)
+            continue
+        passages.append(chunk)
+
+    passages.sort(key=lambda p: p.rank)
+
+    kept: List[Passage] = []
+    kept_shingles: List[Set] = []
+    duplicates = 0
+    for passage in passages:
+        shingles = _shingles(passage.text)
+        if any(_similarity(shingles, seen) >= dedup_threshold for seen in kept_shingles):
+            duplicates += 1
+            continue
+        kept.append(passage)
+        kept_shingles.append(shingles)
+
+    return kept, duplicates
+
+
+def _truncate_to_tokens(text: str, max_tokens: int, tokenizer: Callable) -> str:
+    tokens = count_tokens(text, tokenizer)
+    while tokens > max_tokens and text:
+        # Shrink proportionally, then back off to a word boundary
+        cut = max(int(len(text) * max_tokens / tokens * 0.95), 0)
+        text = text[:cut].rsplit(" ", 1)[0] if " " in text[:cut] else text[:cut]
+        tokens = count_tokens(text, tokenizer)
+    return text
+
+
 def assemble_context(
     user_query: str,
     retrieved_nodes: List[TextNode],
-    conversation_messages: List[Dict[str, str]]  # Updated to List[Dict]
+    conversation_messages: List[Dict[str, str]],  # Updated to List[Dict]
+    token_budget: int = CONTEXT_TOKEN_BUDGET
 ) -> str:
     """
-    Assemble the final RAG context prompt.
+    Assemble the final RAG context prompt within token_budget.
+
+    Evidence has priority over history: passages are packed in rank order
+    first, then recent messages newest-first, then the older-conversation
+    summary, each only while it fits.
     """
+    tokenizer = get_tokenizer()
+
+    def render(summary: str, recent: str, context: str) -> str:
+        return RAG_CONTEXT_PROMPT.format(
+            conversation_summary=summary,
+            recent_messages=recent or "No recent messages.",
+            retrieved_context=context or "No relevant documents found.",
+            user_query=user_query
+        )
+
+    remaining = token_budget - count_tokens(render("", "", ""), tokenizer)
+
+    # Evidence
+    passages, duplicates = build_passages(retrieved_nodes[:MAX_CHUNKS])
+    sections = []
+    for passage in passages:
+        section = f"[Source {len(sections) + 1}]\n{passage.text}"
+        tokens = count_tokens(section, tokenizer) + 2  # "\n\n" separator
+        if tokens > remaining:
+            if remaining < MIN_PASSAGE_TOKENS:
+                break
+            section = _truncate_to_tokens(section, remaining - 2, tokenizer)
+            tokens = count_tokens(section, tokenizer) + 2
+        sections.append(section)
+        remaining -= tokens
+    retrieved_context = "\n\n".join(sections)
+
+    # Recent history, newest first
+    recent: List[str] = []
+    for message in reversed(conversation_messages[-MAX_RECENT_MESSAGES:]):
+        line = format_message(message)
+        tokens = count_tokens(line, tokenizer) + 1
+        if tokens > remaining:
+            break
+        recent.insert(0, line)
+        remaining -= tokens
+    recent_messages = "\n".join(recent)
+
     conversation_summary = summarize_conversation(conversation_messages)
+    if count_tokens(conversation_summary, tokenizer) > remaining:
+        conversation_summary = "Earlier conversation omitted."
 
-    # Convert message dicts to strings before joining to avoid TypeError
-    recent_messages = "\n".join(
-        format_message(m) for m in conversation_messages[-MAX_RECENT_MESSAGES:]
-    )
+    prompt = render(conversation_summary, recent_messages, retrieved_context)
 
-    retrieved_context = "\n\n".join(
-        f"[Source {i+1}]\n{node.text}"
-        for i, node in enumerate(retrieved_nodes[:MAX_CHUNKS])
+    logger.info(
+        f"Prompt assembled | tokens={count_tokens(prompt, tokenizer)} | budget={token_budget} | "
+        f"chunks={min(len(retrieved_nodes), MAX_CHUNKS)} | passages={len(sections)} | "
+        f"duplicates={duplicates} | messages={len(recent)}/{len(conversation_messages)}"
     )
 
-    return RAG_CONTEXT_PROMPT.format(
-        conversation_summary=conversation_summary,
-        recent_messages=recent_messages or "No recent messages.",
-        retrieved_context=retrieved_context or "No relevant documents found.",
-        user_query=user_query
-    )
+    return prompt
@@ -0,0 +1,223 @@
+import sqlite3
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from backend.app.core.config import DOCUMENT_REGISTRY_PATH, HASH_REGISTRY_FILE
+from backend.app.core.logging import setup_logger
+from backend.app.core.sqlite import connect
+
+logger = setup_logger()
+
+# One row per uploaded file (document version); file_hash stays unique so
+# byte-identical re-uploads are still rejected as duplicates.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    file_hash   TEXT PRIMARY KEY,
+    document_id TEXT,
+    version     INTEGER NOT NULL DEFAULT 1,
+    session_id  TEXT,
+    filename    TEXT,
+    size_bytes  INTEGER,
+    created_at  REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_documents_version
+    ON documents (document_id, version);
+CREATE INDEX IF NOT EXISTS idx_documents_session
+    ON documents (session_id);
+CREATE TABLE IF NOT EXISTS document_chunks (
+    document_id TEXT NOT NULL,
+    node_id     TEXT NOT NULL,
+    chunk_hash  TEXT NOT NULL,
+    version     INTEGER NOT NULL,
+    chunk_index INTEGER,
+    page_number INTEGER,
+    PRIMARY KEY (document_id, node_id)
+);
+CREATE INDEX IF NOT EXISTS idx_document_chunks_node
+    ON document_chunks (node_id);
+CREATE TABLE IF NOT EXISTS registry_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_conn: Optional[sqlite3.Connection] = None
+
+
+def _migrate_hash_registry_file(conn: sqlite3.Connection) -> None:
+    """
+    One-time import of data/hash_registry.txt. Legacy entries only
+    carry the hash, so the other columns stay NULL.
+    """
+    migrated = conn.execute(
+        "SELECT 1 FROM registry_meta WHERE key = 'hash_registry_migrated'"
+    ).fetchone()
+    if migrated:
+        return
+
+    hashes = []
+    if HASH_REGISTRY_FILE.exists():
+        hashes = [
+            line.strip()
+            for line in HASH_REGISTRY_FILE.read_text().splitlines()
+            if line.strip()
+        ]
+
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany(
+            "INSERT OR IGNORE INTO documents (file_hash, created_at) VALUES (?, ?)",
+            [(file_hash, now) for file_hash in hashes],
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO registry_meta (key, value) "
+            "VALUES ('hash_registry_migrated', ?)",
+            (str(now),),
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    logger.info(f"Hash registry migrated | entries={len(hashes)}")
+
+
+def _get_conn() -> sqlite3.Connection:
+    global _conn
+
+    if _conn is None:
+        conn = connect(DOCUMENT_REGISTRY_PATH)
+        conn.row_factory = sqlite3.Row
+        conn.executescript(_SCHEMA)
+        _migrate_hash_registry_file(conn)
+        _conn = conn
+
+    return _conn
+
+
+def register_document(
+    file_hash: str,
+    document_id: str,
+    session_id: str,
+    filename: str,
+    size_bytes: int
+) -> Optional[int]:
+    """
+    Atomically check-and-register an uploaded file by content hash.
+
+    Uploading under an existing document_id registers the next version.
+    Returns the assigned version, or None if the hash is already
+    registered (duplicate).
+    """
+    cursor = _get_conn().execute(
+        "INSERT OR IGNORE INTO documents "
+        "(file_hash, document_id, version, session_id, filename, size_bytes, created_at) "
+        "VALUES (?, ?, "
+        "  (SELECT COALESCE(MAX(version), 0) + 1 FROM documents WHERE document_id = ?), "
+        "  ?, ?, ?, ?)",
+        (file_hash, document_id, document_id, session_id, filename, size_bytes, time.time()),
+    )
+    if cursor.rowcount != 1:
+        return None
+
+    return get_document_by_hash(file_hash)["version"]
+
+
+def unregister_document(file_hash: str) -> None:
+    """
+    Release a hash, e.g. when the upload could not be queued.
+    """
+    _get_conn().execute("DELETE FROM documents WHERE file_hash = ?", (file_hash,))
+
+
+def get_document_by_hash(file_hash: str) -> Optional[Dict]:
+    row = _get_conn().execute(
+        "SELECT * FROM documents WHERE file_hash = ?", (file_hash,)
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def get_latest_version(document_id: str) -> Optional[Dict]:
+    row = _get_conn().execute(
+        "SELECT * FROM documents WHERE document_id = ? "
+        "ORDER BY version DESC LIMIT 1",
+        (document_id,),
+    ).fetchone()
+    return dict(row) if row else None
+
+
+# ---------------------------------------------------------------------------
+# Chunk manifest: which content-addressed chunks are indexed per document
+# ---------------------------------------------------------------------------
+
+def get_chunk_manifest(document_id: str) -> Dict[str, str]:
+    """
+    {node_id: chunk_hash} for the chunks currently indexed for a document.
+    """
+    rows = _get_conn().execute(
+        "SELECT node_id, chunk_hash FROM document_chunks WHERE document_id = ?",
+        (document_id,),
+    ).fetchall()
+    return {row["node_id"]: row["chunk_hash"] for row in rows}
+
+
+def replace_chunk_manifest(
+    document_id: str,
+    version: int,
+    chunks: Dict[str, str],
+    positions: Optional[Dict[str, Tuple[int, Optional[int]]]] = None
+) -> None:
+    """
+    Replace a document's manifest with {node_id: chunk_hash}, recording
+    each chunk's (chunk_index, page_number) in this version.
+    """
+    positions = positions or {}
+
+    conn = _get_conn()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM document_chunks WHERE document_id = ?", (document_id,))
+        conn.executemany(
+            "INSERT INTO document_chunks "
+            "(document_id, node_id, chunk_hash, version, chunk_index, page_number) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (document_id, node_id, chunk_hash, version, *positions.get(node_id, (None, None)))
+                for node_id, chunk_hash in chunks.items()
+            ],
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def get_chunk_positions(node_ids: Iterable[str]) -> Dict[str, Dict]:
+    """
+    Current chunk_index, page_number and filename per node id.
+
+    A chunk reused across revisions keeps the metadata it was first
+    stored with in the vector store; these are its values in the latest
+    version. Node ids not in any manifest are left out.
+    """
+    node_ids = list(node_ids)
+    positions: Dict[str, Dict] = {}
+
+    for start in range(0, len(node_ids), 500):
+        batch = node_ids[start:start + 500]
+        rows = _get_conn().execute(
+            f"SELECT c.node_id, c.chunk_index, c.page_number, d.filename "
+            f"FROM document_chunks c "
+            f"LEFT JOIN documents d ON d.document_id = c.document_id AND d.version = c.version "
+            f"WHERE c.node_id IN ({','.join('?' * len(batch))}) AND c.chunk_index IS NOT NULL",
+            batch,
+        ).fetchall()
+
+        for row in rows:
+            fields = {"chunk_index": row["chunk_index"], "page_number": row["page_number"]}
+            if row["filename"] is not None:
+                fields["filename"] = row["filename"]
+            positions[row["node_id"]] = fields
+
+    return positions
@@ -0,0 +1,197 @@
+import hashlib
+import re
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from backend.app.core.config import (
+    EMBED_CACHE_ENABLED,
+    EMBED_CACHE_MAX_ENTRIES,
+    EMBED_CACHE_PATH,
+)
+from backend.app.core.sqlite import connect
+
+# Evict a little below the bound so we don't run DELETE on every insert
+EVICTION_HEADROOM = 0.05
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model_name  TEXT NOT NULL,
+    text_hash   TEXT NOT NULL,
+    vector      BLOB NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (model_name, text_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_embeddings_last_access
+    ON embeddings (last_access);
+"""
+
+
+def normalize_chunk_text(text: str) -> str:
+    """
+    Normalize whitespace only; casing and punctuation change embeddings.
+    """
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def chunk_text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_chunk_text(text).encode("utf-8")).hexdigest()
+
+
+def _encode_vector(vector: List[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _decode_vector(blob: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+class EmbeddingCache:
+    """
+    On-disk embedding cache keyed by (model name, normalized chunk text hash).
+
+    Entries are evicted least-recently-used once the table exceeds
+    max_entries. Hit/miss counters are per process.
+
+    Row count is tracked as an upper bound (replaced rows are counted
+    as new), so COUNT(*) only runs when that bound crosses max_entries.
+    """
+
+    def __init__(self, path: Path, max_entries: int = EMBED_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.executescript(_SCHEMA)
+        self._entries = self._count()
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, model_name: str, texts: List[str]) -> Dict[int, List[float]]:
+        """
+        Look up cached vectors. Returns {input index: vector} for hits.
+        """
+        if not texts:
+            return {}
+
+        hashes = [chunk_text_hash(text) for text in texts]
+        unique_hashes = list(set(hashes))
+        found: Dict[str, bytes] = {}
+
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(unique_hashes), 500):
+                batch = unique_hashes[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model_name = ? AND text_hash IN ({placeholders})",
+                    [model_name, *batch],
+                ).fetchall()
+                found.update(rows)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_access = ? "
+                    "WHERE model_name = ? AND text_hash = ?",
+                    [(now, model_name, h) for h in found],
+                )
+
+            results = {
+                idx: _decode_vector(found[h])
+                for idx, h in enumerate(hashes)
+                if h in found
+            }
+            self.hits += len(results)
+            self.misses += len(texts) - len(results)
+
+        return results
+
+    def put_many(
+        self,
+        model_name: str,
+        texts: List[str],
+        vectors: List[List[float]]
+    ) -> None:
+        if not texts:
+            return
+
+        now = time.time()
+        rows = [
+            (model_name, chunk_text_hash(text), _encode_vector(vector), now)
+            for text, vector in zip(texts, vectors)
+        ]
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings "
+                "(model_name, text_hash, vector, last_access) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._entries += len(rows)
+            if self._entries > self.max_entries:
+                self._evict()
+
+    def _evict(self) -> None:
+        count = self._count()
+        if count <= self.max_entries:
+            self._entries = count
+            return
+
+        target = int(self.max_entries * (1 - EVICTION_HEADROOM))
+        excess = count - target
+
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE rowid IN ("
+            "SELECT rowid FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+            (excess,),
+        )
+        self.evictions += excess
+        self._entries = target
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = self._count()
+
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """
+    Lazily open the process-wide embedding cache.
+    Returns None when caching is disabled.
+    """
+    global _embedding_cache
+
+    if not EMBED_CACHE_ENABLED:
+        return None
+
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache(EMBED_CACHE_PATH)
+
+    return _embedding_cache
@@ -1,12 +1,135 @@
-from typing import List
+from typing import List, Optional
 
+from llama_index.core.embeddings import BaseEmbedding
 from llama_index.core.schema import TextNode
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+from backend.app.core.config import (
+    EMBED_BATCH_SIZE,
+    EMBED_MAX_BATCH_TOKENS,
+    EMBED_MODEL_NAME,
+)
+from backend.app.services.embedding_cache import get_embedding_cache
+from backend.app.services.model_registry import get_embed_model
+
+
+def _token_lengths(texts: List[str], embed_model: BaseEmbedding) -> List[int]:
+    """
+    Token length per text, using the model's own tokenizer when available.
+    Falls back to a whitespace count (only used for ordering/bucketing).
+    """
+    tokenizer = getattr(getattr(embed_model, "_model", None), "tokenizer", None)
+
+    if tokenizer is not None:
+        encoded = tokenizer(texts, add_special_tokens=False)["input_ids"]
+        return [len(ids) for ids in encoded]
+
+    return [len(text.split()) for text in texts]
+
+
+def build_length_buckets(
+    lengths: List[int],
+    batch_size: int = EMBED_BATCH_SIZE,
+    max_batch_tokens: int = EMBED_MAX_BATCH_TOKENS
+) -> List[List[int]]:
+    """
+    Group item indices into batches of similar token length.
+
+    Indices are sorted by length so each batch pads to roughly the same size.
+    A batch closes when it reaches batch_size items or, if max_batch_tokens
+    is set, when its padded size (longest item * item count) would exceed it.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+
+    batches = []
+    current: List[int] = []
+
+    for idx in order:
+        padded_tokens = max(lengths[idx], 1) * (len(current) + 1)
+
+        if current and (
+            len(current) >= batch_size
+            or (max_batch_tokens and padded_tokens > max_batch_tokens)
+        ):
+            batches.append(current)
+            current = []
+
+        current.append(idx)
+
+    if current:
+        batches.append(current)
+
+    return batches
+
+
+def embed_texts_batched(
+    texts: List[str],
+    embed_model: BaseEmbedding,
+    batch_size: int = EMBED_BATCH_SIZE,
+    max_batch_tokens: int = EMBED_MAX_BATCH_TOKENS
+) -> List[List[float]]:
+    """
+    Embed texts in length-bucketed batches.
+
+    Returns vectors in the same order as the input texts.
+    """
+    if not texts:
+        return []
+
+    lengths = _token_lengths(texts, embed_model)
+    vectors: List[Optional[List[float]]] = [None] * len(texts)
+
+    for batch in build_length_buckets(lengths, batch_size, max_batch_tokens):
+        batch_vectors = embed_model.get_text_embedding_batch(
+            [texts[i] for i in batch]
+        )
+        for idx, vector in zip(batch, batch_vectors):
+            vectors[idx] = vector
+
+    return vectors
+
+
+def embed_nodes(
+    nodes: List[TextNode],
+    model_name: str = EMBED_MODEL_NAME,
+    batch_size: int = EMBED_BATCH_SIZE,
+    max_batch_tokens: int = EMBED_MAX_BATCH_TOKENS
+) -> List[TextNode]:
+    """
+    Populate node.embedding for every node using batched inference.
+    Chunks already in the embedding cache skip the model entirely.
+    """
+    texts = [node.text for node in nodes]
+
+    cache = get_embedding_cache()
+    cached = cache.get_many(model_name, texts) if cache else {}
+
+    missing = [i for i in range(len(texts)) if i not in cached]
+
+    if missing:
+        embed_model = get_embed_model(model_name)
+        missing_texts = [texts[i] for i in missing]
+
+        fresh = embed_texts_batched(
+            missing_texts,
+            embed_model,
+            batch_size=batch_size,
+            max_batch_tokens=max_batch_tokens,
+        )
+
+        if cache:
+            cache.put_many(model_name, missing_texts, fresh)
+
+        cached.update(zip(missing, fresh))
+
+    for idx, node in enumerate(nodes):
+        node.embedding = cached[idx]
+
+    return nodes
 
 
 def generate_embeddings(
     nodes: List[TextNode],
-    model_name: str = "nomic-ai/nomic-embed-text-v1.5"
+    model_name: str = EMBED_MODEL_NAME
 ):
     """
     Generate embeddings for chunked TextNodes.
@@ -15,12 +138,4 @@ def generate_embeddings(
     - nodes with embeddings populated
     """
 
-    embed_model = HuggingFaceEmbedding(
-        model_name=model_name,
-        trust_remote_code=True
-    )
-
-    for node in nodes:
-        node.embedding = embed_model.get_text_embedding(node.text)
-
-    return nodes
+    return embed_nodes(nodes, model_name=model_name)
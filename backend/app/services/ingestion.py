@@ -1,39 +1,44 @@
+import threading
 import time
+from collections import Counter
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
 
-from llama_index.core import Document
-from llama_index.core.node_parser import SentenceSplitter
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+from llama_index.core.schema import TextNode
 
 from backend.app.core.config import PARSED_DIR
 from backend.app.core.logging import setup_logger
-from backend.app.services.vector_store import get_vector_store, store_embeddings
-
-from pypdf import PdfReader
-from docx import Document as DocxDocument
-from pptx import Presentation
+from backend.app.core.metrics import INGEST_CHUNKS, INGEST_DOCUMENTS, observe_stage
+from backend.app.pipelines.streaming_ingestion import StageCancelled, run_streaming_ingestion
+from backend.app.services.document_registry import (
+    get_chunk_manifest,
+    get_latest_version,
+    replace_chunk_manifest,
+)
+from backend.app.services.embedding_cache import chunk_text_hash
+from backend.app.services.embeddings import embed_nodes
+from backend.app.services.job_queue import JOB_EMBEDDING, JOB_PARSING
+from backend.app.services.lexical_index import get_lexical_index
+from backend.app.services.parsing import iter_pages, parse_document
+from backend.app.services.vector_store import (
+    delete_legacy_document_vectors,
+    delete_vectors,
+    store_embeddings,
+)
 
 logger = setup_logger()
 
 
 def parse_file(file_path: Path) -> str:
-    ext = file_path.suffix.lower()
-
-    if ext == ".pdf":
-        reader = PdfReader(str(file_path))
-        return "\n".join(page.extract_text() or "" for page in reader.pages)
+    return parse_document(file_path).text
 
-    if ext == ".docx":
-        doc = DocxDocument(str(file_path))
-        return "\n".join(p.text for p in doc.paragraphs)
-
-    if ext == ".pptx":
-        prs = Presentation(str(file_path))
-        return "\n".join(
-            shape.text for slide in prs.slides for shape in slide.shapes if hasattr(shape, "text")
-        )
 
-    raise ValueError("Unsupported file format")
+def chunk_node_id(document_id: str, chunk_hash: str, occurrence: int) -> str:
+    """
+    Content-addressed node id: an unchanged chunk keeps its id across
+    revisions, so it can be skipped instead of re-embedded and re-inserted.
+    """
+    return f"{document_id}:{chunk_hash[:32]}:{occurrence}"
 
 
 def ingest_document(
@@ -41,41 +46,139 @@ def ingest_document(
     original_filename: str,
     document_id: str,
     session_id: str,  # 🔥 NEW
-) -> None:
-    logger.info(f"Parsing started | document_id={document_id}")
+    on_stage: Optional[Callable[[str], None]] = None,
+    version: Optional[int] = None,
+    stop: Optional[threading.Event] = None,
+) -> Dict:
+    """
+    Parse → chunk → embed → store a single document.
+    on_stage is called with the job status as each stage starts.
+    version is the one registered for this upload (jobs queued before
+    versions were recorded fall back to the latest registered version).
+    Setting stop aborts the run with StageCancelled.
+
+    For a revision, only chunks that are not already indexed are embedded
+    and inserted, and chunks that disappeared are deleted afterwards.
+    Returns per-run chunk counts.
+    """
+    report_stage = on_stage or (lambda stage: None)
+
+    if version is None:
+        latest = get_latest_version(document_id)
+        version = latest["version"] if latest else 1
+    existing = get_chunk_manifest(document_id)
+
+    lexical_index = get_lexical_index()
+
+    seen: Dict[str, str] = {}
+    positions: Dict[str, Tuple[int, Optional[int]]] = {}
+    occurrences: Counter = Counter()
+    inserted: List[str] = []
+
+    def embed_changed(batch: List[TextNode]) -> List[TextNode]:
+        fresh = []
+        for node in batch:
+            chunk_hash = chunk_text_hash(node.text)
+            node.id_ = chunk_node_id(document_id, chunk_hash, occurrences[chunk_hash])
+            occurrences[chunk_hash] += 1
+            seen[node.id_] = chunk_hash
+            positions[node.id_] = (node.metadata.get("chunk_index"), node.metadata.get("page_number"))
+
+            if node.id_ not in existing:
+                fresh.append(node)
+
+        # Keyword index gets every chunk: cheap, and refreshes reused metadata.
+        # Reused vectors keep their old metadata; the manifest records the
+        # current positions, which retrieval overlays.
+        lexical_index.add_nodes(batch)
+
+        return embed_nodes(fresh) if fresh else []
+
+    def insert_changed(batch: List[TextNode]) -> None:
+        if not batch:
+            return
+        store_embeddings(batch)
+        inserted.extend(node.id_ for node in batch)
+
+    logger.info(f"Parsing started | document_id={document_id} | version={version}")
+    report_stage(JOB_PARSING)
 
     start_time = time.time()
-    parsed_text = parse_file(file_path)
-
-    # Persist parsed text
-    parsed_output_path = PARSED_DIR / f"{document_id}.txt"
-    parsed_output_path.write_text(parsed_text, encoding="utf-8")
-
-    # 1️⃣ Create Document
-    document = Document(
-        text=parsed_text,
-        metadata={
-            "document_id": document_id,
-            "session_id": session_id,   # 🔥 CRITICAL
-            "filename": original_filename,
-        },
-    )
-
-    # 2️⃣ Chunk
-    splitter = SentenceSplitter(chunk_size=512, chunk_overlap=50)
-    nodes = splitter.get_nodes_from_documents([document])
 
-    # 3️⃣ Embed
-    embed_model = HuggingFaceEmbedding(
-        model_name="nomic-ai/nomic-embed-text-v1.5",
-        trust_remote_code=True,
+    # parse → clean → chunk → embed → insert, streamed in bounded batches
+    try:
+        stats = run_streaming_ingestion(
+            pages=iter_pages(file_path),
+            document_id=document_id,
+            metadata={
+                "document_id": document_id,
+                "session_id": session_id,   # 🔥 CRITICAL
+                "filename": original_filename,
+            },
+            embed_fn=embed_changed,
+            insert_fn=insert_changed,
+            parsed_output_path=PARSED_DIR / f"{document_id}.txt",
+            on_embedding_start=lambda: report_stage(JOB_EMBEDDING),
+            stop=stop,
+        )
+    except Exception as e:
+        observe_stage("ingest", "total", time.time() - start_time, "error")
+        INGEST_DOCUMENTS.labels(outcome="error").inc()
+
+        if isinstance(e, StageCancelled):
+            # The caller gave the job up: whoever owns it now may be
+            # inserting the same content-addressed node ids, so keep them
+            raise
+
+        # Only this run's inserts: the previous version stays searchable
+        try:
+            delete_vectors(inserted)
+            lexical_index.delete_nodes(session_id, [node_id for node_id in seen if node_id not in existing])
+        except Exception as cleanup_error:
+            logger.error(f"Partial ingestion cleanup failed | document_id={document_id} | {cleanup_error}")
+        raise
+
+    stale = {node_id: h for node_id, h in existing.items() if node_id not in seen}
+
+    # Record new + stale first so a failed delete is retried, not leaked
+    replace_chunk_manifest(document_id, version, {**stale, **seen}, positions)
+    delete_vectors(list(stale))
+    lexical_index.delete_nodes(session_id, stale)
+    if version > 1:
+        delete_legacy_document_vectors(document_id)
+    replace_chunk_manifest(document_id, version, seen, positions)
+
+    elapsed = time.time() - start_time
+    duration = round(elapsed * 1000, 2)
+    result = {
+        "version": version,
+        "pages": stats.pages,
+        "chunks_total": len(seen),
+        "chunks_reused": len(seen) - len(inserted),
+        "chunks_embedded": len(inserted),
+        "chunks_deleted": len(stale),
+    }
+
+    for stage, seconds in (
+        ("parse", stats.parse_seconds),
+        ("chunk", stats.chunk_seconds),
+        ("embed", stats.embed_seconds),
+        ("insert", stats.insert_seconds),
+        ("total", elapsed),
+    ):
+        observe_stage("ingest", stage, seconds)
+    INGEST_CHUNKS.labels(stage="chunk").observe(len(seen))
+    INGEST_CHUNKS.labels(stage="embed").observe(len(inserted))
+    INGEST_CHUNKS.labels(stage="reuse").observe(result["chunks_reused"])
+    INGEST_CHUNKS.labels(stage="delete").observe(len(stale))
+    INGEST_DOCUMENTS.labels(outcome="ok").inc()
+
+    logger.info(
+        f"Ingestion completed | document_id={document_id} | version={version} | "
+        f"pages={stats.pages} | chunks={len(seen)} | reused={result['chunks_reused']} | "
+        f"embedded={len(inserted)} | deleted={len(stale)} | batches={stats.batches} | {duration}ms | "
+        f"parse={stats.parse_seconds:.2f}s | chunk={stats.chunk_seconds:.2f}s | "
+        f"embed={stats.embed_seconds:.2f}s | insert={stats.insert_seconds:.2f}s"
     )
-    for node in nodes:
-        node.embedding = embed_model.get_text_embedding(node.text)
-
-    # 4️⃣ Store in Milvus
-    vector_store = get_vector_store()
-    store_embeddings(nodes, vector_store)
 
-    duration = round((time.time() - start_time) * 1000, 2)
-    logger.info(f"Ingestion completed | document_id={document_id} | {duration}ms")
+    return result
@@ -0,0 +1,246 @@
+import json
+import random
+import sqlite3
+import time
+from typing import Dict, Optional
+
+from backend.app.core.config import (
+    INGESTION_MAX_ATTEMPTS,
+    INGESTION_QUEUE_PATH,
+    INGESTION_RETRY_BASE_SECONDS,
+)
+from backend.app.core.sqlite import connect
+
+# Job lifecycle: queued -> parsing -> embedding -> stored
+#                         \-> (error) -> queued (retry) ... -> failed
+JOB_QUEUED = "queued"
+JOB_PARSING = "parsing"
+JOB_EMBEDDING = "embedding"
+JOB_STORED = "stored"
+JOB_FAILED = "failed"
+
+ACTIVE_STATUSES = (JOB_PARSING, JOB_EMBEDDING)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingestion_jobs (
+    document_id     TEXT PRIMARY KEY,
+    session_id      TEXT NOT NULL,
+    file_path       TEXT NOT NULL,
+    filename        TEXT NOT NULL,
+    version         INTEGER,
+    status          TEXT NOT NULL,
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    max_attempts    INTEGER NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    error           TEXT,
+    result          TEXT,
+    worker_id       TEXT,
+    heartbeat_at    REAL,
+    created_at      REAL NOT NULL,
+    updated_at      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_pending
+    ON ingestion_jobs (status, next_attempt_at);
+"""
+
+_conn: Optional[sqlite3.Connection] = None
+
+
+def _get_conn() -> sqlite3.Connection:
+    global _conn
+
+    if _conn is None:
+        conn = connect(INGESTION_QUEUE_PATH)
+        conn.row_factory = sqlite3.Row
+        conn.executescript(_SCHEMA)
+        _conn = conn
+
+    return _conn
+
+
+def retry_delay_seconds(attempts: int) -> float:
+    """
+    Exponential backoff with full jitter.
+    """
+    return random.uniform(0, INGESTION_RETRY_BASE_SECONDS * (2 ** (attempts - 1)))
+
+
+def enqueue_ingestion_job(
+    document_id: str,
+    session_id: str,
+    file_path: str,
+    filename: str,
+    version: Optional[int] = None,
+    max_attempts: int = INGESTION_MAX_ATTEMPTS
+) -> bool:
+    """
+    Queue a document version for ingestion. A revised document reuses
+    its job row once the previous job has finished; returns False if
+    that job is still queued or running.
+    """
+    now = time.time()
+    cursor = _get_conn().execute(
+        "INSERT INTO ingestion_jobs "
+        "(document_id, session_id, file_path, filename, version, status, max_attempts, "
+        " next_attempt_at, created_at, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (document_id) DO UPDATE SET "
+        "  file_path = excluded.file_path, filename = excluded.filename, "
+        "  version = excluded.version, status = excluded.status, attempts = 0, "
+        "  max_attempts = excluded.max_attempts, "
+        "  next_attempt_at = excluded.next_attempt_at, error = NULL, result = NULL, "
+        "  worker_id = NULL, updated_at = excluded.updated_at "
+        "WHERE ingestion_jobs.status IN (?, ?)",
+        (document_id, session_id, file_path, filename, version, JOB_QUEUED,
+         max_attempts, now, now, now, JOB_STORED, JOB_FAILED),
+    )
+    return cursor.rowcount == 1
+
+
+def claim_next_job(worker_id: str) -> Optional[Dict]:
+    """
+    Atomically move the oldest due job from queued to parsing.
+    """
+    conn = _get_conn()
+    now = time.time()
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(
+            "SELECT * FROM ingestion_jobs "
+            "WHERE status = ? AND next_attempt_at <= ? "
+            "ORDER BY next_attempt_at LIMIT 1",
+            (JOB_QUEUED, now),
+        ).fetchone()
+
+        if row is None:
+            conn.execute("COMMIT")
+            return None
+
+        conn.execute(
+            "UPDATE ingestion_jobs "
+            "SET status = ?, attempts = attempts + 1, worker_id = ?, "
+            "    heartbeat_at = ?, updated_at = ? "
+            "WHERE document_id = ?",
+            (JOB_PARSING, worker_id, now, now, row["document_id"]),
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    job = dict(row)
+    job["status"] = JOB_PARSING
+    job["attempts"] += 1
+    return job
+
+
+def update_job_status(document_id: str, worker_id: str, status: str) -> bool:
+    """
+    Returns False if the job is no longer held by this worker.
+    """
+    cursor = _get_conn().execute(
+        "UPDATE ingestion_jobs SET status = ?, error = NULL, updated_at = ? "
+        "WHERE document_id = ? AND worker_id = ?",
+        (status, time.time(), document_id, worker_id),
+    )
+    return cursor.rowcount == 1
+
+
+def heartbeat_job(document_id: str, worker_id: str) -> bool:
+    """
+    Extend the lease of a running job. Returns False if the job is no
+    longer held by this worker (it was requeued after an expired lease).
+    """
+    cursor = _get_conn().execute(
+        f"UPDATE ingestion_jobs SET heartbeat_at = ? "
+        f"WHERE document_id = ? AND worker_id = ? "
+        f"AND status IN ({','.join('?' * len(ACTIVE_STATUSES))})",
+        (time.time(), document_id, worker_id, *ACTIVE_STATUSES),
+    )
+    return cursor.rowcount == 1
+
+
+def complete_job(document_id: str, worker_id: str, result: Optional[Dict] = None) -> bool:
+    """
+    Returns False if the job is no longer held by this worker; its
+    current owner's outcome is left alone.
+    """
+    cursor = _get_conn().execute(
+        "UPDATE ingestion_jobs "
+        "SET status = ?, error = NULL, result = ?, worker_id = NULL, updated_at = ? "
+        "WHERE document_id = ? AND worker_id = ?",
+        (JOB_STORED, json.dumps(result) if result is not None else None,
+         time.time(), document_id, worker_id),
+    )
+    return cursor.rowcount == 1
+
+
+def fail_job(document_id: str, worker_id: str, error: str) -> Optional[str]:
+    """
+    Record a failed attempt. Requeues with backoff while attempts remain.
+    Returns the resulting status, or None if the job is no longer held
+    by this worker.
+    """
+    conn = _get_conn()
+    row = conn.execute(
+        "SELECT attempts, max_attempts FROM ingestion_jobs "
+        "WHERE document_id = ? AND worker_id = ?",
+        (document_id, worker_id),
+    ).fetchone()
+
+    if row is None:
+        return None
+
+    now = time.time()
+
+    if row["attempts"] < row["max_attempts"]:
+        status = JOB_QUEUED
+        next_attempt_at = now + retry_delay_seconds(row["attempts"])
+    else:
+        status = JOB_FAILED
+        next_attempt_at = now
+
+    cursor = conn.execute(
+        "UPDATE ingestion_jobs "
+        "SET status = ?, error = ?, next_attempt_at = ?, worker_id = NULL, updated_at = ? "
+        "WHERE document_id = ? AND worker_id = ?",
+        (status, error[:2000], next_attempt_at, now, document_id, worker_id),
+    )
+
+    return status if cursor.rowcount == 1 else None
+
+
+def requeue_stale_jobs(timeout_seconds: int) -> int:
+    """
+    Return active jobs whose lease expired (no heartbeat for
+    timeout_seconds: the worker crashed or hung) to the queue, or fail
+    them if they are out of attempts. Returns the number of jobs touched.
+    """
+    now = time.time()
+    cursor = _get_conn().execute(
+        f"UPDATE ingestion_jobs "
+        f"SET status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END, "
+        f"    error = 'Worker timed out', worker_id = NULL, "
+        f"    next_attempt_at = ?, updated_at = ? "
+        f"WHERE status IN ({','.join('?' * len(ACTIVE_STATUSES))}) "
+        f"AND COALESCE(heartbeat_at, updated_at) < ?",
+        (JOB_FAILED, JOB_QUEUED, now, now, *ACTIVE_STATUSES, now - timeout_seconds),
+    )
+    return cursor.rowcount
+
+
+def get_job(document_id: str) -> Optional[Dict]:
+    row = _get_conn().execute(
+        "SELECT document_id, session_id, filename, status, attempts, "
+        "max_attempts, error, result, created_at, updated_at "
+        "FROM ingestion_jobs WHERE document_id = ?",
+        (document_id,),
+    ).fetchone()
+
+    if row is None:
+        return None
+
+    job = dict(row)
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
@@ -0,0 +1,254 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from llama_index.core.schema import TextNode
+
+from backend.app.core.config import (
+    HYBRID_LEXICAL_BUDGET_MS,
+    LEXICAL_INDEX_DIR,
+)
+from backend.app.core.sqlite import connect
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAX_QUERY_TERMS = 32
+# Open session databases kept per thread
+MAX_OPEN_SESSIONS = 32
+
+# One database per session, so MATCH, bm25() ranking and its IDF
+# statistics only ever see that session's chunks.
+# Chunk rows live in a plain table (keyed lookups by node id); the FTS5
+# table indexes their text as external content, kept in sync by triggers.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    rowid       INTEGER PRIMARY KEY,
+    node_id     TEXT NOT NULL UNIQUE,
+    document_id TEXT NOT NULL,
+    session_id  TEXT NOT NULL,
+    metadata    TEXT NOT NULL,
+    text        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chunks_document
+    ON chunks (document_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5 (
+    text,
+    content = 'chunks',
+    content_rowid = 'rowid',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS chunks_ai AFTER INSERT ON chunks BEGIN
+    INSERT INTO chunks_fts (rowid, text) VALUES (new.rowid, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS chunks_ad AFTER DELETE ON chunks BEGIN
+    INSERT INTO chunks_fts (chunks_fts, rowid, text) VALUES ('delete', old.rowid, old.text);
+END;
+"""
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 OR-query of quoted terms.
+
+    Each whitespace-separated token is quoted, so identifiers such as
+    "4.2.1" or "ERR-1042" match as phrases instead of being parsed as
+    FTS5 syntax.
+    """
+    terms = [
+        token.replace('"', "")
+        for token in query.split()
+        if re.search(r"\w", token)
+    ]
+    terms = list(dict.fromkeys(terms))[:MAX_QUERY_TERMS]
+
+    if not terms:
+        return None
+
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+class LexicalIndex:
+    """
+    BM25 keyword index over the same chunks stored in the vector store
+    (SQLite FTS5), one database file per session under `path`.
+
+    Connections are per thread so concurrent searches don't serialize;
+    WAL lets them read while an ingestion worker writes.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        budget_ms: float = HYBRID_LEXICAL_BUDGET_MS
+    ):
+        self.path = Path(path)
+        self.budget_ms = budget_ms
+
+        self._local = threading.local()
+
+        self.searches = 0
+        self.timeouts = 0
+
+    def _session_file(self, session_id: str) -> Path:
+        # Session ids come from clients: hash them into a safe file name
+        digest = hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:32]
+        return self.path / f"{digest}.sqlite3"
+
+    def _conn(self, session_id: str, create: bool = True) -> Optional[sqlite3.Connection]:
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = OrderedDict()
+
+        conn = conns.get(session_id)
+        if conn is not None:
+            conns.move_to_end(session_id)
+            return conn
+
+        path = self._session_file(session_id)
+        if not create and not path.exists():
+            return None
+
+        conn = connect(path)
+        conn.executescript(_SCHEMA)
+        conns[session_id] = conn
+
+        while len(conns) > MAX_OPEN_SESSIONS:
+            _, evicted = conns.popitem(last=False)
+            evicted.close()
+
+        return conn
+
+    def _write(self, session_id: str, rows: List[tuple]) -> None:
+        conn = self._conn(session_id)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # DELETE + INSERT (not REPLACE) so the delete trigger fires
+            conn.executemany("DELETE FROM chunks WHERE node_id = ?", [(row[0],) for row in rows])
+            conn.executemany(
+                "INSERT INTO chunks (node_id, document_id, session_id, metadata, text) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def add_nodes(self, nodes: Iterable[TextNode]) -> None:
+        """
+        Insert or replace chunks by node id, in each chunk's session.
+        """
+        by_session = defaultdict(list)
+        for node in nodes:
+            session_id = node.metadata.get("session_id", "")
+            by_session[session_id].append((
+                node.node_id,
+                node.metadata.get("document_id", node.ref_doc_id or ""),
+                session_id,
+                json.dumps(node.metadata),
+                node.text,
+            ))
+
+        for session_id, rows in by_session.items():
+            self._write(session_id, rows)
+
+    def delete_nodes(self, session_id: str, node_ids: Iterable[str]) -> None:
+        node_ids = list(node_ids)
+        if not node_ids:
+            return
+
+        conn = self._conn(session_id, create=False)
+        if conn is None:
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("DELETE FROM chunks WHERE node_id = ?", [(node_id,) for node_id in node_ids])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def search(
+        self,
+        query: str,
+        session_id: str,
+        top_k: int,
+        budget_ms: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        BM25-ranked chunks for a session, best first.
+
+        The query is interrupted once it runs past budget_ms; an empty
+        list is returned and retrieval falls back to vector results only.
+        """
+        match = build_match_query(query)
+        if match is None:
+            return []
+
+        budget_ms = self.budget_ms if budget_ms is None else budget_ms
+        deadline = time.monotonic() + budget_ms / 1000
+
+        conn = self._conn(session_id, create=False)
+        if conn is None:
+            return []  # nothing indexed for this session yet
+
+        conn.set_progress_handler(lambda: time.monotonic() > deadline, 1000)
+        self.searches += 1
+
+        try:
+            rows = conn.execute(
+                "SELECT c.node_id, c.metadata, c.text, bm25(chunks_fts) AS rank "
+                "FROM chunks_fts JOIN chunks c ON c.rowid = chunks_fts.rowid "
+                "WHERE chunks_fts MATCH ? "
+                "ORDER BY rank LIMIT ?",
+                (match, top_k),
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            if "interrupted" not in str(e):
+                raise
+            self.timeouts += 1
+            logger.warning(f"Lexical search exceeded {budget_ms}ms budget, skipped")
+            return []
+        finally:
+            conn.set_progress_handler(None, 0)
+
+        return [
+            {
+                "node_id": node_id,
+                "metadata": json.loads(metadata),
+                "text": text,
+                # bm25() is lower-is-better; flip so higher means more relevant
+                "score": -rank,
+            }
+            for node_id, metadata, text, rank in rows
+        ]
+
+    def stats(self) -> Dict:
+        return {
+            "searches": self.searches,
+            "timeouts": self.timeouts,
+            "budget_ms": self.budget_ms,
+        }
+
+
+_lexical_index: Optional[LexicalIndex] = None
+
+
+def get_lexical_index() -> LexicalIndex:
+    """
+    Lazily open the process-wide lexical index.
+    """
+    global _lexical_index
+
+    if _lexical_index is None:
+        _lexical_index = LexicalIndex(LEXICAL_INDEX_DIR)
+
+    return _lexical_index
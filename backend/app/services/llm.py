@@ -1,53 +1,63 @@
-import os
-from typing import AsyncGenerator
-from openai import AsyncOpenAI, OpenAI
-
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-if not GROQ_API_KEY:
-    raise RuntimeError("GROQ_API_KEY is not set")
-
-# Async client for streaming
-client = AsyncOpenAI(
-    api_key=GROQ_API_KEY,
-    base_url="https://api.groq.com/openai/v1",
+from typing import AsyncGenerator, Optional
+from openai import OpenAI
+
+from backend.app.core.config import (
+    LLM_API_KEY,
+    LLM_BASE_URL,
+    LLM_MAX_RETRIES,
+    LLM_MODEL,
+    LLM_TIMEOUT_SECONDS,
 )
+from backend.app.services.llm_gateway import get_llm_gateway
+
+# Sync client for offline tasks (evaluation); created on first use
+_sync_client: Optional[OpenAI] = None
 
-# Sync client for non-streaming (title generation, evaluation)
-sync_client = OpenAI(
-    api_key=GROQ_API_KEY,
-    base_url="https://api.groq.com/openai/v1",
-)
 
-MODEL_NAME = "llama-3.1-8b-instant"
+def _get_sync_client() -> OpenAI:
+    global _sync_client
+
+    if _sync_client is None:
+        if not LLM_API_KEY:
+            raise RuntimeError("LLM_API_KEY (or GROQ_API_KEY) is not set")
+        _sync_client = OpenAI(
+            api_key=LLM_API_KEY,
+            base_url=LLM_BASE_URL,
+            timeout=LLM_TIMEOUT_SECONDS,
+            max_retries=LLM_MAX_RETRIES,
+        )
+    return _sync_client
 
 
 async def stream_llm_response(prompt: str) -> AsyncGenerator[str, None]:
     """
-    STEP 7: Async token streaming from Groq.
+    STEP 7: Async token streaming through the LLM gateway.
     """
-
-    stream = await client.chat.completions.create(
-        model=MODEL_NAME,
-        messages=[{"role": "user", "content": prompt}],
-        stream=True,
-        temperature=0.2,
-    )
-
-    async for chunk in stream:
-        delta = chunk.choices[0].delta
-        if delta and delta.content:
-            yield delta.content
+    async for token in get_llm_gateway().stream(prompt, temperature=0.2):
+        yield token
 
 
 def generate_answer(prompt: str) -> str:
     """
-    Synchronous LLM call for title generation and evaluation tasks.
+    Synchronous LLM call for evaluation tasks. Never call it from the
+    event loop; request paths use agenerate_answer.
     """
-    response = sync_client.chat.completions.create(
-        model=MODEL_NAME,
+    response = _get_sync_client().chat.completions.create(
+        model=LLM_MODEL,
         messages=[{"role": "user", "content": prompt}],
         temperature=0.3,
         max_tokens=100,
     )
-    
-    return response.choices[0].message.content
\ No newline at end of file
+
+    return response.choices[0].message.content
+
+
+async def agenerate_answer(prompt: str, max_tokens: int = 100, temperature: float = 0.3) -> str:
+    """
+    Async non-streaming LLM call for request paths (e.g. title generation).
+    """
+    return await get_llm_gateway().complete(
+        prompt,
+        temperature=temperature,
+        max_tokens=max_tokens,
+    )
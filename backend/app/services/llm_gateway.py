@@ -0,0 +1,348 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+import openai
+from openai import AsyncOpenAI
+
+from backend.app.core.config import (
+    LLM_API_KEY,
+    LLM_BASE_URL,
+    LLM_HEDGE_AFTER_MS,
+    LLM_MAX_CONCURRENCY,
+    LLM_MAX_RETRIES,
+    LLM_MODEL,
+    LLM_RATE_LIMIT_BURST,
+    LLM_RATE_LIMIT_RPS,
+    LLM_RETRY_BASE_SECONDS,
+    LLM_RETRY_MAX_SECONDS,
+    LLM_TIMEOUT_SECONDS,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Async token bucket: rate_per_second sustained, bursts up to burst.
+    A non-positive rate disables limiting.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate = rate_per_second
+        self.capacity = max(burst, 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Rate limits, server errors, timeouts and dropped connections.
+    """
+    if isinstance(error, openai.APIConnectionError):  # includes APITimeoutError
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, asyncio.TimeoutError)
+
+
+def _retry_after_seconds(error: BaseException) -> Optional[float]:
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _discard_late(task: asyncio.Task, discard: Callable[[Any], Awaitable[None]]) -> None:
+    if not task.cancelled() and task.exception() is None:
+        asyncio.ensure_future(discard(task.result()))
+
+
+@dataclass
+class _OpenStream:
+    stream: Any
+    chunks: AsyncIterator
+    first_token: Optional[str]
+
+
+def _content(chunk) -> Optional[str]:
+    if not chunk.choices:
+        return None
+    delta = chunk.choices[0].delta
+    return delta.content if delta and delta.content else None
+
+
+class LLMGateway:
+    """
+    Single entry point for chat completions against an OpenAI-compatible API.
+
+    - at most max_concurrency requests in flight per process (a stream
+      holds its slot until it finishes)
+    - token-bucket rate limiting of request starts
+    - jittered exponential retries on 429 / 5xx / timeouts, honouring
+      Retry-After; streams are only retried before the first token
+    - optional hedging: if no response (or first token) arrives within
+      hedge_after_ms, a second identical request is raced against the
+      first and the loser is cancelled
+    """
+
+    def __init__(
+        self,
+        base_url: str = LLM_BASE_URL,
+        api_key: Optional[str] = LLM_API_KEY,
+        model: str = LLM_MODEL,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        rate_limit_rps: float = LLM_RATE_LIMIT_RPS,
+        rate_limit_burst: int = LLM_RATE_LIMIT_BURST,
+        timeout_seconds: float = LLM_TIMEOUT_SECONDS,
+        max_retries: int = LLM_MAX_RETRIES,
+        retry_base_seconds: float = LLM_RETRY_BASE_SECONDS,
+        retry_max_seconds: float = LLM_RETRY_MAX_SECONDS,
+        hedge_after_ms: float = LLM_HEDGE_AFTER_MS
+    ):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.hedge_after_ms = hedge_after_ms
+
+        self._client: Optional[AsyncOpenAI] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._bucket = TokenBucket(rate_limit_rps, rate_limit_burst)
+
+        self.requests = 0
+        self.in_flight = 0
+        self.retries = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.failures = 0
+
+    def _get_client(self) -> AsyncOpenAI:
+        if self._client is None:
+            if not self.api_key:
+                raise RuntimeError("LLM_API_KEY (or GROQ_API_KEY) is not set")
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=self.timeout_seconds,
+                max_retries=0,  # retries are ours, with jitter and hedging
+            )
+        return self._client
+
+    def _params(self, prompt: str, **overrides) -> Dict:
+        params = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        params.update(overrides)
+        return params
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    async def _acquire(self) -> None:
+        await self._bucket.acquire()
+        await self._semaphore.acquire()
+        self.in_flight += 1
+        self.requests += 1
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    # ------------------------------------------------------------------
+    # Retries + hedging
+    # ------------------------------------------------------------------
+
+    async def _with_retries(self, attempt: Callable[[], Awaitable[Any]]) -> Any:
+        for retry in range(self.max_retries + 1):
+            try:
+                return await attempt()
+            except Exception as e:
+                if retry >= self.max_retries or not is_retryable(e):
+                    self.failures += 1
+                    raise
+
+                delay = _retry_after_seconds(e)
+                if delay is None:
+                    delay = random.uniform(
+                        0, min(self.retry_max_seconds, self.retry_base_seconds * (2 ** retry))
+                    )
+                self.retries += 1
+                logger.warning(f"LLM call failed, retrying in {delay:.2f}s | attempt={retry + 1} | {e}")
+                await asyncio.sleep(delay)
+
+    async def _hedged(
+        self,
+        attempt: Callable[[], Awaitable[Any]],
+        discard: Optional[Callable[[Any], Awaitable[None]]] = None
+    ) -> Any:
+        """
+        Run attempt, racing a second copy if the first is slower than
+        hedge_after_ms. discard() cleans up a result that lost the race.
+        """
+        if self.hedge_after_ms <= 0:
+            return await attempt()
+
+        primary = asyncio.create_task(attempt())
+        try:
+            return await asyncio.wait_for(asyncio.shield(primary), self.hedge_after_ms / 1000)
+        except asyncio.TimeoutError:
+            pass
+        except BaseException:
+            primary.cancel()
+            raise
+
+        self.hedged += 1
+        backup = asyncio.create_task(attempt())
+        pending = {primary, backup}
+        error: Optional[BaseException] = None
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winners = [task for task in done if not task.cancelled() and task.exception() is None]
+
+                if winners:
+                    winner = backup if backup in winners else winners[0]
+                    for loser in winners:
+                        if loser is not winner and discard:
+                            await discard(loser.result())
+                    if winner is backup:
+                        self.hedge_wins += 1
+                    return winner.result()
+
+                error = next(task.exception() for task in done if not task.cancelled())
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+                if discard:
+                    # The loser may finish before the cancellation lands
+                    task.add_done_callback(lambda t: _discard_late(t, discard))
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def complete(self, prompt: str, **overrides) -> str:
+        """
+        Non-streaming completion; returns the message text.
+        """
+        params = self._params(prompt, **overrides)
+
+        async def attempt() -> str:
+            await self._acquire()
+            try:
+                response = await self._get_client().chat.completions.create(**params)
+            finally:
+                self._release()
+            return response.choices[0].message.content
+
+        return await self._with_retries(lambda: self._hedged(attempt))
+
+    async def _open_stream(self, params: Dict) -> _OpenStream:
+        """
+        Start a stream and wait for its first token. On success the
+        concurrency slot stays held until _close_stream.
+        """
+        await self._acquire()
+        stream = None
+        try:
+            stream = await self._get_client().chat.completions.create(stream=True, **params)
+            chunks = stream.__aiter__()
+
+            first_token = None
+            async for chunk in chunks:
+                first_token = _content(chunk)
+                if first_token:
+                    break
+            return _OpenStream(stream=stream, chunks=chunks, first_token=first_token)
+        except BaseException:
+            await self._close(stream)
+            raise
+
+    async def _close(self, stream) -> None:
+        try:
+            if stream is not None:
+                await stream.close()
+        except Exception as e:
+            logger.debug(f"LLM stream close failed: {e}")
+        finally:
+            self._release()
+
+    async def _close_stream(self, opened: _OpenStream) -> None:
+        await self._close(opened.stream)
+
+    async def stream(self, prompt: str, **overrides) -> AsyncGenerator[str, None]:
+        """
+        Streaming completion yielding content tokens. Retries and hedging
+        apply to time-to-first-token; once tokens flow, errors propagate.
+        """
+        params = self._params(prompt, **overrides)
+
+        opened = await self._with_retries(
+            lambda: self._hedged(lambda: self._open_stream(params), discard=self._close_stream)
+        )
+
+        try:
+            if opened.first_token:
+                yield opened.first_token
+
+            async for chunk in opened.chunks:
+                content = _content(chunk)
+                if content:
+                    yield content
+        finally:
+            await self._close_stream(opened)
+
+    def stats(self) -> Dict:
+        return {
+            "base_url": self.base_url,
+            "model": self.model,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "retries": self.retries,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "failures": self.failures,
+        }
+
+
+_llm_gateway: Optional[LLMGateway] = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    global _llm_gateway
+
+    if _llm_gateway is None:
+        _llm_gateway = LLMGateway()
+    return _llm_gateway
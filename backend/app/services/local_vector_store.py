@@ -0,0 +1,658 @@
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from llama_index.core.schema import NodeWithScore, TextNode
+
+from backend.app.core.config import (
+    VECTOR_COMPACT_RATIO,
+    VECTOR_EXACT_MAX_ROWS,
+    VECTOR_HNSW_EF_CONSTRUCTION,
+    VECTOR_HNSW_EF_SEARCH,
+    VECTOR_HNSW_M,
+    VECTOR_INDEX,
+)
+from backend.app.core.sqlite import connect
+from backend.app.services.vector_store import VectorStoreBackend
+import logging
+
+logger = logging.getLogger(__name__)
+
+FILTER_KEYS = ("document_id", "session_id")
+GROW_MIN_ROWS = 1024
+# Rows scored per matmul in exact search / copied per step in compaction
+BLOCK_ROWS = 16384
+COMPACT_MIN_SLOTS = 1024
+MAX_CACHED_CANDIDATES = 1024
+# Attempts to map a consistent (state, matrix) pair before giving up
+REFRESH_ATTEMPTS = 3
+SQL_BATCH = 500
+
+# Node rows live in SQLite; their vectors are rows of a float32 matrix
+# file, addressed by slot. Every write bumps seq; deletions are logged
+# with their seq so other processes can catch up incrementally.
+# Compaction renumbers slots and bumps epoch (readers reload fully); the
+# retired epoch's files are only removed by the compaction after it.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vectors (
+    slot        INTEGER PRIMARY KEY,
+    node_id     TEXT NOT NULL UNIQUE,
+    document_id TEXT NOT NULL,
+    session_id  TEXT NOT NULL,
+    metadata    TEXT NOT NULL,
+    text        TEXT NOT NULL,
+    seq         INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_vectors_seq ON vectors (seq);
+CREATE INDEX IF NOT EXISTS idx_vectors_document ON vectors (document_id);
+CREATE INDEX IF NOT EXISTS idx_vectors_session ON vectors (session_id);
+CREATE TABLE IF NOT EXISTS deletions (
+    seq  INTEGER NOT NULL,
+    slot INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_deletions_seq ON deletions (seq);
+CREATE TABLE IF NOT EXISTS state (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def _state(conn: sqlite3.Connection) -> Dict[str, int]:
+    state = {"next_slot": 0, "seq": 0, "epoch": 0}
+    state.update(conn.execute("SELECT key, value FROM state").fetchall())
+    return state
+
+
+def _set_state(conn: sqlite3.Connection, **values: int) -> None:
+    conn.executemany(
+        "INSERT INTO state (key, value) VALUES (?, ?) "
+        "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+        values.items(),
+    )
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class LocalVectorStore(VectorStoreBackend):
+    """
+    In-process vector store: float32 rows in a memory-mapped file plus a
+    SQLite table of node ids, metadata and text, both under `path`.
+
+    Rows are append-only; deleted rows stay in the file until they exceed
+    compact_ratio of it and the file is rewritten. Writes hold the SQLite
+    write lock, so the API and ingestion workers can share one store:
+    each process keeps an in-memory view of live rows and catches up on
+    other processes' changes before every search.
+
+    Search scans the candidate rows exactly (cosine). With index="hnsw"
+    (needs faiss-cpu), candidate sets over exact_max_rows are searched
+    through an HNSW graph instead, saved next to the matrix on close.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        path: Path,
+        dim: int,
+        index: str = VECTOR_INDEX,
+        exact_max_rows: int = VECTOR_EXACT_MAX_ROWS,
+        hnsw_m: int = VECTOR_HNSW_M,
+        ef_construction: int = VECTOR_HNSW_EF_CONSTRUCTION,
+        ef_search: int = VECTOR_HNSW_EF_SEARCH,
+        compact_ratio: float = VECTOR_COMPACT_RATIO
+    ):
+        self.path = Path(path)
+        self.dim = dim
+        self.index = index
+        self.exact_max_rows = exact_max_rows
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.compact_ratio = compact_ratio
+
+        self._local = threading.local()
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+        self._lock = threading.RLock()
+
+        # This process's view of the live rows, as of (epoch, seq)
+        self._epoch: Optional[int] = None
+        self._seq = 0
+        self._next_slot = 0
+        self._slots: Dict[str, int] = {}
+        self._owners: Dict[int, Tuple[str, str, str]] = {}
+        self._groups: Dict[Tuple[str, str], Set[int]] = {}
+        self._candidates: Dict[Tuple, np.ndarray] = {}
+        self._matrix: Optional[np.memmap] = None
+
+        self._writer: Optional[np.memmap] = None
+        self._writer_epoch: Optional[int] = None
+        self._writer_lock = threading.Lock()
+
+        self._faiss = None
+        self._hnsw = None
+        self._hnsw_epoch: Optional[int] = None
+        self._hnsw_saved_rows = 0
+
+        self.searches = 0
+        self.hnsw_searches = 0
+        self.compactions = 0
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = connect(self.path / "vectors.sqlite3")
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(_SCHEMA)
+                    conn.execute("INSERT OR IGNORE INTO state (key, value) VALUES ('dim', ?)", (self.dim,))
+                    stored = conn.execute("SELECT value FROM state WHERE key = 'dim'").fetchone()[0]
+                    if stored != self.dim:
+                        raise ValueError(f"Vector store at {self.path} holds {stored}-dim vectors, not {self.dim}")
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    def _matrix_file(self, epoch: int) -> Path:
+        return self.path / f"vectors-{epoch}.f32"
+
+    def _hnsw_file(self, epoch: int) -> Path:
+        return self.path / f"hnsw-{epoch}.faiss"
+
+    def _open_matrix(self, epoch: int, grow_to: int = 0) -> Optional[np.memmap]:
+        """
+        Map an epoch's matrix file. Only writers (holding the SQLite write
+        lock) may pass grow_to, so the file never shrinks under a race.
+        """
+        file = self._matrix_file(epoch)
+        row_bytes = self.dim * 4
+        size = file.stat().st_size if file.exists() else 0
+
+        if grow_to and size < grow_to * row_bytes:
+            rows = max(grow_to, 2 * (size // row_bytes), GROW_MIN_ROWS)
+            with open(file, "ab") as f:
+                f.truncate(rows * row_bytes)
+            size = rows * row_bytes
+
+        if size < row_bytes:
+            return None
+
+        return np.memmap(file, dtype=np.float32, mode="r+", shape=(size // row_bytes, self.dim))
+
+    def _writable(self, epoch: int, rows: int) -> np.memmap:
+        with self._writer_lock:
+            if self._writer is None or self._writer_epoch != epoch or len(self._writer) < rows:
+                self._writer = self._open_matrix(epoch, grow_to=rows)
+                self._writer_epoch = epoch
+            return self._writer
+
+    # ------------------------------------------------------------------
+    # In-memory view
+    # ------------------------------------------------------------------
+
+    def _track(self, slot: int, node_id: str, document_id: str, session_id: str) -> None:
+        previous = self._slots.get(node_id)
+        if previous is not None and previous != slot:
+            self._untrack(previous)
+
+        self._slots[node_id] = slot
+        self._owners[slot] = (node_id, document_id, session_id)
+        self._groups.setdefault(("document_id", document_id), set()).add(slot)
+        self._groups.setdefault(("session_id", session_id), set()).add(slot)
+
+    def _untrack(self, slot: int) -> None:
+        owner = self._owners.pop(slot, None)
+        if owner is None:
+            return
+
+        node_id, document_id, session_id = owner
+        if self._slots.get(node_id) == slot:
+            del self._slots[node_id]
+
+        for key in (("document_id", document_id), ("session_id", session_id)):
+            group = self._groups.get(key)
+            if group is not None:
+                group.discard(slot)
+                if not group:
+                    del self._groups[key]
+
+    def _refresh(self) -> None:
+        """
+        Apply writes committed (by any process) since the last refresh.
+        Caller holds self._lock.
+        """
+        for _ in range(REFRESH_ATTEMPTS):
+            if self._catch_up():
+                return
+
+            # The epoch's matrix was swept after its state was read:
+            # another process compacted twice since, so reload from scratch
+            self._epoch = None
+
+        raise RuntimeError(f"Vector matrix is missing under {self.path}")
+
+    def _catch_up(self) -> bool:
+        """
+        One refresh attempt. Returns False if the rows are newer than the
+        matrix this process could map.
+        """
+        conn = self._conn()
+        deleted: List[Tuple[int]] = []
+
+        conn.execute("BEGIN")
+        try:
+            state = _state(conn)
+            reload = state["epoch"] != self._epoch
+            if not reload and state["seq"] == self._seq:
+                return True
+
+            if reload:
+                rows = conn.execute(
+                    "SELECT slot, node_id, document_id, session_id FROM vectors"
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT slot, node_id, document_id, session_id FROM vectors WHERE seq > ?",
+                    (self._seq,),
+                ).fetchall()
+                deleted = conn.execute(
+                    "SELECT slot FROM deletions WHERE seq > ?", (self._seq,)
+                ).fetchall()
+        finally:
+            conn.execute("COMMIT")
+
+        if reload:
+            # New containers: searches in flight keep the old epoch's view
+            self._slots, self._owners, self._groups = {}, {}, {}
+            self._epoch = state["epoch"]
+            self._matrix = None
+
+        for row in rows:
+            self._track(*row)
+        for (slot,) in deleted:
+            self._untrack(slot)
+
+        self._seq = state["seq"]
+        self._next_slot = state["next_slot"]
+        self._candidates = {}
+
+        if self._next_slot and (self._matrix is None or len(self._matrix) < self._next_slot):
+            self._matrix = self._open_matrix(self._epoch)
+            if self._matrix is None or len(self._matrix) < self._next_slot:
+                return False
+        return True
+
+    def _candidate_slots(self, filters: Optional[Dict[str, str]]) -> np.ndarray:
+        filters = filters or {}
+        unknown = set(filters) - set(FILTER_KEYS)
+        if unknown:
+            raise ValueError(f"Unsupported vector filter keys: {sorted(unknown)}")
+
+        key = tuple(sorted(filters.items()))
+        slots = self._candidates.get(key)
+        if slots is None:
+            if filters:
+                matched = set.intersection(*(self._groups.get(item, set()) for item in filters.items()))
+            else:
+                matched = self._owners.keys()
+            slots = np.fromiter(sorted(matched), dtype=np.int64, count=len(matched))
+
+            if len(self._candidates) >= MAX_CACHED_CANDIDATES:
+                self._candidates.clear()
+            self._candidates[key] = slots
+        return slots
+
+    # ------------------------------------------------------------------
+    # HNSW
+    # ------------------------------------------------------------------
+
+    def _hnsw_enabled(self) -> bool:
+        if self.index != "hnsw":
+            return False
+
+        if self._faiss is None:
+            try:
+                import faiss  # optional dependency
+            except ImportError:
+                logger.warning("VECTOR_INDEX=hnsw needs faiss-cpu; falling back to exact search")
+                self.index = "exact"
+                return False
+            self._faiss = faiss
+        return True
+
+    def _hnsw_index(self):
+        """
+        HNSW graph over every slot of the current epoch (deleted rows are
+        excluded at search time), extended with rows added since.
+        Caller holds self._lock.
+        """
+        faiss = self._faiss
+
+        if self._hnsw is None or self._hnsw_epoch != self._epoch:
+            self._hnsw, self._hnsw_saved_rows = None, 0
+            file = self._hnsw_file(self._epoch)
+            if file.exists():
+                index = faiss.read_index(str(file))
+                if index.ntotal <= self._next_slot:
+                    self._hnsw, self._hnsw_saved_rows = index, index.ntotal
+
+            if self._hnsw is None:
+                self._hnsw = faiss.IndexHNSWFlat(self.dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+                self._hnsw.hnsw.efConstruction = self.ef_construction
+            self._hnsw_epoch = self._epoch
+
+        if self._hnsw.ntotal < self._next_slot:
+            for start in range(self._hnsw.ntotal, self._next_slot, BLOCK_ROWS):
+                end = min(start + BLOCK_ROWS, self._next_slot)
+                self._hnsw.add(np.ascontiguousarray(self._matrix[start:end]))
+        return self._hnsw
+
+    def _search_hnsw(self, query: np.ndarray, candidates: np.ndarray, top_k: int):
+        faiss = self._faiss
+        index = self._hnsw_index()
+
+        params = faiss.SearchParametersHNSW()
+        params.efSearch = max(self.ef_search, top_k)
+
+        if len(candidates) < index.ntotal:
+            # Filtered-out and deleted rows are skipped inside the graph walk
+            mask = np.zeros(index.ntotal, dtype=bool)
+            mask[candidates] = True
+            bitmap = np.packbits(mask, bitorder="little")
+            params.sel = faiss.IDSelectorBitmap(index.ntotal, faiss.swig_ptr(bitmap))
+
+        scores, slots = index.search(query[None, :], top_k, params=params)
+        found = slots[0] >= 0
+        return slots[0][found], scores[0][found]
+
+    def _save_hnsw(self) -> None:
+        with self._lock:
+            if self._hnsw is None or self._hnsw.ntotal == self._hnsw_saved_rows:
+                return
+            file = self._hnsw_file(self._hnsw_epoch)
+            self._faiss.write_index(self._hnsw, f"{file}.tmp")
+            os.replace(f"{file}.tmp", file)
+            self._hnsw_saved_rows = self._hnsw.ntotal
+
+    # ------------------------------------------------------------------
+    # Backend API
+    # ------------------------------------------------------------------
+
+    def open(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._refresh()
+            if self._hnsw_enabled() and self._next_slot:
+                self._hnsw_index()
+
+        logger.info(
+            f"Local vector store ready | path={self.path} | vectors={len(self._slots)} | index={self.index}"
+        )
+
+    def close(self) -> None:
+        try:
+            self._save_hnsw()
+        except Exception as e:
+            logger.warning(f"HNSW index save failed: {e}")
+
+    def add(self, nodes: List[TextNode]) -> None:
+        # Last write wins for a node id repeated within the batch
+        nodes = list({node.node_id: node for node in nodes}.values())
+        if not nodes:
+            return
+
+        vectors = np.asarray([node.embedding for node in nodes], dtype=np.float32)
+        if vectors.shape != (len(nodes), self.dim):
+            raise ValueError(f"Expected {self.dim}-dim embeddings, got shape {vectors.shape}")
+        vectors = _normalize(vectors)
+
+        rows = [
+            (
+                node.node_id,
+                node.metadata.get("document_id", node.ref_doc_id or ""),
+                node.metadata.get("session_id", ""),
+                json.dumps(node.metadata),
+                node.text,
+            )
+            for node in nodes
+        ]
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            state = _state(conn)
+            seq, start = state["seq"] + 1, state["next_slot"]
+
+            # Vectors land before the rows commit, so readers never see a
+            # row whose vector is missing
+            matrix = self._writable(state["epoch"], start + len(rows))
+            matrix[start:start + len(rows)] = vectors
+            matrix.flush()
+
+            # Re-adding a node id replaces it
+            self._delete_slots(conn, self._select_slots(conn, "node_id", [row[0] for row in rows]), seq)
+            conn.executemany(
+                "INSERT INTO vectors (slot, node_id, document_id, session_id, metadata, text, seq) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(start + i, *row, seq) for i, row in enumerate(rows)],
+            )
+            _set_state(conn, next_slot=start + len(rows), seq=seq)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        filters: Optional[Dict[str, str]] = None
+    ) -> List[NodeWithScore]:
+        query = _normalize(np.asarray(query_embedding, dtype=np.float32))
+
+        with self._lock:
+            self._refresh()
+            candidates = self._candidate_slots(filters)
+            if top_k <= 0 or not len(candidates):
+                return []
+
+            owners, matrix = self._owners, self._matrix
+            self.searches += 1
+
+            slots = None
+            if len(candidates) > self.exact_max_rows and self._hnsw_enabled():
+                self.hnsw_searches += 1
+                slots, scores = self._search_hnsw(query, candidates, top_k)
+                if len(slots) < min(top_k, len(candidates)):
+                    # A heavily filtered graph walk can come up short
+                    slots = None
+
+        if slots is None:
+            # Exact scan runs outside the lock: refreshes replace the
+            # candidate arrays and matrix mapping rather than modify them,
+            # and a slot's row never changes within an epoch
+            slots, scores = self._search_exact(matrix, query, candidates, top_k)
+
+        # Incremental refreshes modify owners in place (a reload swaps in
+        # a new dict), so resolve slots under the lock; slots deleted
+        # since the scan are dropped
+        with self._lock:
+            hits = [
+                (owners[slot][0], float(score))
+                for slot, score in zip(slots, scores)
+                if slot in owners
+            ]
+        return self._load_nodes(hits)
+
+    @staticmethod
+    def _search_exact(matrix: np.ndarray, query: np.ndarray, candidates: np.ndarray, top_k: int):
+        scores = np.empty(len(candidates), dtype=np.float32)
+        for start in range(0, len(candidates), BLOCK_ROWS):
+            block = candidates[start:start + BLOCK_ROWS]
+            scores[start:start + len(block)] = matrix[block] @ query
+
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return candidates[top], scores[top]
+
+    def _load_nodes(self, hits: List[Tuple[str, float]]) -> List[NodeWithScore]:
+        if not hits:
+            return []
+
+        placeholders = ",".join("?" * len(hits))
+        rows = {
+            node_id: (metadata, text)
+            for node_id, metadata, text in self._conn().execute(
+                f"SELECT node_id, metadata, text FROM vectors WHERE node_id IN ({placeholders})",
+                [node_id for node_id, _ in hits],
+            )
+        }
+
+        # Rows deleted since the view was taken are dropped
+        return [
+            NodeWithScore(
+                node=TextNode(id_=node_id, text=rows[node_id][1], metadata=json.loads(rows[node_id][0])),
+                score=score,
+            )
+            for node_id, score in hits
+            if node_id in rows
+        ]
+
+    def _select_slots(self, conn: sqlite3.Connection, column: str, values: List[str]) -> List[int]:
+        slots = []
+        for start in range(0, len(values), SQL_BATCH):
+            batch = values[start:start + SQL_BATCH]
+            slots.extend(
+                slot for (slot,) in conn.execute(
+                    f"SELECT slot FROM vectors WHERE {column} IN ({','.join('?' * len(batch))})",
+                    batch,
+                )
+            )
+        return slots
+
+    def _delete_slots(self, conn: sqlite3.Connection, slots: List[int], seq: int) -> None:
+        conn.executemany("DELETE FROM vectors WHERE slot = ?", [(slot,) for slot in slots])
+        conn.executemany("INSERT INTO deletions (seq, slot) VALUES (?, ?)", [(seq, slot) for slot in slots])
+
+    def _delete(self, select: Callable[[sqlite3.Connection], List[int]]) -> None:
+        conn = self._conn()
+        retired_epoch = None
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            slots = select(conn)
+            if slots:
+                state = _state(conn)
+                self._delete_slots(conn, slots, state["seq"] + 1)
+                _set_state(conn, seq=state["seq"] + 1)
+
+                live = conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+                if (
+                    state["next_slot"] >= COMPACT_MIN_SLOTS
+                    and state["next_slot"] - live > self.compact_ratio * state["next_slot"]
+                ):
+                    retired_epoch = self._compact(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if retired_epoch is not None:
+            self._sweep(keep_from=retired_epoch)
+
+    def _sweep(self, keep_from: int) -> None:
+        """
+        Remove matrix and HNSW files of epochs before keep_from. The epoch
+        just retired is kept for readers that read its state but have not
+        mapped its matrix yet; processes that already mapped a removed file
+        keep it until they reload.
+        """
+        for pattern in ("vectors-*.f32", "hnsw-*.faiss"):
+            for file in self.path.glob(pattern):
+                epoch = file.stem.split("-", 1)[1]
+                if epoch.isdigit() and int(epoch) < keep_from:
+                    file.unlink(missing_ok=True)
+
+    def _compact(self, conn: sqlite3.Connection) -> int:
+        """
+        Rewrite live rows into a dense matrix for the next epoch, inside
+        the caller's write transaction. Returns the retired epoch.
+        """
+        state = _state(conn)
+        slots = [slot for (slot,) in conn.execute("SELECT slot FROM vectors ORDER BY slot")]
+        epoch = state["epoch"] + 1
+
+        source = self._open_matrix(state["epoch"])
+        target = self._open_matrix(epoch, grow_to=max(len(slots), 1))
+        for start in range(0, len(slots), BLOCK_ROWS):
+            block = slots[start:start + BLOCK_ROWS]
+            target[start:start + len(block)] = source[block]
+        target.flush()
+
+        # Ascending order: a row only ever moves down into a freed slot
+        conn.executemany(
+            "UPDATE vectors SET slot = ? WHERE slot = ?",
+            [(new, old) for new, old in enumerate(slots) if new != old],
+        )
+        conn.execute("DELETE FROM deletions")
+        _set_state(conn, next_slot=len(slots), seq=state["seq"] + 1, epoch=epoch)
+
+        self.compactions += 1
+        logger.info(
+            f"Local vector store compacted | epoch={epoch} | "
+            f"rows={len(slots)} | reclaimed={state['next_slot'] - len(slots)}"
+        )
+        return state["epoch"]
+
+    def delete_nodes(self, node_ids: List[str]) -> None:
+        node_ids = list(node_ids)
+        self._delete(lambda conn: self._select_slots(conn, "node_id", node_ids))
+
+    def delete_document(self, document_id: str) -> None:
+        self._delete(lambda conn: self._select_slots(conn, "document_id", [document_id]))
+
+    def delete_legacy_document(self, document_id: str) -> None:
+        prefix = f"{document_id}:"
+        self._delete(lambda conn: [
+            slot for (slot,) in conn.execute(
+                "SELECT slot FROM vectors WHERE document_id = ? AND substr(node_id, 1, ?) != ?",
+                (document_id, len(prefix), prefix),
+            )
+        ])
+
+    def delete_session(self, session_id: str) -> None:
+        self._delete(lambda conn: self._select_slots(conn, "session_id", [session_id]))
+
+    def count(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._slots)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._refresh()
+            return {
+                "backend": self.name,
+                "path": str(self.path),
+                "index": self.index,
+                "vectors": len(self._slots),
+                "slots": self._next_slot,
+                "searches": self.searches,
+                "hnsw_searches": self.hnsw_searches,
+                "compactions": self.compactions,
+            }
@@ -0,0 +1,412 @@
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from postgrest.exceptions import APIError
+
+from backend.app.core.config import (
+    CHAT_FLUSH_BATCH_SIZE,
+    CHAT_FLUSH_INTERVAL_SECONDS,
+    CHAT_FLUSH_MAX_ATTEMPTS,
+    CHAT_FLUSH_MAX_BACKOFF_SECONDS,
+    CHAT_SPOOL_PATH,
+    get_async_supabase_client,
+    supabase_breaker,
+)
+from backend.app.core.metrics import StageTimer
+from backend.app.core.sqlite import connect
+from backend.app.services.session_cache import invalidate_session_messages
+import logging
+
+logger = logging.getLogger(__name__)
+
+# A claimed batch not flushed within this time (worker died) is retried
+CLAIM_LEASE_SECONDS = 120
+# Once a batch has been rejected this often, its rows are sent one by one
+# so a single bad row can't hold back the others
+SPLIT_AFTER_ATTEMPTS = 2
+# Errors PostgREST answers with a 4xx because of the rows sent: SQLSTATE
+# data exceptions (22), constraint violations (23) and undefined or
+# mistyped columns (42, except 42501 insufficient privilege), plus its
+# own request (PGRST1xx) and schema (PGRST2xx) errors
+REJECTION_SQLSTATE_CLASSES = ("22", "23", "42")
+REJECTION_PGRST_PREFIXES = ("PGRST1", "PGRST2")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_messages (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,
+    row        TEXT NOT NULL,
+    claimed_by TEXT,
+    claimed_at REAL,
+    attempts   INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS dead_messages (
+    id         INTEGER PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    row        TEXT NOT NULL,
+    attempts   INTEGER NOT NULL,
+    error      TEXT,
+    failed_at  REAL NOT NULL
+);
+"""
+
+# Bulk insert of rows into a table; raises on failure
+InsertFn = Callable[[str, List[Dict]], Awaitable[None]]
+
+
+class FlushUnavailable(RuntimeError):
+    """
+    The destination can't take rows right now (breaker open, transport
+    error, timeout, 5xx). Unlike a rejected insert, this doesn't count
+    against the rows' attempts.
+    """
+
+
+def is_rejection(error: BaseException) -> bool:
+    """
+    True if PostgREST refused the rows themselves, so retrying them
+    unchanged can't succeed.
+    """
+    if not isinstance(error, APIError) or not isinstance(error.code, str):
+        # No JSON error body (gateway 5xx) or not an HTTP answer at all
+        return False
+
+    if error.code.startswith(REJECTION_PGRST_PREFIXES):
+        return True
+    return error.code[:2] in REJECTION_SQLSTATE_CLASSES and error.code != "42501"
+
+
+class MessageSpool:
+    """
+    Write-behind buffer for Supabase rows.
+
+    Rows are appended to a local SQLite spool (no network on the request
+    path) and a background task flushes them in bulk inserts when
+    batch_size rows are waiting or every interval_seconds. Failed flushes
+    back off exponentially with jitter; rows stay on disk, so a Supabase
+    outage or a restart loses nothing. Delivery is at-least-once.
+
+    Rejected rows are retried one by one once their batch keeps failing,
+    and moved to the dead_messages table after max_attempts rejections.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        insert_fn: Optional[InsertFn] = None,
+        batch_size: int = CHAT_FLUSH_BATCH_SIZE,
+        interval_seconds: float = CHAT_FLUSH_INTERVAL_SECONDS,
+        max_backoff_seconds: float = CHAT_FLUSH_MAX_BACKOFF_SECONDS,
+        max_attempts: int = CHAT_FLUSH_MAX_ATTEMPTS
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.max_attempts = max_attempts
+        self._insert_fn = insert_fn or _supabase_bulk_insert
+
+        # Several API workers may share one spool file
+        self._owner = f"{os.getpid()}:{id(self)}"
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._enqueued_since_flush = 0
+
+        self.flushed = 0
+        self.failed_flushes = 0
+        self.dead_lettered = 0
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = connect(self.path)
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    # ------------------------------------------------------------------
+    # Request path
+    # ------------------------------------------------------------------
+
+    def append(self, table_name: str, row: Dict) -> None:
+        with self._lock:
+            self._get_conn().execute(
+                "INSERT INTO pending_messages (table_name, row) VALUES (?, ?)",
+                (table_name, json.dumps(row)),
+            )
+            self._enqueued_since_flush += 1
+            full = self._enqueued_since_flush >= self.batch_size
+
+        if full and self._wakeup is not None:
+            # append() runs in a worker thread; asyncio.Event is loop-bound
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def _claim_batch(self) -> List[Tuple[int, str, Dict, int]]:
+        now = time.time()
+
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "UPDATE pending_messages SET claimed_by = ?, claimed_at = ? "
+                    "WHERE id IN ("
+                    "  SELECT id FROM pending_messages "
+                    "  WHERE claimed_by IS NULL OR claimed_at < ? "
+                    "  ORDER BY id LIMIT ?)",
+                    (self._owner, now, now - CLAIM_LEASE_SECONDS, self.batch_size),
+                )
+                rows = conn.execute(
+                    "SELECT id, table_name, row, attempts FROM pending_messages "
+                    "WHERE claimed_by = ? ORDER BY id",
+                    (self._owner,),
+                ).fetchall()
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+            self._enqueued_since_flush = 0
+
+        return [
+            (row_id, table_name, json.loads(row), attempts)
+            for row_id, table_name, row, attempts in rows
+        ]
+
+    def _finish_batch(
+        self,
+        claimed: List[Tuple[int, str, Dict, int]],
+        delivered: List[int],
+        rejected: Dict[int, str]
+    ) -> List[int]:
+        """
+        Delete delivered rows, count a rejection against rejected rows
+        (dead-lettering those out of attempts) and release the rest.
+        Returns the ids of rows that were dead-lettered.
+        """
+        delivered_ids = set(delivered)
+        dead: List[int] = []
+
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for row_id, table_name, row, attempts in claimed:
+                    if row_id in delivered_ids:
+                        conn.execute("DELETE FROM pending_messages WHERE id = ?", (row_id,))
+                    elif row_id in rejected and attempts + 1 >= self.max_attempts:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO dead_messages "
+                            "(id, table_name, row, attempts, error, failed_at) "
+                            "VALUES (?, ?, ?, ?, ?, ?)",
+                            (row_id, table_name, json.dumps(row), attempts + 1,
+                             rejected[row_id][:2000], time.time()),
+                        )
+                        conn.execute("DELETE FROM pending_messages WHERE id = ?", (row_id,))
+                        dead.append(row_id)
+                    else:
+                        conn.execute(
+                            "UPDATE pending_messages "
+                            "SET claimed_by = NULL, claimed_at = NULL, attempts = attempts + ? "
+                            "WHERE id = ?",
+                            (1 if row_id in rejected else 0, row_id),
+                        )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        return dead
+
+    async def _deliver(
+        self,
+        table_name: str,
+        items: List[Tuple[int, str, Dict, int]],
+        delivered: List[int],
+        rejected: Dict[int, str]
+    ) -> None:
+        if len(items) > 1 and max(item[3] for item in items) >= SPLIT_AFTER_ATTEMPTS:
+            # This batch keeps being rejected: isolate the offending rows
+            for row_id, _, row, _ in items:
+                try:
+                    await self._insert_fn(table_name, [row])
+                except FlushUnavailable:
+                    raise
+                except Exception as e:
+                    rejected[row_id] = f"{type(e).__name__}: {e}"
+                else:
+                    delivered.append(row_id)
+            return
+
+        try:
+            await self._insert_fn(table_name, [row for _, _, row, _ in items])
+        except FlushUnavailable:
+            raise
+        except Exception as e:
+            rejected.update({row_id: f"{type(e).__name__}: {e}" for row_id, _, _, _ in items})
+        else:
+            delivered.extend(row_id for row_id, _, _, _ in items)
+
+    async def flush_once(self) -> int:
+        """
+        Deliver one batch. Returns the number of rows flushed; raises if
+        any row is still pending after a failed insert (it is released
+        for the next attempt).
+        """
+        claimed = await asyncio.to_thread(self._claim_batch)
+        if not claimed:
+            return 0
+
+        by_table: Dict[str, List[Tuple[int, str, Dict, int]]] = {}
+        for item in claimed:
+            by_table.setdefault(item[1], []).append(item)
+
+        delivered: List[int] = []
+        rejected: Dict[int, str] = {}
+        unavailable: Optional[Exception] = None
+
+        for table_name, items in by_table.items():
+            try:
+                await self._deliver(table_name, items, delivered, rejected)
+            except FlushUnavailable as e:
+                unavailable = e
+                break
+
+        dead = await asyncio.to_thread(self._finish_batch, claimed, delivered, rejected)
+        self.flushed += len(delivered)
+
+        if dead:
+            self.dead_lettered += len(dead)
+            logger.error(
+                f"Chat messages dead-lettered after {self.max_attempts} attempts | "
+                f"ids={dead} | {rejected[dead[0]]}"
+            )
+
+        if unavailable is not None or len(rejected) > len(dead):
+            self.failed_flushes += 1
+            if unavailable is not None:
+                raise unavailable
+            raise RuntimeError(next(error for row_id, error in rejected.items() if row_id not in dead))
+
+        return len(claimed)
+
+    async def flush(self) -> int:
+        """
+        Flush until the spool is empty. Returns rows flushed.
+        """
+        total = 0
+        while True:
+            flushed = await self.flush_once()
+            total += flushed
+            if flushed < self.batch_size:
+                return total
+
+    async def _run(self) -> None:
+        failures = 0
+
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+                failures = 0
+            except Exception as e:
+                failures += 1
+                delay = random.uniform(
+                    0, min(self.max_backoff_seconds, self.interval_seconds * (2 ** failures))
+                )
+                logger.error(
+                    f"Chat message flush failed, retrying in {delay:.1f}s | "
+                    f"attempt={failures} | {e}"
+                )
+                await asyncio.sleep(delay)
+
+    def start(self) -> None:
+        """
+        Start the background flusher (called from the FastAPI lifespan).
+        """
+        self._stopping = False
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Chat message spool started | path={self.path} | pending={self.pending()}")
+
+    async def stop(self, timeout_seconds: float = 10) -> None:
+        """
+        Stop the flusher and make a last bounded attempt to drain the
+        spool. Whatever remains is flushed after the next start.
+        """
+        self._stopping = True
+        if self._task is not None:
+            self._wakeup.set()
+            try:
+                await asyncio.wait_for(self._task, timeout=timeout_seconds)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+            self._task = None
+
+        try:
+            await asyncio.wait_for(self.flush(), timeout=timeout_seconds)
+        except Exception as e:
+            logger.error(f"Final chat message flush incomplete: {e}")
+
+        logger.info(f"Chat message spool stopped | pending={self.pending()}")
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._get_conn().execute(
+                "SELECT COUNT(*) FROM pending_messages"
+            ).fetchone()[0]
+
+    def stats(self) -> Dict:
+        return {
+            "pending": self.pending(),
+            "flushed": self.flushed,
+            "failed_flushes": self.failed_flushes,
+            "dead_lettered": self.dead_lettered,
+            "batch_size": self.batch_size,
+            "interval_seconds": self.interval_seconds,
+        }
+
+
+async def _supabase_bulk_insert(table_name: str, rows: List[Dict]) -> None:
+    client = await get_async_supabase_client()
+    if not client:
+        raise FlushUnavailable("Supabase unavailable")
+
+    try:
+        with StageTimer("background", "supabase_flush"):
+            await client.table(table_name).insert(rows).execute()
+    except Exception as e:
+        if is_rejection(e):
+            raise
+        supabase_breaker.record_failure(e)
+        raise FlushUnavailable(f"{type(e).__name__}: {e}") from e
+
+    supabase_breaker.record_success()
+
+    if table_name == "chat_messages":
+        # Rows only become visible to session listing once flushed
+        await invalidate_session_messages(*{row["session_id"] for row in rows})
+
+
+chat_message_spool = MessageSpool(CHAT_SPOOL_PATH)
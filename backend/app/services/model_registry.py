@@ -0,0 +1,249 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Set, Tuple
+
+from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+from backend.app.core.config import (
+    EMBED_BATCH_SIZE,
+    EMBED_MODEL_NAME,
+    EMBED_NUM_THREADS,
+    RERANK_MAX_LENGTH,
+    RERANK_MODEL_NAME,
+)
+from backend.app.core.logging import setup_logger
+
+logger = setup_logger()
+
+WARMUP_TEXT = "DocuMind warmup"
+
+DEFAULT_EMBED_OPTIONS = {
+    "trust_remote_code": True,
+    "embed_batch_size": EMBED_BATCH_SIZE,
+}
+
+
+@dataclass
+class LoadedModel:
+    model: Any
+    load_seconds: float
+    memory_bytes: int
+    ready: bool = False
+
+
+_models: Dict[Tuple, LoadedModel] = {}
+# Models whose warmup gates readiness; others may be loaded lazily later
+_required: Set[Tuple] = set()
+# Last warmup error of each required model that isn't warm yet
+_warmup_errors: Dict[Tuple, str] = {}
+_lock = threading.Lock()
+
+
+def _registry_key(kind: str, model_name: str, options: Dict) -> Tuple:
+    return (kind, model_name, tuple(sorted(options.items())))
+
+
+def _embed_key(model_name: str, options: Dict) -> Tuple:
+    return _registry_key("embedding", model_name, {**DEFAULT_EMBED_OPTIONS, **options})
+
+
+def _rerank_key(model_name: str) -> Tuple:
+    return _registry_key("rerank", model_name, {"max_length": RERANK_MAX_LENGTH})
+
+
+def require_startup_models(rerank: bool = False) -> None:
+    """
+    Declare the models warmed at startup before warming any of them, so
+    readiness waits for all of them rather than the first one loaded.
+    """
+    _required.add(_embed_key(EMBED_MODEL_NAME, {}))
+    if rerank:
+        _required.add(_rerank_key(RERANK_MODEL_NAME))
+
+
+def _warmup(key: Tuple, load: Callable[[], Any], run: Callable[[Any], None]) -> None:
+    """
+    Load a model and run a dummy forward pass, recording any error for
+    /health until a later attempt succeeds.
+    """
+    try:
+        model = load()
+
+        start_time = time.perf_counter()
+        run(model)
+        warmup_ms = round((time.perf_counter() - start_time) * 1000, 2)
+    except Exception as e:
+        _warmup_errors[key] = f"{type(e).__name__}: {e}"
+        raise
+
+    _models[key].ready = True
+    _warmup_errors.pop(key, None)
+    logger.info(f"Model warmed up | model={key[1]} | {warmup_ms}ms")
+
+
+def _rss_bytes() -> int:
+    """
+    Current resident set size; 0 where /proc is unavailable.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return 0
+
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _parameter_bytes(model: Any) -> int:
+    """
+    Size of the underlying torch weights, if the wrapper exposes them.
+    """
+    inner = getattr(model, "_model", model)
+    if inner is None or not hasattr(inner, "parameters"):
+        return 0
+
+    return sum(p.numel() * p.element_size() for p in inner.parameters())
+
+
+def _configure_threads() -> None:
+    if EMBED_NUM_THREADS <= 0:
+        return
+
+    import torch
+
+    if torch.get_num_threads() != EMBED_NUM_THREADS:
+        torch.set_num_threads(EMBED_NUM_THREADS)
+
+
+def _load(key: Tuple, factory: Callable[[], Any]) -> LoadedModel:
+    loaded = _models.get(key)
+    if loaded is not None:
+        return loaded
+
+    with _lock:
+        loaded = _models.get(key)
+        if loaded is not None:
+            return loaded
+
+        _configure_threads()
+
+        rss_before = _rss_bytes()
+        start_time = time.perf_counter()
+        model = factory()
+        load_seconds = time.perf_counter() - start_time
+
+        memory_bytes = _parameter_bytes(model) or max(_rss_bytes() - rss_before, 0)
+
+        loaded = LoadedModel(
+            model=model,
+            load_seconds=round(load_seconds, 3),
+            memory_bytes=memory_bytes,
+        )
+        _models[key] = loaded
+
+        logger.info(
+            f"Model loaded | key={key[:2]} | {loaded.load_seconds}s | "
+            f"{round(memory_bytes / (1024 * 1024), 1)}MB"
+        )
+
+    return loaded
+
+
+def get_embed_model(
+    model_name: str = EMBED_MODEL_NAME,
+    **options
+) -> HuggingFaceEmbedding:
+    """
+    Return the process-wide embedding model for (model_name, options),
+    loading it on first use.
+    """
+    key = _embed_key(model_name, options)
+    options = {**DEFAULT_EMBED_OPTIONS, **options}
+
+    loaded = _load(
+        key,
+        lambda: HuggingFaceEmbedding(model_name=model_name, **options),
+    )
+
+    return loaded.model
+
+
+def warmup_embed_model(
+    model_name: str = EMBED_MODEL_NAME,
+    **options
+) -> None:
+    """
+    Load the embedding model and run a dummy forward pass so the first
+    real request does not pay for lazy initialisation.
+    """
+    def run(embed_model):
+        embed_model.get_text_embedding(WARMUP_TEXT)
+        embed_model.get_query_embedding(WARMUP_TEXT)
+
+    _warmup(
+        _embed_key(model_name, options),
+        lambda: get_embed_model(model_name, **options),
+        run,
+    )
+
+
+def get_rerank_model(model_name: str = RERANK_MODEL_NAME):
+    """
+    Return the process-wide cross-encoder used for reranking (CPU).
+    """
+    key = _rerank_key(model_name)
+
+    def _factory():
+        # Only imported when reranking is enabled
+        from sentence_transformers import CrossEncoder
+
+        return CrossEncoder(model_name, max_length=RERANK_MAX_LENGTH, device="cpu")
+
+    return _load(key, _factory).model
+
+
+def warmup_rerank_model(model_name: str = RERANK_MODEL_NAME) -> None:
+    _warmup(
+        _rerank_key(model_name),
+        lambda: get_rerank_model(model_name),
+        lambda rerank_model: rerank_model.predict([(WARMUP_TEXT, WARMUP_TEXT)], show_progress_bar=False),
+    )
+
+
+def is_ready() -> bool:
+    """
+    True once every model declared by require_startup_models is warm.
+    """
+    return bool(_required) and all(key in _models and _models[key].ready for key in _required)
+
+
+def registry_status() -> Dict[str, Dict]:
+    """
+    Per-model load time, memory footprint and readiness for /health,
+    plus the last warmup error of startup models that aren't warm yet.
+    """
+    status = {
+        f"{kind}:{name}": {
+            "ready": loaded.ready,
+            "load_seconds": loaded.load_seconds,
+            "memory_mb": round(loaded.memory_bytes / (1024 * 1024), 1),
+        }
+        for (kind, name, _), loaded in _models.items()
+    }
+
+    for kind, name, options in _required:
+        entry = status.setdefault(f"{kind}:{name}", {"ready": False})
+        error = _warmup_errors.get((kind, name, options))
+        if error:
+            entry["error"] = error
+
+    return status
+
+
+def clear_registry() -> None:
+    with _lock:
+        _models.clear()
+        _required.clear()
+        _warmup_errors.clear()
@@ -0,0 +1,149 @@
+import multiprocessing
+import threading
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from pypdf import PdfReader
+from docx import Document as DocxDocument
+from pptx import Presentation
+
+from backend.app.core.config import (
+    PARSE_PAGES_PER_TASK,
+    PARSE_PARALLEL_MIN_PAGES,
+    PARSE_WORKERS,
+)
+
+PAGE_SEPARATOR = "\n"
+
+
+@dataclass
+class ParsedDocument:
+    text: str
+    # (page_number, start_char, end_char), 1-based page numbers
+    page_offsets: List[Tuple[int, int, int]] = field(default_factory=list)
+
+    @cached_property
+    def _page_starts(self) -> List[int]:
+        return [start for _, start, _ in self.page_offsets]
+
+    def page_for_offset(self, char_idx: Optional[int]) -> Optional[int]:
+        if char_idx is None or not self.page_offsets:
+            return None
+
+        pos = bisect_right(self._page_starts, char_idx) - 1
+        return self.page_offsets[max(pos, 0)][0]
+
+
+# ---------------------------------------------------------------------------
+# PDF extraction of a page range. Runs inside pool workers, so each call
+# reopens the file instead of shipping parsed objects across processes;
+# pypdf reads pages lazily, so that costs little beyond the cross-reference
+# table.
+# ---------------------------------------------------------------------------
+
+def _extract_pdf_pages(file_path: str, start: int, end: int) -> List[str]:
+    reader = PdfReader(file_path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    return _pool
+
+
+def shutdown_parse_pool() -> None:
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def iter_pages(file_path: Path, workers: int = PARSE_WORKERS) -> Iterator[str]:
+    """
+    Yield page (PDF), slide (PPTX) or whole-document (DOCX) text in order.
+
+    Large PDFs fan page ranges out to a process pool; small ones are
+    parsed serially because pool start-up and IPC would cost more. PPTX
+    and DOCX are parsed serially: python-pptx and python-docx load the
+    whole package up front, so every worker would repeat the full load.
+    """
+    ext = file_path.suffix.lower()
+
+    if ext == ".docx":
+        doc = DocxDocument(str(file_path))
+        yield "\n".join(p.text for p in doc.paragraphs)
+        return
+
+    if ext == ".pptx":
+        for slide in Presentation(str(file_path)).slides:
+            yield "\n".join(shape.text for shape in slide.shapes if hasattr(shape, "text"))
+        return
+
+    if ext != ".pdf":
+        raise ValueError("Unsupported file format")
+
+    total = len(PdfReader(str(file_path)).pages)
+
+    if workers <= 1 or total < PARSE_PARALLEL_MIN_PAGES:
+        yield from _extract_pdf_pages(str(file_path), 0, total)
+        return
+
+    ranges = [
+        (start, min(start + PARSE_PAGES_PER_TASK, total))
+        for start in range(0, total, PARSE_PAGES_PER_TASK)
+    ]
+
+    # Keep a bounded window of ranges in flight so a slow consumer doesn't
+    # let extracted text pile up; yielding in submission order keeps pages
+    # in order.
+    pool = _get_pool()
+    max_in_flight = workers * 2
+    pending = deque()
+
+    for start, end in ranges:
+        pending.append(pool.submit(_extract_pdf_pages, str(file_path), start, end))
+        if len(pending) >= max_in_flight:
+            yield from pending.popleft().result()
+
+    while pending:
+        yield from pending.popleft().result()
+
+
+def parse_document(file_path: Path, workers: int = PARSE_WORKERS) -> ParsedDocument:
+    """
+    Parse a document and record each page's character span in the text.
+    """
+    pages = []
+    page_offsets = []
+    cursor = 0
+
+    for page_number, page_text in enumerate(iter_pages(file_path, workers), start=1):
+        if page_number > 1:
+            cursor += len(PAGE_SEPARATOR)
+        page_offsets.append((page_number, cursor, cursor + len(page_text)))
+        cursor += len(page_text)
+        pages.append(page_text)
+
+    return ParsedDocument(
+        text=PAGE_SEPARATOR.join(pages),
+        page_offsets=page_offsets,
+    )
@@ -0,0 +1,133 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from llama_index.core.schema import NodeWithScore
+
+from backend.app.core.config import (
+    RERANK_BATCH_SIZE,
+    RERANK_BUDGET_MS,
+    RERANK_TOP_N,
+)
+from backend.app.core.executors import run_in_embedding_executor
+from backend.app.services.model_registry import get_rerank_model
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RerankResult:
+    nodes: List[NodeWithScore]
+    latency_ms: float
+    candidates: int
+    scored: int
+    budget_exhausted: bool
+
+
+class RerankStats:
+    """
+    Per-process rerank counters for /stats.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.budget_exhausted = 0
+        self.total_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+
+    def record(self, result: RerankResult) -> None:
+        with self._lock:
+            self.requests += 1
+            self.budget_exhausted += int(result.budget_exhausted)
+            self.total_latency_ms += result.latency_ms
+            self.max_latency_ms = max(self.max_latency_ms, result.latency_ms)
+
+    def stats(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "budget_exhausted": self.budget_exhausted,
+            "avg_latency_ms": round(self.total_latency_ms / self.requests, 2) if self.requests else 0.0,
+            "max_latency_ms": round(self.max_latency_ms, 2),
+            "budget_ms": RERANK_BUDGET_MS,
+        }
+
+
+rerank_stats = RerankStats()
+
+
+def rerank(
+    query: str,
+    candidates: List[NodeWithScore],
+    top_n: int = RERANK_TOP_N,
+    budget_ms: float = RERANK_BUDGET_MS,
+    batch_size: int = RERANK_BATCH_SIZE,
+    model=None
+) -> RerankResult:
+    """
+    Score (query, chunk) pairs with a cross-encoder and keep the best top_n.
+
+    Candidates are scored in retrieval order, batch by batch. Scoring stops
+    before a batch that would overrun budget_ms (judged by the previous
+    batch's cost); unscored candidates keep their retrieval order and only
+    fill slots the scored ones leave open.
+    """
+    start_time = time.perf_counter()
+    deadline = start_time + budget_ms / 1000
+
+    if candidates and model is None:
+        model = get_rerank_model()
+
+    scores: List[float] = []
+    last_batch_seconds = 0.0
+
+    for start in range(0, len(candidates), batch_size):
+        now = time.perf_counter()
+        if scores and now + last_batch_seconds > deadline:
+            break
+
+        batch = candidates[start:start + batch_size]
+        pairs = [(query, item.node.get_content()) for item in batch]
+        scores.extend(float(s) for s in model.predict(pairs, batch_size=len(pairs), show_progress_bar=False))
+        last_batch_seconds = time.perf_counter() - now
+
+    scored = sorted(
+        (
+            NodeWithScore(node=item.node, score=score)
+            for item, score in zip(candidates, scores)
+        ),
+        key=lambda item: item.score,
+        reverse=True,
+    )
+    unscored = candidates[len(scores):]
+
+    result = RerankResult(
+        nodes=(scored + unscored)[:top_n],
+        latency_ms=round((time.perf_counter() - start_time) * 1000, 2),
+        candidates=len(candidates),
+        scored=len(scores),
+        budget_exhausted=len(scores) < len(candidates),
+    )
+    rerank_stats.record(result)
+
+    return result
+
+
+async def arerank(
+    query: str,
+    candidates: List[NodeWithScore],
+    top_n: int = RERANK_TOP_N,
+    budget_ms: Optional[float] = None
+) -> RerankResult:
+    """
+    Rerank on the bounded inference executor, off the event loop.
+    """
+    return await run_in_embedding_executor(
+        rerank,
+        query,
+        candidates,
+        top_n=top_n,
+        budget_ms=RERANK_BUDGET_MS if budget_ms is None else budget_ms,
+    )
@@ -1,8 +1,296 @@
-from llama_index.core import VectorStoreIndex
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
-from llama_index.core.vector_stores import MetadataFilters, ExactMatchFilter
+import asyncio
+import base64
+import hashlib
+import re
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
-from backend.app.services.vector_store import get_vector_store
+from llama_index.core.schema import NodeWithScore, TextNode
+
+from backend.app.core.config import (
+    EMBED_MODEL_NAME,
+    HYBRID_CANDIDATES,
+    HYBRID_ENABLED,
+    HYBRID_LEXICAL_WEIGHT,
+    HYBRID_RRF_K,
+    HYBRID_VECTOR_WEIGHT,
+    QUERY_CACHE_MAX_ENTRIES,
+    QUERY_CACHE_REDIS_ENABLED,
+    QUERY_CACHE_TTL_SECONDS,
+)
+from backend.app.core.executors import run_in_embedding_executor
+from backend.app.core.metrics import StageTimer
+from backend.app.core.redis import get_redis_client, redis_breaker
+from backend.app.services.document_registry import get_chunk_positions
+from backend.app.services.lexical_index import get_lexical_index
+from backend.app.services.model_registry import get_embed_model
+from backend.app.services.vector_store import get_vector_backend
+import logging
+
+logger = logging.getLogger(__name__)
+
+REDIS_QUERY_EMBEDDING_PREFIX = "query:embedding:"
+
+
+def normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", query).strip().casefold()
+
+
+class QueryEmbeddingCache:
+    """
+    LRU + TTL cache mapping normalized query text to its embedding.
+
+    The in-process tier is checked first; on a miss, the optional Redis
+    tier lets workers share vectors for questions asked elsewhere.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = QUERY_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = QUERY_CACHE_TTL_SECONDS,
+        use_redis: bool = QUERY_CACHE_REDIS_ENABLED
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.use_redis = use_redis
+
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, List[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _redis_key(self, model_name: str, normalized: str) -> str:
+        digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        return f"{REDIS_QUERY_EMBEDDING_PREFIX}{model_name}:{digest}"
+
+    def _get_local(self, key: Tuple[str, str]) -> Optional[List[float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, vector = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return vector
+
+    def _put_local(self, key: Tuple[str, str], vector: List[float]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, vector)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _get_redis(self, model_name: str, normalized: str) -> Optional[List[float]]:
+        redis_client = get_redis_client()
+        if not redis_client:
+            return None
+
+        try:
+            payload = redis_client.get(self._redis_key(model_name, normalized))
+        except Exception as e:
+            redis_breaker.record_failure(e)
+            logger.error(f"Redis read failed: {e}")
+            return None
+
+        if payload is None:
+            return None
+
+        vector = array("f")
+        vector.frombytes(base64.b64decode(payload))
+        return vector.tolist()
+
+    def _put_redis(self, model_name: str, normalized: str, vector: List[float]) -> None:
+        redis_client = get_redis_client()
+        if not redis_client:
+            return
+
+        try:
+            redis_client.set(
+                self._redis_key(model_name, normalized),
+                base64.b64encode(array("f", vector).tobytes()).decode("ascii"),
+                ex=self.ttl_seconds,
+            )
+        except Exception as e:
+            redis_breaker.record_failure(e)
+            logger.error(f"Redis write failed: {e}")
+
+    def get(self, model_name: str, query: str) -> Optional[List[float]]:
+        normalized = normalize_query(query)
+        key = (model_name, normalized)
+
+        vector = self._get_local(key)
+        if vector is not None:
+            self.hits += 1
+            return vector
+
+        if self.use_redis:
+            vector = self._get_redis(model_name, normalized)
+            if vector is not None:
+                self.redis_hits += 1
+                self._put_local(key, vector)
+                return vector
+
+        self.misses += 1
+        return None
+
+    def put(self, model_name: str, query: str, vector: List[float]) -> None:
+        normalized = normalize_query(query)
+        self._put_local((model_name, normalized), vector)
+
+        if self.use_redis:
+            self._put_redis(model_name, normalized, vector)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.redis_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "redis_tier": self.use_redis,
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.redis_hits) / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+query_embedding_cache = QueryEmbeddingCache()
+
+
+def get_query_embedding(query: str, model_name: str = EMBED_MODEL_NAME) -> List[float]:
+    """
+    Embed a query, reusing the vector for repeated or re-cased questions.
+    """
+    with StageTimer("chat", "query_embedding") as timer:
+        vector = query_embedding_cache.get(model_name, query)
+        if vector is not None:
+            timer.outcome = "cache_hit"
+            return vector
+
+        vector = get_embed_model(model_name).get_query_embedding(query)
+        query_embedding_cache.put(model_name, query, vector)
+
+    return vector
+
+
+def _search_vector_store(
+    query_embedding: List[float],
+    session_id: str,
+    top_k: int
+) -> List[NodeWithScore]:
+    """
+    Similarity search with a pre-computed query embedding, scoped to
+    the session, on the configured vector store backend.
+    """
+    with StageTimer("chat", "vector_search"):
+        results = get_vector_backend().search(
+            query_embedding,
+            top_k,
+            filters={"session_id": session_id},
+        )
+
+    return _refresh_positions(results)
+
+
+def _refresh_positions(results: List[NodeWithScore]) -> List[NodeWithScore]:
+    """
+    Chunks reused across revisions were stored with the positional
+    metadata of the version that first indexed them; take the current
+    values from the chunk manifest.
+    """
+    if not results:
+        return results
+
+    try:
+        positions = get_chunk_positions(item.node.node_id for item in results)
+    except Exception as e:
+        logger.error(f"Chunk position lookup failed: {e}")
+        return results
+
+    for item in results:
+        fields = positions.get(item.node.node_id)
+        if fields:
+            item.node.metadata.update(fields)
+
+    return results
+
+
+def _search_lexical_index(
+    query: str,
+    session_id: str,
+    top_k: int
+) -> List[NodeWithScore]:
+    """
+    BM25 candidates from the lexical index. Best-effort: failures and
+    budget overruns yield no candidates rather than failing the request.
+    """
+    with StageTimer("chat", "lexical_search") as timer:
+        try:
+            hits = get_lexical_index().search(query, session_id, top_k)
+        except Exception as e:
+            timer.outcome = "error"
+            logger.error(f"Lexical search failed: {e}")
+            return []
+
+    return [
+        NodeWithScore(
+            node=TextNode(id_=hit["node_id"], text=hit["text"], metadata=hit["metadata"]),
+            score=hit["score"],
+        )
+        for hit in hits
+    ]
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: List[Tuple[float, List[NodeWithScore]]],
+    top_k: int,
+    k: int = HYBRID_RRF_K
+) -> List[NodeWithScore]:
+    """
+    Merge ranked candidate lists by weighted reciprocal rank:
+    score(node) = sum(weight / (k + rank)) over the lists it appears in.
+    Raw scores are ignored, so BM25 and cosine scales never need aligning.
+    """
+    fused: Dict[str, float] = {}
+    nodes: Dict[str, NodeWithScore] = {}
+
+    for weight, ranked in ranked_lists:
+        for rank, item in enumerate(ranked, start=1):
+            node_id = item.node.node_id
+            fused[node_id] = fused.get(node_id, 0.0) + weight / (k + rank)
+            # First list wins, so vector hits keep their full node
+            nodes.setdefault(node_id, item)
+
+    best = sorted(fused, key=fused.get, reverse=True)[:top_k]
+
+    return [NodeWithScore(node=nodes[node_id].node, score=fused[node_id]) for node_id in best]
+
+
+def _fuse(
+    vector_nodes: List[NodeWithScore],
+    lexical_nodes: List[NodeWithScore],
+    top_k: int
+) -> List[NodeWithScore]:
+    if not lexical_nodes:
+        return vector_nodes[:top_k]
+
+    return reciprocal_rank_fusion(
+        [(HYBRID_VECTOR_WEIGHT, vector_nodes), (HYBRID_LEXICAL_WEIGHT, lexical_nodes)],
+        top_k=top_k,
+    )
 
 
 def retrieve_similar_chunks(
@@ -11,36 +299,72 @@ def retrieve_similar_chunks(
     top_k: int = 5
 ):
     """
-    Retrieve top-k semantically similar chunks
-    scoped strictly to the given session_id.
+    Retrieve top-k chunks scoped strictly to the given session_id:
+    vector search fused with BM25 keyword search (when enabled).
     """
 
-    embed_model = HuggingFaceEmbedding(
-        model_name="nomic-ai/nomic-embed-text-v1.5",
-        trust_remote_code=True
-    )
+    query_embedding = get_query_embedding(query)
 
-    vector_store = get_vector_store()
+    if not HYBRID_ENABLED:
+        return _search_vector_store(query_embedding, session_id, top_k)
 
-    index = VectorStoreIndex.from_vector_store(
-        vector_store=vector_store,
-        embed_model=embed_model
-    )
+    candidates = max(top_k, HYBRID_CANDIDATES)
 
-    # ✅ CORRECT FILTER OBJECT
-    filters = MetadataFilters(
-        filters=[
-            ExactMatchFilter(
-                key="session_id",
-                value=session_id
-            )
-        ]
+    return _fuse(
+        _search_vector_store(query_embedding, session_id, candidates),
+        _search_lexical_index(query, session_id, candidates),
+        top_k
     )
 
-    retriever = index.as_retriever(
-        similarity_top_k=top_k,
-        filters=filters
+
+async def aget_query_embedding(query: str) -> List[float]:
+    """
+    get_query_embedding on the bounded embedding executor.
+    """
+    return await run_in_embedding_executor(get_query_embedding, query)
+
+
+async def aretrieve_similar_chunks(
+    query: str,
+    session_id: str,
+    top_k: int = 5,
+    query_embedding: Optional[List[float]] = None
+):
+    """
+    Event-loop safe variant of retrieve_similar_chunks.
+
+    Query embedding (CPU-bound) runs on the bounded embedding executor;
+    the vector search (blocking I/O) runs on the default thread pool.
+    The lexical leg needs no embedding, so it starts straight away.
+    """
+
+    if not HYBRID_ENABLED:
+        if query_embedding is None:
+            query_embedding = await aget_query_embedding(query)
+        return await asyncio.to_thread(
+            _search_vector_store,
+            query_embedding,
+            session_id,
+            top_k
+        )
+
+    candidates = max(top_k, HYBRID_CANDIDATES)
+
+    lexical_task = asyncio.create_task(
+        asyncio.to_thread(_search_lexical_index, query, session_id, candidates)
     )
 
-    return retriever.retrieve(query)
-    
\ No newline at end of file
+    try:
+        if query_embedding is None:
+            query_embedding = await aget_query_embedding(query)
+        vector_nodes = await asyncio.to_thread(
+            _search_vector_store,
+            query_embedding,
+            session_id,
+            candidates
+        )
+    except BaseException:
+        lexical_task.cancel()
+        raise
+
+    return _fuse(vector_nodes, await lexical_task, top_k)
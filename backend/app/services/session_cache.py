@@ -0,0 +1,140 @@
+import base64
+import hashlib
+import json
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from backend.app.core.config import SESSION_CACHE_ENABLED, SESSION_CACHE_TTL_SECONDS
+from backend.app.core.redis import get_async_redis_client, redis_breaker
+import logging
+
+logger = logging.getLogger(__name__)
+
+REDIS_CACHE_PREFIX = "sessions:cache:"
+REDIS_VERSION_PREFIX = "sessions:version:"
+
+# Version tokens outlive every entry cached under them, so an expired
+# token can never resurrect a page cached before the last invalidation
+VERSION_TTL_SECONDS = SESSION_CACHE_TTL_SECONDS * 2
+
+
+@dataclass
+class CachedPage:
+    body: str
+    etag: str
+    next_cursor: Optional[str]
+
+
+# Loads one page from Supabase: (rows, next cursor)
+PageLoader = Callable[[], Awaitable[Tuple[List[dict], Optional[str]]]]
+
+
+def encode_cursor(*values) -> str:
+    """
+    Opaque keyset cursor: the sort key of the last row of a page.
+    """
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """
+    Raises ValueError for cursors this API did not issue.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise ValueError(f"Malformed cursor: {e}")
+
+    if not isinstance(values, list) or len(values) != size or not all(isinstance(v, str) for v in values):
+        raise ValueError("Malformed cursor")
+    return values
+
+
+def make_etag(body: str, next_cursor: Optional[str]) -> str:
+    digest = hashlib.sha1(f"{body}\n{next_cursor or ''}".encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison, as required for If-None-Match
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def _version_key(scope: str, owner_id: str) -> str:
+    return f"{REDIS_VERSION_PREFIX}{scope}:{owner_id}"
+
+
+async def read_through(scope: str, owner_id: str, params: str, loader: PageLoader) -> CachedPage:
+    """
+    Serve a page from Redis, loading and caching it on a miss.
+
+    Entries are keyed by the owner's current version token, so
+    invalidation is a single SET; superseded entries age out by TTL.
+    Without Redis every call goes to the loader.
+    """
+    redis_client = await get_async_redis_client() if SESSION_CACHE_ENABLED else None
+    cache_key = None
+
+    if redis_client:
+        try:
+            version = await redis_client.get(_version_key(scope, owner_id)) or "0"
+            cache_key = f"{REDIS_CACHE_PREFIX}{scope}:{owner_id}:{version}:{params}"
+
+            cached = await redis_client.get(cache_key)
+            if cached is not None:
+                return CachedPage(**json.loads(cached))
+        except Exception as e:
+            redis_breaker.record_failure(e)
+            logger.error(f"Session cache read failed: {e}")
+            cache_key = None
+
+    rows, next_cursor = await loader()
+    body = json.dumps(rows, separators=(",", ":"))
+    page = CachedPage(body=body, etag=make_etag(body, next_cursor), next_cursor=next_cursor)
+
+    if cache_key is not None:
+        try:
+            await redis_client.set(cache_key, json.dumps(asdict(page)), ex=SESSION_CACHE_TTL_SECONDS)
+        except Exception as e:
+            redis_breaker.record_failure(e)
+            logger.error(f"Session cache write failed: {e}")
+
+    return page
+
+
+async def invalidate(scope: str, *owner_ids: str) -> None:
+    """
+    Drop every cached page of the given owners. Call after the
+    Supabase write has committed.
+    """
+    owner_ids = [owner_id for owner_id in owner_ids if owner_id]
+    if not owner_ids or not SESSION_CACHE_ENABLED:
+        return
+
+    redis_client = await get_async_redis_client()
+    if not redis_client:
+        return
+
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for owner_id in owner_ids:
+                pipe.set(_version_key(scope, owner_id), uuid.uuid4().hex, ex=VERSION_TTL_SECONDS)
+            await pipe.execute()
+    except Exception as e:
+        redis_breaker.record_failure(e)
+        logger.error(f"Session cache invalidation failed: {e}")
+
+
+async def invalidate_user_sessions(*user_ids: str) -> None:
+    await invalidate("user", *user_ids)
+
+
+async def invalidate_session_messages(*session_ids: str) -> None:
+    await invalidate("session", *session_ids)
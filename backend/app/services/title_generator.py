@@ -0,0 +1,314 @@
+import asyncio
+import json
+import re
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from backend.app.core.config import (
+    TITLE_BATCH_SIZE,
+    TITLE_BATCH_WAIT_MS,
+    TITLE_QUEUE_SIZE,
+    TITLE_WORKERS,
+    get_supabase_client,
+    supabase_breaker,
+)
+from backend.app.services.llm import agenerate_answer
+from backend.app.services.session_cache import invalidate_user_sessions
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAX_TITLE_CHARS = 50
+# Characters of the first message shown to the LLM
+MAX_PROMPT_MESSAGE_CHARS = 500
+
+TITLE_PROMPT = """Generate a short, concise title (3-6 words) for a conversation that starts with:
+
+"{message}"
+
+Return ONLY the title, nothing else. No quotes, no punctuation at the end."""
+
+BATCH_TITLE_PROMPT = """Generate a short, concise title (3-6 words) for each of the conversations below, based on their first message.
+
+{messages}
+
+Return ONLY a JSON object mapping each conversation number to its title, e.g. {{"1": "Title one", "2": "Title two"}}. No quotes or punctuation at the end of titles."""
+
+# (prompt, max_tokens) -> completion text
+GenerateFn = Callable[[str, int], Awaitable[str]]
+
+
+class TitleQueueFull(Exception):
+    pass
+
+
+def clean_title(raw: str) -> str:
+    title = raw.strip().strip('"\'').strip()
+    if len(title) > MAX_TITLE_CHARS:
+        title = title[:MAX_TITLE_CHARS - 3] + "..."
+    return title
+
+
+def parse_batch_titles(raw: str, count: int) -> Dict[int, str]:
+    """
+    Titles by 1-based conversation number. Missing or malformed entries
+    are simply absent.
+    """
+    match = re.search(r"\{.*\}", raw, re.DOTALL)
+    if not match:
+        return {}
+
+    try:
+        parsed = json.loads(match.group(0))
+    except ValueError:
+        return {}
+
+    titles = {}
+    for key, value in parsed.items():
+        if str(key).isdigit() and 1 <= int(key) <= count and isinstance(value, str) and value.strip():
+            titles[int(key)] = clean_title(value)
+    return titles
+
+
+def _fetch_first_message(session_id: str) -> Optional[str]:
+    client = get_supabase_client()
+    if not client:
+        raise RuntimeError("Supabase unavailable")
+
+    try:
+        response = (
+            client
+            .table("chat_messages")
+            .select("content")
+            .eq("session_id", session_id)
+            .eq("role", "user")
+            .order("created_at", desc=False)
+            .limit(1)
+            .execute()
+        )
+    except Exception as e:
+        supabase_breaker.record_failure(e)
+        raise
+
+    return response.data[0]["content"] if response.data else None
+
+
+def _save_title(session_id: str, title: str) -> List[str]:
+    """
+    Store the title; returns the owning user ids.
+    """
+    client = get_supabase_client()
+    if not client:
+        raise RuntimeError("Supabase unavailable")
+
+    try:
+        response = client.table("chat_sessions").update({
+            "title": title,
+            "updated_at": datetime.utcnow().isoformat()
+        }).eq("session_id", session_id).execute()
+    except Exception as e:
+        supabase_breaker.record_failure(e)
+        raise
+
+    return list({s["user_id"] for s in response.data or []})
+
+
+class TitleGenerator:
+    """
+    Background session title generation.
+
+    Requests go into a bounded queue and return immediately; repeated
+    requests for a session already queued share one job. Workers drain
+    up to batch_size waiting sessions (lingering batch_wait_ms for more)
+    and title them with a single LLM call. Titles are written to
+    Supabase and reach clients through session listing.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = TITLE_QUEUE_SIZE,
+        workers: int = TITLE_WORKERS,
+        batch_size: int = TITLE_BATCH_SIZE,
+        batch_wait_ms: float = TITLE_BATCH_WAIT_MS,
+        generate_fn: Optional[GenerateFn] = None
+    ):
+        self.queue_size = queue_size
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_wait_ms = batch_wait_ms
+        self._generate_fn = generate_fn or agenerate_answer
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        # session_id -> first message (None = look it up)
+        self._pending: Dict[str, Optional[str]] = {}
+
+        self.generated = 0
+        self.llm_calls = 0
+        self.failed = 0
+        self.deduplicated = 0
+
+    # ------------------------------------------------------------------
+    # Request path
+    # ------------------------------------------------------------------
+
+    def submit(self, session_id: str, first_message: Optional[str] = None) -> bool:
+        """
+        Queue a session for titling. Returns False if it was already
+        queued. Raises TitleQueueFull when the queue is at capacity.
+        """
+        if self._queue is None:
+            self.start()
+
+        if session_id in self._pending:
+            self.deduplicated += 1
+            if first_message and not self._pending[session_id]:
+                self._pending[session_id] = first_message
+            return False
+
+        try:
+            self._queue.put_nowait(session_id)
+        except asyncio.QueueFull:
+            raise TitleQueueFull(f"{self.queue_size} sessions already waiting for a title")
+
+        self._pending[session_id] = first_message
+        return True
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    async def _next_batch(self) -> List[str]:
+        batch = [await self._queue.get()]
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_wait_ms / 1000
+        while len(batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _generate_titles(self, messages: List[str]) -> List[Optional[str]]:
+        messages = [m[:MAX_PROMPT_MESSAGE_CHARS] for m in messages]
+
+        if len(messages) == 1:
+            self.llm_calls += 1
+            return [clean_title(await self._generate_fn(TITLE_PROMPT.format(message=messages[0]), 100))]
+
+        numbered = "\n".join(
+            f'{i}. "{m}"' for i, m in enumerate(messages, start=1)
+        )
+        self.llm_calls += 1
+        raw = await self._generate_fn(
+            BATCH_TITLE_PROMPT.format(messages=numbered),
+            30 * len(messages) + 50,
+        )
+        titles = parse_batch_titles(raw, len(messages))
+
+        results = []
+        for i, message in enumerate(messages, start=1):
+            if i not in titles:
+                # The model skipped or garbled this one; title it alone
+                logger.warning(f"Batch title missing | index={i} | batch={len(messages)}")
+                try:
+                    titles[i] = (await self._generate_titles([message]))[0]
+                except Exception as e:
+                    logger.error(f"Title fallback failed | index={i} | {e}")
+                    titles[i] = None
+            results.append(titles[i] or None)
+        return results
+
+    async def _process(self, session_ids: List[str]) -> None:
+        """
+        Title a batch. Fetch and save errors only fail their own session;
+        the rest of the batch is still titled and saved.
+        """
+        jobs = []
+        for session_id in session_ids:
+            message = self._pending.get(session_id)
+            if not message:
+                try:
+                    message = await asyncio.to_thread(_fetch_first_message, session_id)
+                except Exception as e:
+                    self.failed += 1
+                    logger.error(f"Title message fetch failed | session_id={session_id} | {e}")
+                    continue
+            if message:
+                jobs.append((session_id, message))
+            else:
+                logger.warning(f"No messages to title | session_id={session_id}")
+
+        if not jobs:
+            return
+
+        try:
+            titles = await self._generate_titles([message for _, message in jobs])
+        except Exception as e:
+            self.failed += len(jobs)
+            logger.error(f"Title generation failed | sessions={len(jobs)} | {e}")
+            return
+
+        for (session_id, _), title in zip(jobs, titles):
+            if not title:
+                self.failed += 1
+                continue
+            try:
+                user_ids = await asyncio.to_thread(_save_title, session_id, title)
+                await invalidate_user_sessions(*user_ids)
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Title save failed | session_id={session_id} | {e}")
+                continue
+            self.generated += 1
+            logger.info(f"Title generated | session_id={session_id} | title={title}")
+
+    async def _worker(self) -> None:
+        while True:
+            session_ids = await self._next_batch()
+            try:
+                await self._process(session_ids)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += len(session_ids)
+                logger.error(f"Title generation failed | sessions={len(session_ids)} | {e}")
+            finally:
+                for session_id in session_ids:
+                    self._pending.pop(session_id, None)
+
+    def start(self) -> None:
+        """
+        Start the workers (called from the FastAPI lifespan).
+        """
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        if self._pending:
+            logger.warning(f"Title generation stopped | dropped={len(self._pending)}")
+        self._tasks = []
+        self._queue = None
+        self._pending.clear()
+
+    def stats(self) -> Dict:
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "in_flight": len(self._pending),
+            "generated": self.generated,
+            "llm_calls": self.llm_calls,
+            "failed": self.failed,
+            "deduplicated": self.deduplicated,
+        }
+
+
+title_generator = TitleGenerator()
@@ -1,36 +1,449 @@
-from typing import List
+import queue
+import re
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, TypeVar
 
-from llama_index.core.schema import TextNode
+from llama_index.core.schema import NodeWithScore, TextNode
+from llama_index.core.vector_stores import ExactMatchFilter, MetadataFilters, VectorStoreQuery
 from llama_index.vector_stores.milvus import MilvusVectorStore
 from llama_index.core import StorageContext
 
+from backend.app.core.config import (
+    MILVUS_COLLECTION,
+    MILVUS_DIM,
+    MILVUS_INSERT_TIMEOUT_SECONDS,
+    MILVUS_POOL_SIZE,
+    MILVUS_TIMEOUT_SECONDS,
+    MILVUS_URI,
+    VECTOR_STORE_BACKEND,
+    VECTOR_STORE_PATH,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Ids interpolated into Milvus filter expressions (uuids, content hashes)
+_SAFE_ID = re.compile(r"^[A-Za-z0-9_.:-]+$")
+
+
+def _filter_id(value: str) -> str:
+    """
+    Validate an id before it goes inside a quoted Milvus filter
+    expression, refusing anything that could escape the literal.
+    """
+    if not _SAFE_ID.match(value):
+        raise ValueError(f"Unsupported id in vector filter: {value!r}")
+    return value
+
 
 def get_vector_store(
-    collection_name: str = "documind_documents",
-    dim: int = 768
+    collection_name: str = MILVUS_COLLECTION,
+    dim: int = MILVUS_DIM,
+    overwrite: bool = False
 ) -> MilvusVectorStore:
     """
-    Initialize Milvus vector store.
+    Open a new Milvus vector store connection.
+    Request paths should borrow one from vector_store_pool instead.
     """
 
     vector_store = MilvusVectorStore(
-        uri="tcp://localhost:19530",   # REQUIRED
+        uri=MILVUS_URI,
         collection_name=collection_name,
         dim=dim,
-        overwrite=False  # do NOT delete existing collections
+        overwrite=overwrite,  # never set for the live collection
+        timeout=MILVUS_TIMEOUT_SECONDS,  # connect timeout
     )
 
     return vector_store
 
 
+def _close_store(vector_store: MilvusVectorStore) -> None:
+    try:
+        vector_store.client.close()
+    except Exception as e:
+        logger.warning(f"Milvus client close failed: {e}")
+
+
+class _CallTimedOut(TimeoutError):
+    """
+    A pooled call exceeded its deadline; `future` is still running on
+    the connection it was given.
+    """
+
+    def __init__(self, message: str, future: Future):
+        super().__init__(message)
+        self.future = future
+
+
+class VectorStorePool:
+    """
+    Fixed-size pool of long-lived Milvus connections.
+
+    Connections are created lazily up to `size`. A connection whose call
+    fails or times out is discarded and replaced on the next checkout,
+    which is how the pool reconnects after a Milvus restart. A timed-out
+    call keeps running in the background; its connection is closed only
+    once it returns, and its executor is retired so later calls don't
+    queue behind it.
+    """
+
+    def __init__(
+        self,
+        size: int = MILVUS_POOL_SIZE,
+        timeout_seconds: float = MILVUS_TIMEOUT_SECONDS,
+        factory: Callable[[], MilvusVectorStore] = get_vector_store
+    ):
+        self.size = size
+        self.timeout_seconds = timeout_seconds
+        self._factory = factory
+
+        self._idle: "queue.Queue[MilvusVectorStore]" = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+
+    def open(self) -> None:
+        """
+        Eagerly create all connections (called from the FastAPI lifespan).
+        """
+        self._closed = False
+        with self._lock:
+            missing = self.size - self._created
+            self._created += missing
+
+        for _ in range(missing):
+            try:
+                self._idle.put(self._factory())
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        logger.info(f"Milvus pool ready | uri={MILVUS_URI} | size={self.size}")
+
+    def _acquire(self) -> MilvusVectorStore:
+        if self._closed:
+            raise RuntimeError("Vector store pool is closed")
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+
+        if can_create:
+            try:
+                return self._factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout_seconds)
+        except queue.Empty:
+            raise TimeoutError("Timed out waiting for a Milvus connection")
+
+    def _discard(self, vector_store: MilvusVectorStore, pending: Optional[Future] = None) -> None:
+        with self._lock:
+            self._created -= 1
+
+        if pending is not None and not pending.done():
+            # Still in use by a hung call: close it when that call returns
+            pending.add_done_callback(lambda _: _close_store(vector_store))
+        else:
+            _close_store(vector_store)
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection. It is discarded if the block raises.
+        """
+        vector_store = self._acquire()
+        try:
+            yield vector_store
+        except Exception as e:
+            self._discard(vector_store, pending=getattr(e, "future", None))
+            raise
+        else:
+            if self._closed:
+                self._discard(vector_store)
+            else:
+                self._idle.put(vector_store)
+
+    def _submit(self, fn: Callable[[], T]):
+        while True:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.size,
+                        thread_name_prefix="milvus",
+                    )
+                executor = self._executor
+
+            try:
+                return executor, executor.submit(fn)
+            except RuntimeError:
+                # Retired by a concurrent timeout (or the pool closed)
+                if self._closed:
+                    raise
+                with self._lock:
+                    if self._executor is executor:
+                        self._executor = None
+
+    def _call_with_timeout(self, fn: Callable[[], T], timeout_seconds: float) -> T:
+        executor, future = self._submit(fn)
+        try:
+            return future.result(timeout=timeout_seconds)
+        except FutureTimeoutError:
+            # The hung thread keeps its worker slot: give later calls a
+            # fresh executor. The old one finishes what it has and exits.
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False)
+            raise _CallTimedOut(f"Milvus call exceeded {timeout_seconds}s", future)
+
+    def run(
+        self,
+        fn: Callable[[MilvusVectorStore], T],
+        retries: int = 1,
+        timeout_seconds: Optional[float] = None
+    ) -> T:
+        """
+        Run fn(vector_store) on a pooled connection with a per-call timeout,
+        retrying on a fresh connection if the call fails.
+        """
+        timeout_seconds = timeout_seconds or self.timeout_seconds
+
+        attempt = 0
+        while True:
+            try:
+                with self.connection() as vector_store:
+                    return self._call_with_timeout(
+                        lambda: fn(vector_store), timeout_seconds
+                    )
+            except Exception as e:
+                if attempt >= retries or self._closed:
+                    raise
+                attempt += 1
+                logger.warning(f"Milvus call failed, reconnecting | attempt={attempt} | {e}")
+
+    def close(self) -> None:
+        self._closed = True
+
+        while True:
+            try:
+                vector_store = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(vector_store)
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+        logger.info("Milvus pool closed")
+
+
+vector_store_pool = VectorStorePool()
+
+
+class VectorStoreBackend(ABC):
+    """
+    Vector storage used by ingestion and retrieval, selected by
+    VECTOR_STORE_BACKEND. Node ids are the primary key; every node
+    carries document_id and session_id metadata.
+    """
+
+    name = "base"
+
+    def open(self) -> None:
+        """
+        Connect / load eagerly (called from the FastAPI lifespan).
+        """
+
+    def close(self) -> None:
+        pass
+
+    @abstractmethod
+    def add(self, nodes: List[TextNode]) -> None:
+        ...
+
+    @abstractmethod
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        filters: Optional[Dict[str, str]] = None
+    ) -> List[NodeWithScore]:
+        """
+        Most similar nodes first; filters are exact metadata matches.
+        """
+
+    @abstractmethod
+    def delete_nodes(self, node_ids: List[str]) -> None:
+        ...
+
+    @abstractmethod
+    def delete_document(self, document_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def delete_legacy_document(self, document_id: str) -> None:
+        """
+        Remove a document's vectors that predate content-addressed node ids
+        (random ids, not prefixed with "<document_id>:").
+        """
+
+    @abstractmethod
+    def delete_session(self, session_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def count(self) -> int:
+        ...
+
+    def stats(self) -> Dict:
+        return {"backend": self.name}
+
+
+class MilvusVectorBackend(VectorStoreBackend):
+    """
+    Milvus through pooled LlamaIndex MilvusVectorStore connections.
+    """
+
+    name = "milvus"
+
+    def __init__(self, pool: VectorStorePool = vector_store_pool):
+        self.pool = pool
+
+    def open(self) -> None:
+        self.pool.open()
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def _write(self, fn: Callable[[MilvusVectorStore], T]) -> T:
+        # No automatic retry: a timed-out write may still have landed
+        return self.pool.run(fn, retries=0, timeout_seconds=MILVUS_INSERT_TIMEOUT_SECONDS)
+
+    def add(self, nodes: List[TextNode]) -> None:
+        self._write(lambda store: store.add(nodes))
+
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        filters: Optional[Dict[str, str]] = None
+    ) -> List[NodeWithScore]:
+        query = VectorStoreQuery(
+            query_embedding=query_embedding,
+            similarity_top_k=top_k,
+            filters=MetadataFilters(
+                filters=[ExactMatchFilter(key=key, value=_filter_id(value)) for key, value in filters.items()]
+            ) if filters else None,
+        )
+
+        result = self.pool.run(lambda store: store.query(query))
+
+        return [
+            NodeWithScore(node=node, score=score)
+            for node, score in zip(result.nodes or [], result.similarities or [])
+        ]
+
+    def delete_nodes(self, node_ids: List[str]) -> None:
+        def _delete(store: MilvusVectorStore):
+            # Stay well below Milvus' expression size limits
+            for start in range(0, len(node_ids), 1000):
+                store.client.delete(
+                    collection_name=store.collection_name,
+                    ids=node_ids[start:start + 1000],
+                )
+
+        self._write(_delete)
+
+    def delete_document(self, document_id: str) -> None:
+        # Matched on ref_doc_id
+        self._write(lambda store: store.delete(_filter_id(document_id)))
+
+    def delete_legacy_document(self, document_id: str) -> None:
+        self._write(lambda store: store.client.delete(
+            collection_name=store.collection_name,
+            filter=(
+                f'{store.doc_id_field} == "{_filter_id(document_id)}" '
+                f'and not (id like "{_filter_id(document_id)}:%")'
+            ),
+        ))
+
+    def delete_session(self, session_id: str) -> None:
+        self._write(lambda store: store.client.delete(
+            collection_name=store.collection_name,
+            filter=f'session_id == "{_filter_id(session_id)}"',
+        ))
+
+    def count(self) -> int:
+        rows = self.pool.run(lambda store: store.client.query(
+            collection_name=store.collection_name,
+            filter="",
+            output_fields=["count(*)"],
+        ))
+        return rows[0]["count(*)"]
+
+    def stats(self) -> Dict:
+        return {
+            "backend": self.name,
+            "uri": MILVUS_URI,
+            "collection": MILVUS_COLLECTION,
+            "pool_size": self.pool.size,
+        }
+
+
+_vector_backend: Optional[VectorStoreBackend] = None
+
+
+def get_vector_backend() -> VectorStoreBackend:
+    """
+    Lazily create the process-wide backend named by VECTOR_STORE_BACKEND.
+    """
+    global _vector_backend
+
+    if _vector_backend is None:
+        if VECTOR_STORE_BACKEND == "milvus":
+            _vector_backend = MilvusVectorBackend()
+        elif VECTOR_STORE_BACKEND == "local":
+            # Only imported when selected
+            from backend.app.services.local_vector_store import LocalVectorStore
+
+            _vector_backend = LocalVectorStore(VECTOR_STORE_PATH, MILVUS_DIM)
+        else:
+            raise ValueError(f"Unknown VECTOR_STORE_BACKEND: {VECTOR_STORE_BACKEND}")
+    return _vector_backend
+
+
 def store_embeddings(
     nodes: List[TextNode],
-    vector_store: MilvusVectorStore
+    vector_store: Optional[MilvusVectorStore] = None
 ):
     """
-    Persist embedded nodes into Milvus.
+    Persist embedded nodes in the configured backend, or directly in an
+    explicitly given Milvus vector store.
     """
 
+    if vector_store is None:
+        get_vector_backend().add(nodes)
+        return None
+
     storage_context = StorageContext.from_defaults(
         vector_store=vector_store
     )
@@ -38,3 +451,35 @@ def store_embeddings(
     vector_store.add(nodes)
 
     return storage_context
+
+
+def delete_document_vectors(document_id: str) -> None:
+    """
+    Remove every vector of a document.
+    """
+    get_vector_backend().delete_document(document_id)
+
+
+def delete_vectors(node_ids: List[str]) -> None:
+    """
+    Remove vectors by node id.
+    """
+    node_ids = list(node_ids)
+    if not node_ids:
+        return
+
+    get_vector_backend().delete_nodes(node_ids)
+
+
+def delete_legacy_document_vectors(document_id: str) -> None:
+    """
+    Remove a document's vectors that predate content-addressed node ids.
+    """
+    get_vector_backend().delete_legacy_document(document_id)
+
+
+def delete_session_vectors(session_id: str) -> None:
+    """
+    Remove every vector of a session.
+    """
+    get_vector_backend().delete_session(session_id)
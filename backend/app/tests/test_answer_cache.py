@@ -0,0 +1,75 @@
+import asyncio
+import os
+
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from backend.app.api import chat
+from backend.app.services import answer_cache
+from backend.app.services.answer_cache import AnswerCache
+
+QUERY = [1.0, 0.0, 0.0, 0.0]
+
+
+def test_repeated_question_in_a_session_is_a_hit(tmp_path, monkeypatch):
+    cache = AnswerCache(tmp_path / "answers.sqlite3")
+    history = []
+    llm_calls = []
+
+    async def append_message(session_id, role, content, **kwargs):
+        history.append({"role": role, "content": content})
+
+    async def get_messages(session_id):
+        return list(history)
+
+    async def store_message(**kwargs):
+        pass
+
+    async def embed(query):
+        return QUERY
+
+    async def build_prompt(payload, session_messages, query_embedding, headers):
+        return "prompt"
+
+    async def llm(prompt):
+        llm_calls.append(prompt)
+        yield "Five years."
+
+    monkeypatch.setattr(chat, "append_session_message", append_message)
+    monkeypatch.setattr(chat, "get_session_messages", get_messages)
+    monkeypatch.setattr(chat, "store_chat_message", store_message)
+    monkeypatch.setattr(chat, "aget_query_embedding", embed)
+    monkeypatch.setattr(chat, "_build_prompt", build_prompt)
+    monkeypatch.setattr(chat, "stream_llm_response", llm)
+    monkeypatch.setattr(chat, "get_answer_cache", lambda: cache)
+
+    async def turn():
+        response = await chat.chat_stream(
+            chat.ChatRequest(user_id="u", session_id="s", query="How long is the lease?")
+        )
+        body = "".join([token async for token in response.body_iterator])
+        return response.headers["X-Answer-Cache"], body
+
+    assert asyncio.run(turn()) == ("miss", "Five years.")
+    assert asyncio.run(turn()) == ("hit", "Five years.")
+    assert len(llm_calls) == 1
+
+
+def test_empty_answers_are_not_stored(tmp_path):
+    cache = AnswerCache(tmp_path / "answers.sqlite3")
+    cache.store("s", 0, "q", QUERY, "  \n")
+
+    assert cache.lookup("s", QUERY)[0] is None
+
+
+def test_global_cap_drops_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(answer_cache, "PRUNE_EVERY_STORES", 1)
+    cache = AnswerCache(tmp_path / "answers.sqlite3", max_entries=2)
+
+    cache.store("a", 0, "q", QUERY, "answer a")
+    cache.store("b", 0, "q", QUERY, "answer b")
+    assert cache.lookup("a", QUERY)[0] == "answer a"  # now more recent than b
+    cache.store("c", 0, "q", QUERY, "answer c")
+
+    assert cache.lookup("a", QUERY)[0] == "answer a"
+    assert cache.lookup("b", QUERY)[0] is None
+    assert cache.lookup("c", QUERY)[0] == "answer c"
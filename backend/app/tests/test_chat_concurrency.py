@@ -0,0 +1,85 @@
+import asyncio
+import os
+import time
+
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from backend.app.api import chat
+from backend.app.services import retriever
+
+EMBED_SECONDS = 0.3
+CONCURRENT_STREAMS = 4
+
+
+def _blocking_query_embedding(query, model_name=None):
+    time.sleep(EMBED_SECONDS)  # stands in for CPU-bound model inference
+    return [0.0] * 8
+
+
+async def _noop(*args, **kwargs):
+    return None
+
+
+async def _no_messages(session_id):
+    return []
+
+
+async def _fake_llm(prompt):
+    for token in ("hello", " ", "world"):
+        await asyncio.sleep(0)
+        yield token
+
+
+async def _consume(session_id: str) -> str:
+    response = await chat.chat_stream(
+        chat.ChatRequest(user_id="u", session_id=session_id, query="What is DocuMind?")
+    )
+    return "".join([token async for token in response.body_iterator])
+
+
+async def _run_streams_with_heartbeat():
+    gaps = []
+    done = asyncio.Event()
+
+    async def heartbeat():
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    beat = asyncio.create_task(heartbeat())
+
+    start_time = time.perf_counter()
+    answers = await asyncio.gather(
+        *(_consume(f"session-{i}") for i in range(CONCURRENT_STREAMS))
+    )
+    elapsed = time.perf_counter() - start_time
+
+    done.set()
+    await beat
+
+    return answers, elapsed, max(gaps)
+
+
+def test_concurrent_streams_do_not_serialize(monkeypatch):
+    monkeypatch.setattr(retriever, "get_query_embedding", _blocking_query_embedding)
+    monkeypatch.setattr(retriever, "_search_vector_store", lambda *args: [])
+    monkeypatch.setattr(retriever, "_search_lexical_index", lambda *args: [])
+    monkeypatch.setattr(chat, "append_session_message", _noop)
+    monkeypatch.setattr(chat, "store_chat_message", _noop)
+    monkeypatch.setattr(chat, "get_session_messages", _no_messages)
+    monkeypatch.setattr(chat, "get_answer_cache", lambda: None)
+    monkeypatch.setattr(chat, "stream_llm_response", _fake_llm)
+    monkeypatch.setattr(chat, "assemble_context", lambda **kwargs: "prompt")
+
+    answers, elapsed, max_gap = asyncio.run(_run_streams_with_heartbeat())
+
+    assert answers == ["hello world"] * CONCURRENT_STREAMS
+
+    # The event loop keeps ticking while embeddings run...
+    assert max_gap < EMBED_SECONDS / 2
+
+    # ...and streams overlap instead of running back to back.
+    assert elapsed < EMBED_SECONDS * CONCURRENT_STREAMS * 0.75
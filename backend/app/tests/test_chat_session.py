@@ -0,0 +1,27 @@
+from backend.app.services.chat_session import decode_message, encode_message
+
+
+def test_binary_message_round_trip():
+    payload = encode_message("assistant", "Clause 4.2: notice period", 1700000000.5, token_count=12)
+
+    assert decode_message(payload) == {
+        "role": "assistant",
+        "content": "Clause 4.2: notice period",
+        "timestamp": 1700000000.5,
+        "token_count": 12,
+    }
+
+
+def test_custom_roles_keep_their_name():
+    payload = encode_message("tool", "ok", 0.0)
+
+    assert decode_message(payload)["role"] == "tool"
+
+
+def test_legacy_string_entries_still_decode():
+    assert decode_message(b"user:a:b") == {
+        "role": "user",
+        "content": "a:b",
+        "timestamp": None,
+        "token_count": 0,
+    }
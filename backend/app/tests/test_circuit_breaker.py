@@ -0,0 +1,40 @@
+from backend.app.core import circuit_breaker
+from backend.app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def test_breaker_opens_and_fails_fast(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker("supabase", failure_threshold=3, base_open_seconds=1)
+
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure(ConnectionError("refused"))
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+
+
+def test_failed_probe_doubles_open_interval(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker("redis", failure_threshold=1, base_open_seconds=1, max_open_seconds=3)
+    breaker.record_failure()
+
+    now[0] += 1
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow()  # only one probe at a time
+    breaker.record_failure()
+    assert breaker.status()["next_probe_in_seconds"] == 2
+
+    now[0] += 2
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.status()["next_probe_in_seconds"] == 3  # capped
+
+    now[0] += 3
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
@@ -0,0 +1,137 @@
+import os
+
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+import pytest
+from llama_index.core.schema import NodeWithScore, TextNode
+
+from backend.app.services import context_assembler
+from backend.app.services.context_assembler import (
+    assemble_context,
+    build_passages,
+    count_tokens,
+    merge_overlapping,
+)
+
+OVERLAP = "the splitter repeats this sentence at the start of the next chunk."
+
+
+def _words(prefix, n):
+    return " ".join(f"{prefix}{i}" for i in range(n))
+
+
+def _node(document_id, chunk_index, text):
+    return NodeWithScore(
+        node=TextNode(
+            id_=f"{document_id}:{chunk_index}",
+            text=text,
+            metadata={"document_id": document_id, "chunk_index": chunk_index},
+        ),
+        score=1.0,
+    )
+
+
+@pytest.fixture
+def word_tokenizer(monkeypatch):
+    tokenizer = lambda text: text.split()
+    monkeypatch.setattr(context_assembler, "get_tokenizer", lambda: tokenizer)
+    return tokenizer
+
+
+def test_merge_overlapping_drops_repeated_text():
+    merged = merge_overlapping(f"first part. {OVERLAP}", f"{OVERLAP} second part.")
+
+    assert merged == f"first part. {OVERLAP} second part."
+
+
+def test_merge_overlapping_without_overlap_joins_on_newline():
+    assert merge_overlapping("first part.", "second part.") == "first part.\nsecond part."
+
+
+def test_adjacent_chunks_merge_in_reading_order():
+    passages, duplicates = build_passages([
+        _node("doc-a", 4, f"{OVERLAP} chunk four."),
+        _node("doc-b", 0, "unrelated passage about invoices."),
+        _node("doc-a", 3, f"chunk three. {OVERLAP}"),
+        _node("doc-a", 9, "a far away chunk about shipping."),
+    ])
+
+    assert duplicates == 0
+    assert [(p.document_id, p.first_chunk, p.last_chunk, p.rank) for p in passages] == [
+        ("doc-a", 3, 4, 0),
+        ("doc-b", 0, 0, 1),
+        ("doc-a", 9, 9, 3),
+    ]
+    assert passages[0].chunks == 2
+    assert passages[0].text == f"chunk three. {OVERLAP} chunk four."
+
+
+def test_same_chunk_retrieved_twice_is_not_repeated():
+    passages, _ = build_passages([
+        _node("doc-a", 2, "only once please."),
+        _node("doc-a", 2, "only once please."),
+    ])
+
+    assert len(passages) == 1
+    assert passages[0].text == "only once please."
+    assert passages[0].chunks == 1
+
+
+def test_near_duplicates_across_documents_are_dropped():
+    text = _words("w", 30)
+    passages, duplicates = build_passages([
+        _node("doc-a", 0, text),
+        _node("doc-b", 5, text + " trailing words"),
+        _node("doc-c", 1, _words("x", 30)),
+    ])
+
+    assert duplicates == 1
+    assert [p.document_id for p in passages] == ["doc-a", "doc-c"]
+
+
+def test_contained_chunk_counts_as_duplicate():
+    long_text = _words("w", 60)
+    contained = _words("w", 20)
+
+    passages, duplicates = build_passages([
+        _node("doc-a", 0, long_text),
+        _node("doc-b", 0, contained),
+    ])
+
+    assert duplicates == 1
+    assert len(passages) == 1
+
+
+def test_evidence_is_packed_before_history(word_tokenizer):
+    nodes = [_node("doc-a", 0, _words("a", 50)), _node("doc-b", 0, _words("b", 50))]
+    messages = [{"role": "user", "content": _words("m", 40)} for _ in range(2)]
+    overhead = count_tokens(assemble_context("q", [], []), word_tokenizer)
+
+    # Room for both passages but not for the history
+    prompt = assemble_context("q", nodes, messages, token_budget=overhead + 115)
+
+    assert "[Source 1]" in prompt and "[Source 2]" in prompt
+    assert "m0" not in prompt
+    assert count_tokens(prompt, word_tokenizer) <= overhead + 115
+
+
+def test_last_passage_is_truncated_to_fit(word_tokenizer):
+    nodes = [_node("doc-a", 0, _words("a", 100)), _node("doc-b", 0, _words("b", 200))]
+    overhead = count_tokens(assemble_context("q", [], []), word_tokenizer)
+
+    prompt = assemble_context("q", nodes, [], token_budget=overhead + 200)
+
+    assert "a99" in prompt
+    assert "[Source 2]" in prompt and "b0" in prompt
+    assert "b199" not in prompt
+    assert count_tokens(prompt, word_tokenizer) <= overhead + 200
+
+
+def test_passage_dropped_when_too_little_budget_remains(word_tokenizer):
+    nodes = [_node("doc-a", 0, _words("a", 100)), _node("doc-b", 0, _words("b", 200))]
+    overhead = count_tokens(assemble_context("q", [], []), word_tokenizer)
+
+    prompt = assemble_context("q", nodes, [], token_budget=overhead + 110)
+
+    assert "a99" in prompt
+    assert "[Source 2]" not in prompt
@@ -0,0 +1,54 @@
+from backend.app.services.embedding_cache import EmbeddingCache
+
+
+def test_hits_after_put_and_whitespace_normalization(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3", max_entries=10)
+
+    cache.put_many("model-a", ["hello   world"], [[0.5, 1.0, 1.5]])
+
+    hits = cache.get_many("model-a", ["hello world", "unseen"])
+
+    assert list(hits) == [0]
+    assert hits[0] == [0.5, 1.0, 1.5]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_are_scoped_by_model(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3", max_entries=10)
+
+    cache.put_many("model-a", ["text"], [[1.0]])
+
+    assert cache.get_many("model-b", ["text"]) == {}
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3", max_entries=3)
+
+    cache.put_many("m", ["a", "b", "c"], [[1.0], [2.0], [3.0]])
+    cache.get_many("m", ["a"])  # refresh "a"
+    cache.put_many("m", ["d"], [[4.0]])
+
+    remaining = cache.get_many("m", ["a", "b", "c", "d"])
+
+    assert 0 in remaining and 3 in remaining
+    assert 1 not in remaining
+    assert cache.stats()["entries"] <= 3
+
+
+def test_count_query_skipped_below_bound(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3", max_entries=3)
+    counts = []
+    original = cache._count
+    cache._count = lambda: counts.append(1) or original()
+
+    cache.put_many("m", ["a"], [[1.0]])
+    cache.put_many("m", ["a"], [[1.0]])  # replace counts as new
+    assert counts == []
+
+    cache.put_many("m", ["a", "b"], [[1.0], [2.0]])
+    assert counts == [1]  # real count is 2: nothing evicted, bound resynced
+
+    cache.put_many("m", ["c"], [[3.0]])
+    assert counts == [1]
+    assert cache.evictions == 0
@@ -0,0 +1,75 @@
+import os
+
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from llama_index.core.schema import NodeWithScore, TextNode
+
+from backend.app.services.lexical_index import LexicalIndex, build_match_query
+from backend.app.services.retriever import reciprocal_rank_fusion
+
+
+def _node(node_id, text, session_id="s1"):
+    return TextNode(
+        id_=node_id,
+        text=text,
+        metadata={"document_id": node_id.split(":")[0], "session_id": session_id},
+    )
+
+
+def _ranked(*node_ids):
+    return [NodeWithScore(node=_node(node_id, node_id), score=1.0) for node_id in node_ids]
+
+
+def test_match_query_quotes_identifiers():
+    assert build_match_query('ERR-1042 in "4.2.1" ?') == '"ERR-1042" OR "in" OR "4.2.1"'
+    assert build_match_query("?? !!") is None
+
+
+def test_bm25_search_stays_within_the_session(tmp_path):
+    index = LexicalIndex(tmp_path)
+    index.add_nodes([
+        _node("manual:0", "Error ERR-1042 means the pump lost prime."),
+        _node("manual:1", "Routine maintenance of the pump every month."),
+        _node("other:0", "ERR-1042 ERR-1042 in someone else's notes.", session_id="s2"),
+    ])
+
+    hits = index.search("what does ERR-1042 mean", "s1", top_k=5)
+
+    assert [hit["node_id"] for hit in hits][0] == "manual:0"
+    assert {hit["metadata"]["session_id"] for hit in hits} == {"s1"}
+    assert hits[0]["score"] > 0
+    assert index.search("ERR-1042", "never-ingested", top_k=5) == []
+
+
+def test_readding_and_deleting_chunks_keeps_fts_in_sync(tmp_path):
+    index = LexicalIndex(tmp_path)
+    index.add_nodes([_node("doc:0", "invoice terms net thirty")])
+    index.add_nodes([_node("doc:0", "invoice terms net sixty")])
+
+    assert [hit["text"] for hit in index.search("invoice", "s1", top_k=5)] == ["invoice terms net sixty"]
+    assert index.search("thirty", "s1", top_k=5) == []
+
+    index.delete_nodes("s1", ["doc:0"])
+    assert index.search("invoice", "s1", top_k=5) == []
+
+
+def test_rrf_rewards_agreement_between_lists():
+    vector = _ranked("a", "b", "c")
+    lexical = _ranked("c", "d")
+
+    fused = reciprocal_rank_fusion([(1.0, vector), (1.0, lexical)], top_k=3, k=60)
+
+    # c is 3rd and 1st: 1/63 + 1/61 beats a's single 1/61
+    assert [item.node.node_id for item in fused] == ["c", "a", "b"]
+    assert fused[0].score == 1 / 63 + 1 / 61
+    # The node object comes from the first list that returned it
+    assert fused[0].node is vector[2].node
+
+
+def test_rrf_weights_shift_the_ranking():
+    vector = _ranked("a")
+    lexical = _ranked("b")
+
+    fused = reciprocal_rank_fusion([(1.0, vector), (2.0, lexical)], top_k=2, k=60)
+
+    assert [item.node.node_id for item in fused] == ["b", "a"]
@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from backend.app.services import job_queue
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_queue, "INGESTION_QUEUE_PATH", tmp_path / "jobs.sqlite3")
+    monkeypatch.setattr(job_queue, "_conn", None)
+    monkeypatch.setattr(job_queue, "retry_delay_seconds", lambda attempts: 0)
+    return job_queue
+
+
+def _expire_lease(queue, document_id):
+    queue._get_conn().execute(
+        "UPDATE ingestion_jobs SET heartbeat_at = ? WHERE document_id = ?",
+        (time.time() - 600, document_id),
+    )
+
+
+def test_expired_lease_is_reclaimed_and_stale_worker_is_fenced(queue):
+    queue.enqueue_ingestion_job("doc", "s", "/tmp/doc.pdf", "doc.pdf")
+    assert queue.claim_next_job("w1")["attempts"] == 1
+
+    # A live heartbeat keeps the lease
+    assert queue.heartbeat_job("doc", "w1")
+    assert queue.requeue_stale_jobs(timeout_seconds=300) == 0
+
+    _expire_lease(queue, "doc")
+    assert queue.requeue_stale_jobs(timeout_seconds=300) == 1
+    assert queue.get_job("doc")["status"] == queue.JOB_QUEUED
+
+    reclaimed = queue.claim_next_job("w2")
+    assert reclaimed["attempts"] == 2
+
+    # The first worker learns it lost the job, and can't touch it any more
+    assert not queue.heartbeat_job("doc", "w1")
+    assert not queue.update_job_status("doc", "w1", queue.JOB_EMBEDDING)
+    assert not queue.complete_job("doc", "w1", {"chunks_total": 1})
+    assert queue.fail_job("doc", "w1", "boom") is None
+
+    assert queue.complete_job("doc", "w2", {"chunks_total": 3})
+    job = queue.get_job("doc")
+    assert job["status"] == queue.JOB_STORED
+    assert job["result"] == {"chunks_total": 3}
+
+
+def test_expired_lease_out_of_attempts_fails_the_job(queue):
+    queue.enqueue_ingestion_job("doc", "s", "/tmp/doc.pdf", "doc.pdf", max_attempts=1)
+    queue.claim_next_job("w1")
+
+    _expire_lease(queue, "doc")
+    queue.requeue_stale_jobs(timeout_seconds=300)
+
+    job = queue.get_job("doc")
+    assert job["status"] == queue.JOB_FAILED
+    assert job["error"] == "Worker timed out"
+    assert queue.claim_next_job("w2") is None
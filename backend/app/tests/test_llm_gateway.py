@@ -0,0 +1,49 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import openai
+
+from backend.app.services.llm_gateway import LLMGateway
+
+
+class _FakeCompletions:
+    def __init__(self, delays, failures=0):
+        self.delays = list(delays)
+        self.failures = failures
+        self.calls = 0
+
+    async def create(self, **params):
+        self.calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise openai.APIConnectionError(request=httpx.Request("POST", "http://llm.test"))
+
+        delay = self.delays.pop(0)
+        await asyncio.sleep(delay)
+        message = SimpleNamespace(content=f"answer after {delay}s")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _gateway(completions, **options) -> LLMGateway:
+    gateway = LLMGateway(api_key="test-key", retry_base_seconds=0.001, **options)
+    gateway._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return gateway
+
+
+def test_transient_errors_are_retried():
+    completions = _FakeCompletions(delays=[0], failures=2)
+    gateway = _gateway(completions, max_retries=3)
+
+    assert asyncio.run(gateway.complete("hi")) == "answer after 0s"
+    assert completions.calls == 3
+    assert gateway.retries == 2
+
+
+def test_slow_request_is_hedged():
+    completions = _FakeCompletions(delays=[1.0, 0.01])
+    gateway = _gateway(completions, hedge_after_ms=50)
+
+    assert asyncio.run(gateway.complete("hi")) == "answer after 0.01s"
+    assert gateway.hedged == 1
+    assert gateway.hedge_wins == 1
@@ -0,0 +1,105 @@
+import numpy as np
+from llama_index.core.schema import TextNode
+
+from backend.app.services import local_vector_store
+from backend.app.services.local_vector_store import LocalVectorStore
+
+DIM = 8
+
+
+def _nodes(document_id, session_id, count, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        TextNode(
+            id_=f"{document_id}:{i}",
+            text=f"{document_id} chunk {i}",
+            embedding=rng.standard_normal(DIM).tolist(),
+            metadata={"document_id": document_id, "session_id": session_id},
+        )
+        for i in range(count)
+    ]
+
+
+def test_search_filters_by_session(tmp_path):
+    store = LocalVectorStore(tmp_path, DIM, index="exact")
+    a = _nodes("doc-a", "s1", 20, seed=1)
+    store.add(a)
+    store.add(_nodes("doc-b", "s2", 20, seed=2))
+
+    results = store.search(a[3].embedding, 5, filters={"session_id": "s1"})
+
+    assert results[0].node.node_id == "doc-a:3"
+    assert results[0].score > 0.99
+    assert {r.node.metadata["session_id"] for r in results} == {"s1"}
+    assert results[0].node.text == "doc-a chunk 3"
+
+
+def test_readding_a_node_replaces_it(tmp_path):
+    store = LocalVectorStore(tmp_path, DIM, index="exact")
+    store.add(_nodes("doc", "s", 5, seed=1))
+    store.add(_nodes("doc", "s", 5, seed=2))
+
+    assert store.count() == 5
+
+
+def test_deletes_are_seen_by_other_instances(tmp_path):
+    writer = LocalVectorStore(tmp_path, DIM, index="exact")
+    reader = LocalVectorStore(tmp_path, DIM, index="exact")
+    a = _nodes("doc-a", "s1", 10, seed=1)
+    writer.add(a)
+    writer.add(_nodes("doc-b", "s1", 10, seed=2))
+
+    assert len(reader.search(a[0].embedding, 50)) == 20
+
+    writer.delete_document("doc-a")
+    writer.delete_nodes(["doc-b:0"])
+
+    results = reader.search(a[0].embedding, 50)
+    assert len(results) == 9
+    assert all(r.node.node_id.startswith("doc-b:") for r in results)
+
+
+def test_compaction_keeps_live_vectors(tmp_path, monkeypatch):
+    monkeypatch.setattr(local_vector_store, "COMPACT_MIN_SLOTS", 10)
+    store = LocalVectorStore(tmp_path, DIM, index="exact", compact_ratio=0.3)
+    keep = _nodes("keep", "s", 10, seed=1)
+    store.add(keep)
+    store.add(_nodes("drop", "s", 20, seed=2))
+
+    store.delete_session("missing")
+    store.delete_document("drop")
+
+    assert store.compactions == 1
+    assert store.count() == 10
+    assert store.search(keep[7].embedding, 1)[0].node.node_id == "keep:7"
+
+
+def test_retired_epoch_is_kept_until_the_next_compaction(tmp_path, monkeypatch):
+    monkeypatch.setattr(local_vector_store, "COMPACT_MIN_SLOTS", 10)
+    writer = LocalVectorStore(tmp_path, DIM, index="exact", compact_ratio=0.3)
+    reader = LocalVectorStore(tmp_path, DIM, index="exact")
+    keep = _nodes("keep", "s", 10, seed=1)
+    writer.add(keep)
+
+    writer.add(_nodes("drop-1", "s", 20, seed=2))
+    writer.delete_document("drop-1")
+    assert (tmp_path / "vectors-0.f32").exists()
+
+    writer.add(_nodes("drop-2", "s", 20, seed=3))
+    writer.delete_document("drop-2")
+    assert writer.compactions == 2
+    assert not (tmp_path / "vectors-0.f32").exists()
+    assert (tmp_path / "vectors-1.f32").exists()
+
+    # A matrix swept between reading the state and mapping it forces a reload
+    open_matrix = reader._open_matrix
+    calls = []
+
+    def racing_open(epoch, grow_to=0):
+        calls.append(epoch)
+        return None if len(calls) == 1 else open_matrix(epoch, grow_to)
+
+    monkeypatch.setattr(reader, "_open_matrix", racing_open)
+
+    assert reader.search(keep[4].embedding, 1)[0].node.node_id == "keep:4"
+    assert len(calls) == 2
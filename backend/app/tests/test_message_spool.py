@@ -0,0 +1,110 @@
+import asyncio
+import sqlite3
+
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+
+from backend.app.services import message_spool
+from backend.app.services.message_spool import FlushUnavailable, MessageSpool
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_poison_row_is_dead_lettered_and_others_delivered(tmp_path):
+    inserted = []
+
+    async def insert(table_name, rows):
+        if any(row.get("bad") for row in rows):
+            raise ValueError("violates check constraint")
+        inserted.extend(row["n"] for row in rows)
+
+    spool = MessageSpool(tmp_path / "spool.sqlite3", insert_fn=insert, batch_size=10, max_attempts=3)
+    spool.append("chat_messages", {"n": 0, "bad": True})
+    for n in range(1, 5):
+        spool.append("chat_messages", {"n": n})
+
+    for _ in range(spool.max_attempts - 1):
+        with pytest.raises(RuntimeError):
+            _run(spool.flush_once())
+
+    _run(spool.flush_once())
+
+    assert sorted(inserted) == [1, 2, 3, 4]
+    assert spool.pending() == 0
+    assert spool.dead_lettered == 1
+
+    dead = sqlite3.connect(tmp_path / "spool.sqlite3").execute(
+        "SELECT attempts, error FROM dead_messages"
+    ).fetchall()
+    assert dead[0][0] == 3
+    assert "check constraint" in dead[0][1]
+
+
+def test_outage_does_not_count_against_attempts(tmp_path):
+    async def insert(table_name, rows):
+        raise FlushUnavailable("Supabase unavailable")
+
+    spool = MessageSpool(tmp_path / "spool.sqlite3", insert_fn=insert, max_attempts=2)
+    spool.append("chat_messages", {"n": 1})
+
+    for _ in range(5):
+        with pytest.raises(FlushUnavailable):
+            _run(spool.flush_once())
+
+    assert spool.pending() == 1
+    assert spool.dead_lettered == 0
+
+
+class _FailingClient:
+    def __init__(self, error):
+        self.error = error
+
+    def table(self, table_name):
+        return self
+
+    def insert(self, rows):
+        return self
+
+    async def execute(self):
+        raise self.error
+
+
+def _spool_with_client(tmp_path, monkeypatch, error):
+    async def get_client():
+        return _FailingClient(error)
+
+    monkeypatch.setattr(message_spool, "get_async_supabase_client", get_client)
+    spool = MessageSpool(tmp_path / "spool.sqlite3", max_attempts=2)
+    spool.append("chat_messages", {"n": 1, "session_id": "s"})
+    return spool
+
+
+@pytest.mark.parametrize("error", [
+    httpx.ConnectTimeout("timed out"),
+    APIError({"message": "JSON could not be generated", "code": 502}),
+    APIError({"message": "Could not connect to the database", "code": "PGRST001"}),
+])
+def test_supabase_outage_keeps_rows(tmp_path, monkeypatch, error):
+    spool = _spool_with_client(tmp_path, monkeypatch, error)
+
+    for _ in range(5):
+        with pytest.raises(FlushUnavailable):
+            _run(spool.flush_once())
+
+    assert spool.pending() == 1
+    assert spool.dead_lettered == 0
+
+
+def test_supabase_data_rejection_counts_against_attempts(tmp_path, monkeypatch):
+    error = APIError({"message": "violates check constraint", "code": "23514"})
+    spool = _spool_with_client(tmp_path, monkeypatch, error)
+
+    with pytest.raises(RuntimeError):
+        _run(spool.flush_once())
+    _run(spool.flush_once())
+
+    assert spool.pending() == 0
+    assert spool.dead_lettered == 1
@@ -0,0 +1,59 @@
+import pytest
+
+from backend.app.services import model_registry
+
+
+class _Embedder:
+    def get_text_embedding(self, text):
+        return [0.0]
+
+    def get_query_embedding(self, text):
+        return [0.0]
+
+
+class _CrossEncoder:
+    def __init__(self, failures):
+        self.failures = failures
+
+    def predict(self, pairs, show_progress_bar=False):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("out of memory")
+        return [0.0]
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(model_registry, "_configure_threads", lambda: None)
+    monkeypatch.setattr(model_registry, "HuggingFaceEmbedding", lambda **kwargs: _Embedder())
+    model_registry.clear_registry()
+    yield model_registry
+    model_registry.clear_registry()
+
+
+def test_ready_only_once_every_startup_model_is_warm(registry, monkeypatch):
+    cross_encoder = _CrossEncoder(failures=1)
+    key = registry._rerank_key(registry.RERANK_MODEL_NAME)
+    monkeypatch.setattr(
+        registry, "get_rerank_model",
+        lambda model_name=None: registry._load(key, lambda: cross_encoder).model,
+    )
+
+    registry.require_startup_models(rerank=True)
+    assert not registry.is_ready()
+
+    registry.warmup_embed_model()
+    assert not registry.is_ready()
+
+    with pytest.raises(RuntimeError):
+        registry.warmup_rerank_model()
+    assert not registry.is_ready()
+    assert "out of memory" in registry.registry_status()[f"rerank:{registry.RERANK_MODEL_NAME}"]["error"]
+
+    registry.warmup_rerank_model()
+    assert registry.is_ready()
+    assert "error" not in registry.registry_status()[f"rerank:{registry.RERANK_MODEL_NAME}"]
+
+    # Models loaded lazily later don't affect readiness
+    registry.get_embed_model("another-model")
+    assert registry.is_ready()
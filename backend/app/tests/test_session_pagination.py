@@ -0,0 +1,41 @@
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from backend.app.api import sessions
+from backend.app.services.session_cache import decode_cursor, encode_cursor
+
+
+def _raw_cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def test_cursor_round_trips_without_padding():
+    cursor = encode_cursor("2026-10-18T09:15:00.123456+00:00", "3f2c9a7e-session")
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, 2) == ["2026-10-18T09:15:00.123456+00:00", "3f2c9a7e-session"]
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    _raw_cursor({"updated_at": "x"}),
+    _raw_cursor(["only-one"]),
+    _raw_cursor(["2026-10-18", 42]),
+])
+def test_foreign_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 2)
+
+
+def test_route_rejects_cursor_that_would_break_out_of_the_filter():
+    cursor = encode_cursor('2026-10-18",user_id.neq."x', "s")
+
+    with pytest.raises(HTTPException) as excinfo:
+        sessions._decode_cursor(cursor, 2)
+    assert excinfo.value.status_code == 400
+
+    assert sessions._decode_cursor(None, 2) is None
+    assert sessions._decode_cursor(encode_cursor("a", "b"), 2) == ["a", "b"]
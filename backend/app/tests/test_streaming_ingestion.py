@@ -0,0 +1,67 @@
+import threading
+import time
+
+import pytest
+
+from backend.app.pipelines.streaming_ingestion import StageCancelled, run_streaming_ingestion
+
+PAGE = "The contract states that each shipment must be invoiced within thirty days. " * 40
+
+
+def _pages(count):
+    for _ in range(count):
+        yield PAGE
+
+
+def test_failed_insert_stops_upstream_stages():
+    embed_calls = []
+
+    def embed(batch):
+        embed_calls.append(len(batch))
+        time.sleep(0.01)
+        return batch
+
+    def insert(batch):
+        raise RuntimeError("vector store down")
+
+    # Holding the traceback keeps the pipeline's generators alive, as the
+    # caller's cleanup handler does
+    with pytest.raises(RuntimeError, match="vector store down") as excinfo:
+        run_streaming_ingestion(
+            pages=_pages(500),
+            document_id="doc",
+            metadata={"document_id": "doc", "session_id": "s"},
+            embed_fn=embed,
+            insert_fn=insert,
+            batch_size=4,
+        )
+
+    calls_after_failure = len(embed_calls)
+    time.sleep(0.3)
+
+    assert len(embed_calls) == calls_after_failure
+    assert not [t for t in threading.enumerate() if t.name.startswith("ingest-")]
+    assert excinfo.value is not None
+
+
+def test_external_stop_aborts_the_run():
+    stop = threading.Event()
+    inserted = []
+
+    def insert(batch):
+        inserted.append(len(batch))
+        stop.set()  # e.g. the worker's lease was lost
+
+    with pytest.raises(StageCancelled):
+        run_streaming_ingestion(
+            pages=_pages(500),
+            document_id="doc",
+            metadata={"document_id": "doc", "session_id": "s"},
+            embed_fn=lambda batch: batch,
+            insert_fn=insert,
+            batch_size=4,
+            stop=stop,
+        )
+
+    assert len(inserted) == 1
+    assert not [t for t in threading.enumerate() if t.name.startswith("ingest-")]
@@ -0,0 +1,36 @@
+import asyncio
+
+from backend.app.services import title_generator
+from backend.app.services.title_generator import TitleGenerator
+
+
+def test_one_failing_session_does_not_abort_the_batch(monkeypatch):
+    saved = {}
+
+    def fetch(session_id):
+        if session_id == "fetch-fails":
+            raise RuntimeError("Supabase timeout")
+        return f"question for {session_id}"
+
+    def save(session_id, title):
+        if session_id == "save-fails":
+            raise RuntimeError("Supabase timeout")
+        saved[session_id] = title
+        return ["user"]
+
+    async def invalidate(*user_ids):
+        pass
+
+    async def generate(prompt, max_tokens):
+        return '{"1": "First", "2": "Second", "3": "Third"}'
+
+    monkeypatch.setattr(title_generator, "_fetch_first_message", fetch)
+    monkeypatch.setattr(title_generator, "_save_title", save)
+    monkeypatch.setattr(title_generator, "invalidate_user_sessions", invalidate)
+
+    generator = TitleGenerator(generate_fn=generate)
+    asyncio.run(generator._process(["a", "fetch-fails", "save-fails", "b"]))
+
+    assert saved == {"a": "First", "b": "Third"}
+    assert generator.generated == 2
+    assert generator.failed == 2
@@ -1,6 +1,13 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Tuple
+
 from fastapi import UploadFile, HTTPException
-from backend.app.core.config import ALLOWED_EXTENSIONS, MAX_FILE_SIZE_MB
-from backend.app.core.config import HASH_REGISTRY_FILE
+from backend.app.core.config import ALLOWED_EXTENSIONS, MAX_FILE_SIZE_MB, UPLOAD_DIR
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 def validate_file(file: UploadFile):
@@ -15,24 +22,60 @@ def validate_file(file: UploadFile):
     return ext
 
 
-async def validate_file_size(file: UploadFile):
-    contents = await file.read()
-    size_mb = len(contents) / (1024 * 1024)
+async def save_upload_streaming(
+    file: UploadFile,
+    ext: str,
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> Tuple[Path, str, int]:
+    """
+    Stream an upload to a temp file in UPLOAD_DIR in a single pass,
+    hashing and counting bytes as they arrive. Aborts as soon as the
+    size limit is exceeded.
+
+    Returns (temp_path, sha256, size_bytes). The caller decides whether
+    to keep the file (promote_upload) or drop it (discard_upload).
+    """
+    max_bytes = MAX_FILE_SIZE_MB * 1024 * 1024
 
-    if size_mb > MAX_FILE_SIZE_MB:
+    # Reject early when the client declared the size
+    if file.size is not None and file.size > max_bytes:
         raise HTTPException(
             status_code=400,
             detail="File exceeds maximum size limit"
         )
 
-    await file.seek(0)
+    hasher = hashlib.sha256()
+    size_bytes = 0
+
+    fd, temp_name = tempfile.mkstemp(dir=UPLOAD_DIR, prefix=".upload-", suffix=ext)
+    temp_path = Path(temp_name)
+
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := await file.read(chunk_size):
+                size_bytes += len(chunk)
+                if size_bytes > max_bytes:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="File exceeds maximum size limit"
+                    )
+                hasher.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        discard_upload(temp_path)
+        raise
+
+    return temp_path, hasher.hexdigest(), size_bytes
 
 
-def is_duplicate(file_hash: str) -> bool:
-    hashes = HASH_REGISTRY_FILE.read_text().splitlines()
-    return file_hash in hashes
+def promote_upload(temp_path: Path, file_hash: str, ext: str) -> Path:
+    """
+    Atomically rename a streamed upload to its content-addressed path.
+    """
+    final_path = UPLOAD_DIR / f"{file_hash}{ext}"
+    os.replace(temp_path, final_path)
+    return final_path
 
 
-def register_hash(file_hash: str):
-    with open(HASH_REGISTRY_FILE, "a") as f:
-        f.write(file_hash + "\n")
+def discard_upload(temp_path: Path):
+    temp_path.unlink(missing_ok=True)
@@ -13,3 +13,17 @@ def normalize_text(text: str) -> str:
     text = re.sub(r'\s+', ' ', text)
 
     return text.strip()
+
+
+def clean_page_text(text: str) -> str:
+    """
+    Light, non-destructive cleanup for extracted page text.
+    Keeps line breaks (the sentence splitter uses them) but drops
+    control characters and collapses runs of spaces and blank lines.
+    """
+
+    text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f]', '', text)
+    text = re.sub(r'[ \t\u00a0]+', ' ', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+
+    return text.strip()
@@ -0,0 +1,214 @@
+"""
+Ingestion worker pool.
+
+Runs outside the API process so parsing and embedding don't compete with
+chat for CPU, and queued jobs survive an API restart. The supervisor
+restarts a worker process that dies, with backoff.
+
+Run from the repository root:
+    python -m backend.app.workers.ingestion_worker --concurrency 2
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from pathlib import Path
+
+from backend.app.core.config import (
+    INGESTION_HEARTBEAT_SECONDS,
+    INGESTION_JOB_TIMEOUT_SECONDS,
+    INGESTION_POLL_SECONDS,
+    INGESTION_WORKER_CONCURRENCY,
+)
+from backend.app.core.logging import setup_logger
+from backend.app.services import job_queue
+from backend.app.services.answer_cache import get_answer_cache
+
+logger = setup_logger()
+
+RESPAWN_BASE_SECONDS = 1
+RESPAWN_MAX_SECONDS = 60
+# A worker that stayed up this long is considered healthy again
+RESPAWN_RESET_SECONDS = 300
+
+_stopping = False
+
+
+def _request_stop(signum, frame):
+    global _stopping
+    _stopping = True
+
+
+def _heartbeat(
+    document_id: str,
+    worker_id: str,
+    done: threading.Event,
+    stop: threading.Event
+) -> None:
+    """
+    Keep the job's lease alive while it runs, however long a stage takes.
+    If the job was requeued (and maybe handed to another worker), sets
+    stop to abort the ingest pipeline.
+    """
+    while not done.wait(INGESTION_HEARTBEAT_SECONDS):
+        try:
+            if not job_queue.heartbeat_job(document_id, worker_id):
+                logger.warning(f"Ingestion job lease lost | document_id={document_id} | worker_id={worker_id}")
+                stop.set()
+                return
+        except Exception as e:
+            logger.warning(f"Ingestion heartbeat failed | document_id={document_id} | {e}")
+
+
+def process_job(job: dict, worker_id: str) -> None:
+    # Imported here so the supervisor process never loads model weights
+    from backend.app.services.ingestion import ingest_document
+
+    document_id = job["document_id"]
+
+    done = threading.Event()
+    # The ingest pipeline's shared stop event: set when the lease is lost
+    stop = threading.Event()
+
+    def on_stage(stage: str) -> None:
+        if not job_queue.update_job_status(document_id, worker_id, stage):
+            stop.set()
+
+    heartbeat = threading.Thread(
+        target=_heartbeat,
+        args=(document_id, worker_id, done, stop),
+        name="ingestion-heartbeat",
+        daemon=True,
+    )
+    heartbeat.start()
+
+    try:
+        result = ingest_document(
+            Path(job["file_path"]),
+            job["filename"],
+            document_id,
+            job["session_id"],
+            on_stage=on_stage,
+            version=job.get("version"),
+            stop=stop,
+        )
+    except Exception as e:
+        status = job_queue.fail_job(document_id, worker_id, f"{type(e).__name__}: {e}")
+        if status is None:
+            logger.warning(f"Ingestion abandoned, lease lost | document_id={document_id} | {e}")
+        else:
+            logger.error(
+                f"Ingestion failed | document_id={document_id} | "
+                f"attempt={job['attempts']} | next_status={status} | {e}"
+            )
+        return
+    finally:
+        done.set()
+
+    if not job_queue.complete_job(document_id, worker_id, result):
+        logger.warning(f"Ingestion result discarded, lease lost | document_id={document_id}")
+        return
+
+    # The session's document set changed: cached answers are stale
+    answer_cache = get_answer_cache()
+    if answer_cache:
+        answer_cache.invalidate_session(job["session_id"])
+
+
+def worker_loop(worker_index: int) -> None:
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{worker_index}"
+    logger.info(f"Ingestion worker started | worker_id={worker_id}")
+
+    try:
+        while not _stopping:
+            job_queue.requeue_stale_jobs(INGESTION_JOB_TIMEOUT_SECONDS)
+
+            job = job_queue.claim_next_job(worker_id)
+            if job is None:
+                time.sleep(INGESTION_POLL_SECONDS)
+                continue
+
+            logger.info(
+                f"Ingestion job claimed | document_id={job['document_id']} | "
+                f"attempt={job['attempts']} | worker_id={worker_id}"
+            )
+            process_job(job, worker_id)
+    finally:
+        from backend.app.services.parsing import shutdown_parse_pool
+        shutdown_parse_pool()
+
+    logger.info(f"Ingestion worker stopped | worker_id={worker_id}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=INGESTION_WORKER_CONCURRENCY,
+        help="Number of worker processes",
+    )
+    args = parser.parse_args()
+
+    # spawn: each worker gets a clean interpreter (torch + fork don't mix)
+    ctx = multiprocessing.get_context("spawn")
+
+    def _start(index: int):
+        process = ctx.Process(target=worker_loop, args=(index,), name=f"ingestion-worker-{index}")
+        process.start()
+        return process
+
+    processes = [_start(i) for i in range(args.concurrency)]
+    started_at = [time.monotonic()] * args.concurrency
+    restarts = [0] * args.concurrency
+    restart_at = [None] * args.concurrency
+
+    def _forward_stop(signum, frame):
+        global _stopping
+        _stopping = True
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, _forward_stop)
+    signal.signal(signal.SIGINT, _forward_stop)
+
+    while not _stopping:
+        now = time.monotonic()
+
+        for i, process in enumerate(processes):
+            if restart_at[i] is not None:
+                if now >= restart_at[i] and not _stopping:
+                    processes[i] = _start(i)
+                    started_at[i] = now
+                    restart_at[i] = None
+                continue
+
+            if process.is_alive():
+                continue
+
+            # Its job, if any, is requeued once the lease expires
+            if now - started_at[i] >= RESPAWN_RESET_SECONDS:
+                restarts[i] = 0
+            delay = min(RESPAWN_BASE_SECONDS * (2 ** restarts[i]), RESPAWN_MAX_SECONDS)
+            restarts[i] += 1
+            restart_at[i] = now + delay
+            logger.error(
+                f"Ingestion worker died, restarting | index={i} | "
+                f"exitcode={process.exitcode} | restart_in={delay}s"
+            )
+
+        time.sleep(0.5)
+
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
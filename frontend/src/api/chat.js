@@ -1,5 +1,31 @@
 const API_BASE = import.meta.env.VITE_API_BASE || "http://localhost:8000";
 
+// Largest page the listing endpoints accept (SESSION_PAGE_SIZE_MAX)
+const PAGE_SIZE = 200;
+
+/**
+ * GET every page of a cursor-paginated listing, following X-Next-Cursor
+ */
+async function fetchAllPages(url, errorMessage) {
+  const items = [];
+  let cursor = null;
+
+  do {
+    const params = new URLSearchParams({ limit: String(PAGE_SIZE) });
+    if (cursor) params.set("cursor", cursor);
+
+    const response = await fetch(`${url}?${params}`);
+    if (!response.ok) {
+      throw new Error(errorMessage);
+    }
+
+    items.push(...(await response.json()));
+    cursor = response.headers.get("X-Next-Cursor");
+  } while (cursor);
+
+  return items;
+}
+
 // ===========================
 // CHAT STREAMING
 // ===========================
@@ -55,31 +81,23 @@ export async function createSession(userId, title = "New Chat") {
 }
 
 /**
- * List all sessions for a user
+ * List all sessions for a user, most recent first
  */
 export async function listSessions(userId) {
-  const response = await fetch(`${API_BASE}/sessions/list/${userId}`);
-
-  if (!response.ok) {
-    throw new Error("Failed to fetch sessions");
-  }
-
-  return await response.json();
+  return fetchAllPages(
+    `${API_BASE}/sessions/list/${userId}`,
+    "Failed to fetch sessions"
+  );
 }
 
 /**
- * Get all messages for a specific session
+ * Get all messages for a specific session, oldest first
  */
 export async function getSessionMessages(sessionId) {
-  const response = await fetch(
-    `${API_BASE}/sessions/${sessionId}/messages`
+  return fetchAllPages(
+    `${API_BASE}/sessions/${sessionId}/messages`,
+    "Failed to fetch messages"
   );
-
-  if (!response.ok) {
-    throw new Error("Failed to fetch messages");
-  }
-
-  return await response.json();
 }
 
 /**
@@ -115,13 +133,16 @@ export async function deleteSession(sessionId) {
 }
 
 /**
- * Generate AI title from first message
+ * Queue AI title generation from the first message.
+ * Returns immediately; use waitForSessionTitle to pick up the title.
  */
-export async function generateSessionTitle(sessionId) {
+export async function generateSessionTitle(sessionId, firstMessage) {
   const response = await fetch(
     `${API_BASE}/sessions/${sessionId}/generate-title`,
     {
       method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ first_message: firstMessage }),
     }
   );
 
@@ -130,4 +151,30 @@ export async function generateSessionTitle(sessionId) {
   }
 
   return await response.json();
+}
+
+/**
+ * Poll session listing until the session has a generated title.
+ * Unchanged listings are revalidated with ETags (304), so polling is cheap.
+ */
+export async function waitForSessionTitle(
+  userId,
+  sessionId,
+  { timeoutMs = 15000, defaultTitle = "New Chat" } = {}
+) {
+  const deadline = Date.now() + timeoutMs;
+  let delay = 500;
+
+  while (Date.now() < deadline) {
+    await new Promise((r) => setTimeout(r, delay));
+    delay = Math.min(delay * 2, 4000);
+
+    const sessions = await listSessions(userId);
+    const session = sessions.find((s) => s.session_id === sessionId);
+    if (session && session.title !== defaultTitle) {
+      return session.title;
+    }
+  }
+
+  return null;
 }
\ No newline at end of file
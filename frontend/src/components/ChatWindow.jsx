@@ -2,7 +2,11 @@ import { useEffect, useRef, useState } from "react";
 import Message from "./Message";
 import WelcomePanel from "./WelcomePanel";
 import ChatInput from "./ChatInput";
-import { streamChat, generateSessionTitle } from "../api/chat";
+import {
+  streamChat,
+  generateSessionTitle,
+  waitForSessionTitle,
+} from "../api/chat";
 import { uploadDocumentWithProgress } from "../api/upload";
 
 const USER_ID = "local-user";
@@ -157,11 +161,14 @@ const ChatWindow = ({ session, onUpdateSession }) => {
       ) {
         titleGeneratedRef.current = true;
         try {
-          const result = await generateSessionTitle(session.id);
-          onUpdateSession((prev) => ({
-            ...prev,
-            title: result.title,
-          }));
+          await generateSessionTitle(session.id, userMsg.content);
+          const title = await waitForSessionTitle(USER_ID, session.id);
+          if (title) {
+            onUpdateSession((prev) => ({
+              ...prev,
+              title,
+            }));
+          }
         } catch (error) {
           console.error("Title generation failed:", error);
         }